@@ -0,0 +1,95 @@
+"""Eşzamanlı kiralama/iade stres testi.
+
+Her iş parçacığı kendi DataManager/RentalService örneğini (ve dolayısıyla
+kendi SQLite bağlantısını) kullanır; hepsi aynı araçları aynı anda kiralamaya
+ve iade almaya çalışır. Her araç için tam olarak bir kiralama ve bir geçmiş
+kaydı oluşmalıdır.
+
+Kullanım:
+    python benchmarks/concurrent_rentals.py [--threads 8] [--vehicles 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backend.data_manager import DataManager  # noqa: E402
+from src.backend.rental_service import RentalService  # noqa: E402
+from src.models.vehicle import Vehicle  # noqa: E402
+
+
+def _race(db_path, threads, target):
+    barrier = threading.Barrier(threads)
+    results = [None] * threads
+
+    def run(i):
+        dm = DataManager(db_path)
+        service = RentalService(dm)
+        barrier.wait()
+        results[i] = target(i, service)
+        dm.conn.close()
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--vehicles', type=int, default=200)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'stress.db')
+    dm = DataManager(db_path)
+    far = (date.today() + timedelta(days=365)).isoformat()
+    plates = [f"34 ST {i:04d}" for i in range(args.vehicles)]
+    for plaka in plates:
+        dm.add_vehicle(Vehicle(plaka, "Marka", "Model", 100.0, sigorta_bitis=far, kasko_bitis=far))
+
+    today = date.today().isoformat()
+    end = (date.today() + timedelta(days=3)).isoformat()
+
+    def rent(i, service):
+        ok = []
+        for plaka in plates:
+            success, _, _ = service.start_rental(plaka, f"Müşteri {i}", today, end)
+            if success:
+                ok.append(plaka)
+        return ok
+
+    def give_back(i, service):
+        return [plaka for plaka in plates if service.end_rental(plaka)[0]]
+
+    rented, rent_time = _race(db_path, args.threads, rent)
+    returned, return_time = _race(db_path, args.threads, give_back)
+
+    attempts = args.threads * len(plates)
+    rent_counts = Counter(p for ok in rented for p in ok)
+    return_counts = Counter(p for ok in returned for p in ok)
+    history_counts = Counter(
+        row[0] for row in dm.conn.execute("SELECT plaka FROM rental_history").fetchall()
+    )
+
+    print(f"{args.threads} iş parçacığı, {len(plates)} araç")
+    print(f"Kiralama: {attempts} deneme, {rent_time:.2f} sn ({attempts / rent_time:,.0f} deneme/sn)")
+    print(f"İade:     {attempts} deneme, {return_time:.2f} sn ({attempts / return_time:,.0f} deneme/sn)")
+
+    assert all(rent_counts[p] == 1 for p in plates), "Bir araç birden fazla kez kiralandı!"
+    assert all(return_counts[p] == 1 for p in plates), "Bir araç birden fazla kez iade alındı!"
+    assert all(history_counts[p] == 1 for p in plates), "Geçmiş kaydı sayısı hatalı!"
+    print("Tamam: her araç tam olarak bir kez kiralandı ve bir kez iade alındı.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Araç listesi yenilemesindeki tarih ayrıştırma maliyeti.
+
+Eski yol: tarihler metin olarak okunur ve her yenilemede sigorta/kasko için
+datetime.strptime çağrılır. Yeni yol: DATE sütunları sqlite3 dönüştürücüsüyle
+okuma sırasında bir kez date'e çevrilir, yenileme sadece karşılaştırma yapar.
+
+Kullanım:
+    python benchmarks/date_parsing.py [--vehicles 20000] [--repeat 5]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backend.data_manager import DataManager  # noqa: E402
+from src.models.vehicle import Vehicle  # noqa: E402
+
+
+def _best(repeat, func):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vehicles', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'dates.db')
+    dm = DataManager(db_path)
+    today = date.today()
+    dm.conn.executemany(
+        "INSERT INTO vehicles (plaka, marka, model, ucret, durum, sigorta_bitis, kasko_bitis) "
+        "VALUES (?, 'Marka', 'Model', 100, 0, ?, ?)",
+        [(f"34 DT {i:05d}", today + timedelta(days=i % 400 - 30), today + timedelta(days=i % 300 - 30))
+         for i in range(args.vehicles)]
+    )
+    dm.conn.commit()
+
+    # Metin olarak okuyan bağlantı (eski davranış)
+    raw = sqlite3.connect(db_path)
+    raw.row_factory = sqlite3.Row
+    text_rows = [dict(row) for row in raw.execute("SELECT * FROM vehicles")]
+    typed = dm.get_all_vehicles()
+
+    def refresh_strings():
+        needs = 0
+        for v in text_rows:
+            sigorta = datetime.strptime(v['sigorta_bitis'], "%Y-%m-%d").date()
+            kasko = datetime.strptime(v['kasko_bitis'], "%Y-%m-%d").date()
+            needs += sigorta < today or kasko < today
+        return needs
+
+    def refresh_dates():
+        needs = 0
+        for v in typed:
+            needs += v.sigorta_bitis < today or v.kasko_bitis < today
+        return needs
+
+    assert refresh_strings() == refresh_dates()
+
+    read_text = _best(args.repeat, lambda: [Vehicle(**dict(row)) for row in raw.execute(
+        "SELECT plaka, marka, model, ucret, durum FROM vehicles")])
+    read_typed = _best(args.repeat, dm.get_all_vehicles)
+    parse = _best(args.repeat, refresh_strings)
+    compare = _best(args.repeat, refresh_dates)
+
+    print(f"{args.vehicles} araç, en iyi {args.repeat} tekrar")
+    print(f"Okuma (tarihsiz sütunlar)        : {read_text * 1000:8.1f} ms")
+    print(f"Okuma (DATE dönüştürücüsüyle)    : {read_typed * 1000:8.1f} ms")
+    print(f"Yenileme - strptime ile (eski)   : {parse * 1000:8.1f} ms")
+    print(f"Yenileme - date karşılaştırma    : {compare * 1000:8.1f} ms")
+    print(f"Yenileme başına kazanç           : {(parse - compare) * 1000:8.1f} ms "
+          f"({parse / compare:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Journal'dan yeniden kurulum hızı.
+
+Geçici bir veritabanında DataManager üzerinden bir yıllık işlem (araç ekleme,
+kiralama, iade, fiyat ve sigorta güncellemesi) üretilir; ardından vehicles ve
+rental_history son anlık görüntü + olaylardan yeniden kurulur, hız raporlanır
+ve sonuç mevcut tablolarla karşılaştırılır.
+
+Kullanım:
+    python benchmarks/journal_replay.py [--vehicles 300] [--days 365] [--rentals-per-day 150]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backend import journal  # noqa: E402
+from src.backend.data_manager import DataManager  # noqa: E402
+from src.models.rental_history import RentalHistory  # noqa: E402
+from src.models.vehicle import Vehicle  # noqa: E402
+from src.models.vehicle_status import VehicleStatus  # noqa: E402
+
+
+def simulate(dm, vehicles, days, rentals_per_day, seed=1):
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    plates = [f"34 BJ {i:04d}" for i in range(vehicles)]
+    for plaka in plates:
+        dm.add_vehicle(Vehicle(plaka, rng.choice(("Renault", "Fiat", "Toyota")), "Model",
+                               float(rng.randrange(500, 2000, 50)),
+                               sigorta_bitis=start + timedelta(days=400),
+                               kasko_bitis=start + timedelta(days=400)))
+
+    for offset in range(days):
+        today = start + timedelta(days=offset)
+        for _ in range(rentals_per_day):
+            plaka = rng.choice(plates)
+            vehicle = dm.get_vehicle_by_plaka(plaka)
+            if vehicle.durum == VehicleStatus.KIRADA:
+                history = RentalHistory(plaka, vehicle.kiralayan, vehicle.baslangic_tarihi,
+                                        vehicle.bitis_tarihi, vehicle.ucret * 3, today)
+                dm.try_end_rental(vehicle, history)
+            else:
+                dm.try_start_rental(plaka, f"Müşteri {rng.randrange(5000)}",
+                                    today, today + timedelta(days=rng.randint(1, 10)))
+        # Ara sıra fiyat ve sigorta güncellemeleri
+        plaka = rng.choice(plates)
+        dm.update_vehicle(plaka, {'ucret': float(rng.randrange(500, 2000, 50))})
+        if offset % 30 == 0:
+            dm.update_vehicle(plaka, {'sigorta_bitis': today + timedelta(days=365)})
+        dm.journal.maybe_snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vehicles', type=int, default=300)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--rentals-per-day', type=int, default=150)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'journal.db')
+    dm = DataManager(db_path)
+    # Sadece üretimi hızlandırmak için; ölçülen kısım yeniden oynatmadır
+    dm.conn.execute("PRAGMA synchronous=OFF")
+
+    started = time.perf_counter()
+    simulate(dm, args.vehicles, args.days, args.rentals_per_day)
+    events = dm.conn.execute("SELECT COUNT(*) FROM journal").fetchone()[0]
+    snapshots = dm.conn.execute("SELECT COUNT(*) FROM journal_snapshots").fetchone()[0]
+    print(f"Üretim: {events} olay, {snapshots} anlık görüntü ({time.perf_counter() - started:.1f} sn)")
+    dm.events.close()
+    dm.conn.close()
+
+    out_path = os.path.join(os.path.dirname(db_path), 'yeniden.db')
+    status = journal.main(['--db', db_path, '--verify', '--out', out_path])
+    if status == 0:
+        # Daha uzun kuyruk için saklanan en eski anlık görüntüden de ölçülür
+        conn = sqlite3.connect(db_path)
+        first = conn.execute("SELECT MIN(id) FROM journal_snapshots").fetchone()[0]
+        conn.close()
+        print("\nEn eski anlık görüntüden:")
+        status = journal.main(['--db', db_path, '--snapshot', str(first), '--verify'])
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
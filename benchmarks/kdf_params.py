@@ -0,0 +1,72 @@
+"""Giriş süresi bütçesine göre KDF parametresi seçimi.
+
+Bu makinede scrypt (r=8, p=1, farklı n) ve PBKDF2-SHA256 (farklı iterasyon)
+için tek doğrulamanın süresi ölçülür; girişin bütçe (varsayılan 300 ms)
+altında kalacağı en güçlü ayarlar önerilir. Eski düz metin kaydın ilk
+girişinde yeniden özetleme arka planda yapıldığından bütçeye tek KDF
+çalıştırması girer. Ölçüm, hedef masa bilgisayarlarında çalıştırılmalıdır.
+
+Kullanım:
+    python benchmarks/kdf_params.py [--budget-ms 300] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backend.credentials import (  # noqa: E402
+    PasswordHasher, SCRYPT, PBKDF2, DEFAULT_SCHEME, SCRYPT_R, SCRYPT_P,
+)
+
+SCRYPT_NS = [2 ** k for k in range(12, 19)]
+PBKDF2_ITERATIONS = [100000, 200000, 400000, 600000, 900000, 1200000]
+
+
+def measure(hasher, repeat):
+    """Doğrulama süresinin medyanı (ms)."""
+    stored = hasher.hash("parola")
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        hasher.verify("parola", stored)
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=300.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    best = {}
+    candidates = []
+    if DEFAULT_SCHEME == SCRYPT:
+        candidates += [(SCRYPT, f"n=2^{n.bit_length() - 1}", PasswordHasher(SCRYPT, n=n)) for n in SCRYPT_NS]
+    candidates += [(PBKDF2, f"iterasyon={i}", PasswordHasher(PBKDF2, iterations=i)) for i in PBKDF2_ITERATIONS]
+
+    for scheme, label, hasher in candidates:
+        ms = measure(hasher, args.repeat)
+        fits = ms <= args.budget_ms
+        print(f"{scheme:<14} {label:<18} {ms:8.1f} ms  {'✓' if fits else '✗'}")
+        if fits:
+            best[scheme] = (label, hasher)
+
+    print(f"\nBütçe: {args.budget_ms:.0f} ms")
+    if SCRYPT in best:
+        hasher = best[SCRYPT][1]
+        print(f"Önerilen: SCRYPT_N = 2 ** {hasher.n.bit_length() - 1}  (r={SCRYPT_R}, p={SCRYPT_P}, "
+              f"bellek ≈ {128 * hasher.n * hasher.r / 2**20:.0f} MB)")
+    if PBKDF2 in best:
+        print(f"PBKDF2 için: PBKDF2_ITERATIONS = {best[PBKDF2][1].iterations}")
+    if not best:
+        print("Hiçbir ayar bütçeye sığmadı; bütçe veya aday listesi gözden geçirilmeli.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
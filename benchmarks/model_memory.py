@@ -0,0 +1,102 @@
+"""Kiralama geçmişi satırlarını nesneye çevirmenin bellek ve süre maliyeti.
+
+Eski yol: __slots__ olmayan dataclass, sqlite3.Row üzerinden sütun adlarıyla
+kurulur ve __post_init__ her tarihi to_date'ten geçirir. Yeni yol: slotlu
+RentalHistory, düz tuple satırdan from_row ile kurulur (DataManager._fetch).
+
+Kullanım:
+    python benchmarks/model_memory.py [--rows 1000000]
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backend.data_manager import DataManager, HISTORY_SELECT  # noqa: E402
+from src.models.dates import to_date  # noqa: E402
+from src.models.rental_history import RentalHistory  # noqa: E402
+
+
+@dataclass
+class LegacyRentalHistory:
+    plaka: str
+    kiralayan: str
+    baslangic_tarihi: date
+    bitis_tarihi: date
+    toplam_ucret: float
+    iade_tarihi: date
+
+    def __post_init__(self):
+        self.baslangic_tarihi = to_date(self.baslangic_tarihi)
+        self.bitis_tarihi = to_date(self.bitis_tarihi)
+        self.iade_tarihi = to_date(self.iade_tarihi)
+
+
+def load_legacy(dm):
+    c = dm.conn.execute("SELECT * FROM rental_history ORDER BY id DESC")
+    return [
+        LegacyRentalHistory(row["plaka"], row["kiralayan"], row["baslangic_tarihi"],
+                            row["bitis_tarihi"], row["toplam_ucret"], row["iade_tarihi"])
+        for row in c.fetchall()
+    ]
+
+
+def load_slotted(dm):
+    return dm._fetch(RentalHistory, f"{HISTORY_SELECT} ORDER BY id DESC")
+
+
+def measure(name, func, dm):
+    gc.collect()
+    started = time.perf_counter()
+    rows = func(dm)
+    elapsed = time.perf_counter() - started
+    del rows
+
+    # Bellek, süreyi bozmaması için ayrı bir çalıştırmada ölçülür
+    gc.collect()
+    tracemalloc.start()
+    rows = func(dm)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<22} {len(rows):>9} satır  {elapsed:6.2f} sn  "
+          f"tutulan {current / 2**20:7.1f} MB  tepe {peak / 2**20:7.1f} MB")
+    del rows
+    return elapsed, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'models.db')
+    dm = DataManager(db_path)
+    start = date(2020, 1, 1)
+    with dm.conn:
+        # Türetilmiş özetler bu ölçümle ilgisiz; satırlar doğrudan yazılır
+        dm.conn.executemany(
+            "INSERT INTO rental_history (plaka, kiralayan, baslangic_tarihi, bitis_tarihi, toplam_ucret, iade_tarihi) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((f"34 BJ {i % 5000:04d}", f"Müşteri {i % 20000}",
+              start + timedelta(days=i % 2000), start + timedelta(days=i % 2000 + 3),
+              float(i % 900 + 100), start + timedelta(days=i % 2000 + 3))
+             for i in range(args.rows))
+        )
+
+    legacy_time, legacy_mem = measure("dataclass + Row", load_legacy, dm)
+    slotted_time, slotted_mem = measure("slots + from_row", load_slotted, dm)
+    print(f"\nBellek: %{slotted_mem / legacy_mem * 100:.0f}  Süre: {legacy_time / slotted_time:.1f}x hızlı")
+    dm.events.close()
+    dm.conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
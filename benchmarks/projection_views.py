@@ -0,0 +1,68 @@
+"""Araç listesi yenilemesinin tam Vehicle ve sütun görünümüyle maliyeti.
+
+Ana tablo yalnızca altı alan gösterir; tam yol her satır için on alanlı
+Vehicle kurar, görünüm yolu sadece bu altı sütunu okuyup tuple'a sarar.
+
+Kullanım:
+    python benchmarks/projection_views.py [--vehicles 200000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backend.data_manager import DataManager  # noqa: E402
+from src.models.vehicle_status import VehicleStatus  # noqa: E402
+from src.ui.main_gui import TREE_COLUMNS  # noqa: E402
+
+
+def measure(name, func):
+    gc.collect()
+    started = time.perf_counter()
+    rows = func()
+    elapsed = time.perf_counter() - started
+    del rows
+
+    gc.collect()
+    tracemalloc.start()
+    rows = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<16} {len(rows):>8} satır  {elapsed:6.2f} sn  "
+          f"tutulan {current / 2**20:6.1f} MB  tepe {peak / 2**20:6.1f} MB")
+    return elapsed, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vehicles', type=int, default=200000)
+    args = parser.parse_args()
+
+    dm = DataManager(os.path.join(tempfile.mkdtemp(), 'views.db'))
+    today = date.today()
+    with dm.conn:
+        dm.conn.executemany(
+            "INSERT INTO vehicles (plaka, marka, model, ucret, durum, kiralayan, baslangic_tarihi, "
+            "bitis_tarihi, sigorta_bitis, kasko_bitis) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((f"34 V {i:06d}", ("Renault", "Fiat", "Toyota")[i % 3], "Model", 1000.0,
+              VehicleStatus.KIRADA if i % 4 == 0 else VehicleStatus.MUSAIT,
+              f"Müşteri {i}" if i % 4 == 0 else None, today, today + timedelta(days=3),
+              today + timedelta(days=365), today + timedelta(days=365))
+             for i in range(args.vehicles))
+        )
+
+    full_time, full_mem = measure("tam Vehicle", dm.get_all_vehicles)
+    view_time, view_mem = measure("görünüm", lambda: dm.get_all_vehicles(TREE_COLUMNS))
+    print(f"\nBellek: %{view_mem / full_mem * 100:.0f}  Süre: {full_time / view_time:.1f}x hızlı")
+    dm.events.close()
+    dm.conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import base64
+import hashlib
+import hmac
+import os
+
+# Varsayılan KDF parametreleri; benchmarks/kdf_params.py ile masa bilgisayarlarında
+# girişin 300 ms altında kalacağı en güçlü değerler seçilmelidir
+SCRYPT_N = 2 ** 15
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 600000
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+SCRYPT = 'scrypt'
+PBKDF2 = 'pbkdf2_sha256'
+# Bazı Python derlemelerinde (eski OpenSSL) hashlib.scrypt yoktur
+DEFAULT_SCHEME = SCRYPT if hasattr(hashlib, 'scrypt') else PBKDF2
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii')
+
+
+class PasswordHasher:
+    """Parolaları ayarlanabilir bir KDF ile özetler ve doğrular.
+
+    Saklanan biçim '$' ile ayrılmış tek bir metindir:
+        scrypt$n$r$p$tuz$özet
+        pbkdf2_sha256$iterasyon$tuz$özet
+    Bu biçimde olmayan değerler eski düz metin parola kabul edilir; doğru
+    girildiklerinde verify yeniden özetleme gerektiğini bildirir. Parametreleri
+    güncel ayarlardan farklı olan özetler için de aynısı geçerlidir.
+
+    hash ve verify bilinçli olarak yavaştır (yüzlerce ms); arayüzden
+    AuthWorker üzerinden çağrılmalıdır.
+    """
+
+    def __init__(self, scheme: str = DEFAULT_SCHEME, n: int = SCRYPT_N, r: int = SCRYPT_R,
+                 p: int = SCRYPT_P, iterations: int = PBKDF2_ITERATIONS):
+        if scheme not in (SCRYPT, PBKDF2):
+            raise ValueError(f"Bilinmeyen KDF: {scheme}")
+        self.scheme = scheme
+        self.n, self.r, self.p = n, r, p
+        self.iterations = iterations
+
+    def _params(self):
+        return (self.n, self.r, self.p) if self.scheme == SCRYPT else (self.iterations,)
+
+    @staticmethod
+    def _derive(scheme: str, params, password: str, salt: bytes) -> bytes:
+        secret = password.encode('utf-8')
+        if scheme == SCRYPT:
+            n, r, p = params
+            # scrypt belleği yaklaşık 128 * n * r bayttır; varsayılan sınır (32 MB) büyük n için yetmez
+            return hashlib.scrypt(secret, salt=salt, n=n, r=r, p=p,
+                                  maxmem=256 * n * r * p + 2 ** 20, dklen=HASH_BYTES)
+        (iterations,) = params
+        return hashlib.pbkdf2_hmac('sha256', secret, salt, iterations, dklen=HASH_BYTES)
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(SALT_BYTES)
+        digest = self._derive(self.scheme, self._params(), password, salt)
+        return '$'.join((self.scheme, *map(str, self._params()), _b64(salt), _b64(digest)))
+
+    @staticmethod
+    def _parse(stored: str):
+        """(şema, parametreler, tuz, özet); özet biçiminde değilse None."""
+        parts = stored.split('$')
+        expected = {SCRYPT: 6, PBKDF2: 4}.get(parts[0])
+        if expected is None or len(parts) != expected:
+            return None
+        try:
+            params = tuple(int(x) for x in parts[1:-2])
+            return parts[0], params, base64.b64decode(parts[-2]), base64.b64decode(parts[-1])
+        except ValueError:
+            return None
+
+    def is_hashed(self, stored: str) -> bool:
+        return self._parse(stored) is not None
+
+    def verify(self, password: str, stored: str):
+        """Parolayı saklanan değerle sabit sürede karşılaştırır.
+
+        Returns:
+            tuple: (doğru mu, yeniden özetlenmeli mi)
+        """
+        parsed = self._parse(stored)
+        if parsed is None:
+            # Eski düz metin kayıt
+            ok = hmac.compare_digest(password.encode('utf-8'), stored.encode('utf-8'))
+            return ok, ok
+        scheme, params, salt, digest = parsed
+        ok = hmac.compare_digest(self._derive(scheme, params, password, salt), digest)
+        return ok, ok and (scheme != self.scheme or params != self._params())
+
+    def dummy_verify(self, password: str):
+        """Olmayan kullanıcı için de aynı süreyi harcar (kullanıcı adı tahminini zorlaştırır)."""
+        self._derive(self.scheme, self._params(), password, b'\0' * SALT_BYTES)
+        return False, False
+
+
+class AuthWorker:
+    """KDF işlerini Tk ana döngüsünü bloklamadan tek bir arka plan iş parçacığında yürütür.
+
+    submit bir Future döndürür; sonuç, ana iş parçacığında root.after ile
+    future tamamlanana kadar yoklanarak alınır. Veritabanı erişimi ana
+    iş parçacığında kalır (sqlite3 bağlantısı iş parçacığına bağlıdır).
+    KDF hata verirse (ör. desteklenmeyen scrypt parametreleri) istisna
+    Tk döngüsüne sızmaz, errback'e iletilir.
+    """
+
+    POLL_MS = 15
+
+    def __init__(self, root):
+        # concurrent.futures (logging ile birlikte) sadece arayüzde yüklenir;
+        # DataManager'ı içe aktaran rapor aracı bu maliyeti ödemez
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auth")
+
+    def submit(self, func, *args, callback=None, errback=None):
+        future = self._executor.submit(func, *args)
+        if callback is not None or errback is not None:
+            self._poll(future, callback, errback)
+        return future
+
+    def _poll(self, future, callback, errback):
+        if not future.done():
+            self.root.after(self.POLL_MS, self._poll, future, callback, errback)
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            if errback is not None:
+                errback(e)
+            return
+        if callback is not None:
+            callback(result)
@@ -0,0 +1,78 @@
+from array import array
+from bisect import bisect_left
+
+# Anahtarda Türkçe harfler ve şapkalı ünlüler ASCII karşılıklarına indirgenir;
+# "Çağrı Öz", "cagri oz" ve "ÇAĞRI  ÖZ" aynı müşteridir.
+_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+
+def clean_name(name: str) -> str:
+    """Müşterinin kaydedilen adı: baştaki/sondaki ve art arda boşluklar atılır."""
+    return ' '.join(name.split())
+
+
+def customer_key(name) -> str:
+    """Müşteri adının normalize arama anahtarı (boş/None için '').
+
+    Büyük-küçük harf çevirisi Türkçe kurallarıyla yapılır (İ→i, I→ı);
+    str.lower() 'İ'yi 'i' + birleşik nokta yaptığından önce elle çevrilir.
+    Boşluklar tek boşluğa indirgenir.
+    """
+    if not name:
+        return ''
+    return clean_name(name.replace('İ', 'i').replace('I', 'ı').lower().translate(_FOLD))
+
+
+class CustomerIndex:
+    """Müşteri anahtarlarının bellek içi önek indeksi.
+
+    Trie düğümleri yerine sıralı bir anahtar listesi ve ona paralel bir id
+    dizisi tutulur (düzleştirilmiş trie): bir öneke uyan anahtarlar
+    sıralı listede ardışık olduğundan ilk eşleşme ikili aramayla bulunur ve
+    en fazla limit kayıt okunur (O(log n + k)). Düğüm nesnesi olmadığı için
+    milyon müşteride bile bellek, anahtar metinleri ve 8 baytlık id'lerden
+    ibarettir.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._ids = array('q')
+
+    @classmethod
+    def from_rows(cls, rows):
+        """anahtar sırasına göre gelen (anahtar, id) satırlarından kurar.
+
+        SQLite'ın BINARY sıralaması UTF-8 bayt sırasıdır; bu da Python'un
+        metin karşılaştırmasıyla aynı sırayı verir, yeniden sıralamaya gerek yoktur.
+        """
+        index = cls()
+        for key, customer_id in rows:
+            index._keys.append(key)
+            index._ids.append(customer_id)
+        return index
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key: str, customer_id: int):
+        """Anahtarı ekler; zaten varsa id'sini günceller."""
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            self._ids[i] = customer_id
+        else:
+            self._keys.insert(i, key)
+            self._ids.insert(i, customer_id)
+
+    def prefix(self, text: str, limit: int = 10):
+        """Anahtarı text'in anahtarıyla başlayan ilk limit müşterinin id'leri, alfabetik."""
+        key = customer_key(text)
+        if not key:
+            return []
+        keys = self._keys
+        i = bisect_left(keys, key)
+        end = min(i + limit, len(keys))
+        matches = []
+        while i < end and keys[i].startswith(key):
+            matches.append(self._ids[i])
+            i += 1
+        return matches
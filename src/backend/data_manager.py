@@ -1,19 +1,106 @@
+import json
 import sqlite3
-from src.models.vehicle import Vehicle
+from contextlib import nullcontext
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from src.models.dates import to_date, month_key
+from src.models.vehicle import Vehicle, VEHICLE_COLUMNS
+from src.models.vehicle_status import VehicleStatus, STATUS_BY_CODE
+from src.models.row_view import make_view
 from src.models.user import User
-from src.models.rental_history import RentalHistory
+from src.models.rental_history import RentalHistory, HISTORY_COLUMNS
+from src.backend.revenue_cube import RevenueCube
+from src.backend.revenue_index import RevenueIndex
+from src.backend.quantile_sketch import QuantileStore
+from src.backend.fleet_snapshot import FleetSnapshot, SNAPSHOT_QUERY
+from src.backend.expiry_index import ExpiryIndex, EXPIRY_FIELDS
+from src.backend.customer_index import CustomerIndex, customer_key, clean_name
+from src.backend.event_log import EventLog, EVENT_FAILED_RENTAL
+from src.backend.credentials import PasswordHasher
+from src.backend.journal import (Journal, VEHICLE_ADDED, VEHICLE_UPDATED, VEHICLE_INSURED,
+                                 VEHICLE_DELETED, update_event_type)
+
+VEHICLE_SELECT = f"SELECT {', '.join(VEHICLE_COLUMNS)} FROM vehicles"
+HISTORY_SELECT = f"SELECT {', '.join(HISTORY_COLUMNS)} FROM rental_history"
+
+
+def _safe_date(value):
+    try:
+        return to_date(value)
+    except ValueError:
+        return None  # Bozuk tarih metinleri tarih yokmuş gibi okunur
+
+
+@lru_cache(maxsize=65536)
+def _convert_date(value: bytes):
+    # date değişmez olduğundan aynı günü taşıyan satırlar tek nesneyi paylaşır
+    return _safe_date(value.decode())
+
+
+# DATE tanımlı sütunlar ISO metin olarak saklanır ve datetime.date olarak okunur;
+# tarih ayrıştırma sadece veritabanı sınırında bir kez yapılır.
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter("DATE", _convert_date)
+
 
 class DataManager:
-    def __init__(self, db_path: str):
-        self.conn = sqlite3.connect(db_path)
+    # Tarih tutan sütunlar (DATE tipinde)
+    DATE_COLUMNS = {
+        'vehicles': ('baslangic_tarihi', 'bitis_tarihi', 'sigorta_bitis', 'kasko_bitis'),
+        'rental_history': ('baslangic_tarihi', 'bitis_tarihi', 'iade_tarihi'),
+        'reservations': ('baslangic_tarihi', 'bitis_tarihi'),
+    }
+
+    def __init__(self, db_path: str, read_only: bool = False):
+        self.db_path = db_path
+        self.read_only = read_only
+        migrate_copy = False
+        if read_only:
+            # Raporlama gibi sadece okuyan çağıranlar için; şema oluşturulmaz
+            uri = Path(db_path).absolute().as_uri() + "?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, detect_types=sqlite3.PARSE_DECLTYPES)
+            self.conn.row_factory = sqlite3.Row
+            if self._needs_migration():
+                # Uygulamayla hiç açılmamış eski şema: dosyaya dokunmadan bellekteki
+                # bir kopya taşınır, okuma yolları tek şemayı varsayabilir
+                memory = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+                self.conn.backup(memory)
+                self.conn.close()
+                self.conn = memory
+                migrate_copy = True
+        else:
+            self.conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
         self.conn.row_factory = sqlite3.Row
-        self._create_tables()
-        self._create_default_admin()
+        # Eski kayıtları müşterilere bağlarken SQL içinde aynı normalizasyon kullanılır
+        self.conn.create_function("musteri_anahtari", 1, customer_key, deterministic=True)
+        self.conn.create_function("musteri_adi", 1, clean_name, deterministic=True)
+        self.revenue_cube = RevenueCube(self.conn)
+        self.revenue_index = RevenueIndex(self.conn)
+        self.quantiles = QuantileStore(self.conn)
+        self.journal = Journal(self.conn)
+        self._views = {}  # (model, sütunlar) -> satır görünümü sınıfı
+        self._expiry_index = None  # İlk bildirim sorgusunda kurulur
+        self._expiry_journal_id = 0  # expiry_index'e işlenmiş en büyük journal.id
+        self._customer_index = None  # İlk müşteri aramasında kurulur
+        self._customer_last_id = 0  # customer_index'e işlenmiş en büyük customers.id
+        self.hasher = PasswordHasher()
+        # Salt okunur bağlantılar olay yazmaz
+        self.events = None if read_only else EventLog(db_path)
+        if not read_only:
+            self._create_tables()
+            self._create_default_admin()
+            self.journal.snapshot_in_background(db_path)
+        elif migrate_copy:
+            self._create_tables()
 
     # ---------- TABLES ----------
     def _create_tables(self):
         c = self.conn.cursor()
 
+        # Tarihleri veya araç durumunu metin olarak tanımlayan eski tablolar yeniden oluşturulacak
+        legacy_tables = self._detach_legacy_tables()
+
         c.execute("""
                   CREATE TABLE IF NOT EXISTS users
                   (
@@ -32,7 +119,28 @@ class DataManager:
                   )
                   """)
 
+        # Araç durum kodları ve Türkçe adları
         c.execute("""
+                  CREATE TABLE IF NOT EXISTS durumlar
+                  (
+                      kod INTEGER PRIMARY KEY,
+                      ad TEXT NOT NULL UNIQUE
+                  )
+                  """)
+        c.executemany("INSERT OR IGNORE INTO durumlar (kod, ad) VALUES (?, ?)",
+                      [(status, status.label) for status in VehicleStatus])
+
+        # Normalize müşteri kayıtları; anahtar customer_key ile üretilir
+        c.execute("""
+                  CREATE TABLE IF NOT EXISTS customers
+                  (
+                      id INTEGER PRIMARY KEY,
+                      ad TEXT NOT NULL,
+                      anahtar TEXT NOT NULL UNIQUE
+                  )
+                  """)
+
+        c.execute(f"""
                   CREATE TABLE IF NOT EXISTS vehicles
                   (
                       plaka
@@ -45,22 +153,23 @@ class DataManager:
                       TEXT,
                       ucret
                       REAL,
-                      durum
-                      TEXT,
+                      durum INTEGER NOT NULL DEFAULT {VehicleStatus.MUSAIT:d} REFERENCES durumlar (kod)
+                          CHECK (durum IN ({', '.join(f'{status:d}' for status in VehicleStatus)})),
                       kiralayan
                       TEXT,
                       baslangic_tarihi
-                      TEXT,
+                      DATE,
                       bitis_tarihi
-                      TEXT,
+                      DATE,
                       sigorta_bitis
-                      TEXT,
+                      DATE,
                       kasko_bitis
-                      TEXT
+                      DATE,
+                      musteri_id INTEGER REFERENCES customers (id)
                   )
                   """)
         
-        # Migration: Eski tabloya sigorta_bitis ve kasko_bitis sütunlarını ekle
+        # Migration: Eski tabloya sigorta_bitis, kasko_bitis ve musteri_id sütunlarını ekle
         self._migrate_vehicles_table()
 
         c.execute("""
@@ -76,28 +185,62 @@ class DataManager:
                       kiralayan
                       TEXT,
                       baslangic_tarihi
-                      TEXT,
+                      DATE,
                       bitis_tarihi
-                      TEXT,
+                      DATE,
                       toplam_ucret
                       REAL,
                       iade_tarihi
-                      TEXT
+                      DATE,
+                      musteri_id INTEGER REFERENCES customers (id)
                   )
                   """)
+        try:
+            c.execute("ALTER TABLE rental_history ADD COLUMN musteri_id INTEGER REFERENCES customers (id)")
+        except sqlite3.OperationalError:
+            pass  # Sütun zaten var
+
+        # Operasyonel olay günlüğü (başarısız kiralamalar dahil)
+        EventLog.create_table(self.conn)
 
-        # Başarısız kiralama bildirimleri tablosu
+        # Müsaitlik aramasında kullanılan indeksler
+        c.execute("CREATE INDEX IF NOT EXISTS idx_vehicles_durum ON vehicles (durum, bitis_tarihi)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_vehicles_ucret ON vehicles (ucret)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_vehicles_sigorta ON vehicles (sigorta_bitis)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_vehicles_kasko ON vehicles (kasko_bitis)")
+
+        # Müşteri geçmişi customers üzerinden birleştirilir; bu indeks ve araçlardaki
+        # kısmi indeks, henüz bağlanmamış kayıtları açılışta tarama yapmadan bulur
+        c.execute("CREATE INDEX IF NOT EXISTS idx_rental_history_musteri ON rental_history (musteri_id, baslangic_tarihi)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_vehicles_bagsiz ON vehicles (kiralayan) "
+                  "WHERE musteri_id IS NULL AND kiralayan IS NOT NULL")
+
+        # İleri tarihli kiralamalar (rezervasyonlar)
         c.execute("""
-                  CREATE TABLE IF NOT EXISTS failed_rentals
+                  CREATE TABLE IF NOT EXISTS reservations
                   (
                       id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      plaka TEXT,
-                      marka TEXT,
-                      model TEXT,
-                      tarih TEXT,
-                      sebep TEXT
+                      plaka TEXT NOT NULL,
+                      kiralayan TEXT,
+                      baslangic_tarihi DATE NOT NULL,
+                      bitis_tarihi DATE NOT NULL,
+                      durum TEXT NOT NULL DEFAULT 'bekliyor'
                   )
                   """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_reservations_plaka ON reservations (plaka, baslangic_tarihi)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_reservations_durum ON reservations (durum, baslangic_tarihi)")
+
+        self._restore_legacy_tables(legacy_tables)
+        self._link_customers()
+
+        # Plaka × müşteri × ay gelir küpü
+        self.revenue_cube.create_table()
+
+        # Marka ve ay bazında süre/tutar yüzdelik özetleri
+        self.quantiles.create_table()
+
+        # Durum değişikliklerinin olay günlüğü ve anlık görüntüleri
+        self.journal.create_table()
 
         self.conn.commit()
 
@@ -105,40 +248,133 @@ class DataManager:
         """Eski tabloya yeni sütunları ekle."""
         c = self.conn.cursor()
         try:
-            c.execute("ALTER TABLE vehicles ADD COLUMN sigorta_bitis TEXT")
+            c.execute("ALTER TABLE vehicles ADD COLUMN sigorta_bitis DATE")
         except sqlite3.OperationalError:
             pass  # Sütun zaten var
         try:
-            c.execute("ALTER TABLE vehicles ADD COLUMN kasko_bitis TEXT")
+            c.execute("ALTER TABLE vehicles ADD COLUMN kasko_bitis DATE")
+        except sqlite3.OperationalError:
+            pass  # Sütun zaten var
+        try:
+            c.execute("ALTER TABLE vehicles ADD COLUMN musteri_id INTEGER REFERENCES customers (id)")
         except sqlite3.OperationalError:
             pass  # Sütun zaten var
         self.conn.commit()
 
+    def _columns(self, table):
+        return {row["name"]: row["type"] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+
+    def _is_legacy(self, table, columns) -> bool:
+        if not all(columns.get(col, "DATE").upper() == "DATE" for col in self.DATE_COLUMNS[table]):
+            return True
+        # Araç durumu eskiden serbest metindi
+        return table == 'vehicles' and columns.get('durum', "INTEGER").upper() != "INTEGER"
+
+    def _needs_migration(self) -> bool:
+        """Tablolar eski tanımlıysa veya okunan sütunlardan biri eksikse True."""
+        for table, expected in (('vehicles', (*VEHICLE_COLUMNS, 'musteri_id')),
+                                ('rental_history', (*HISTORY_COLUMNS, 'musteri_id'))):
+            columns = self._columns(table)
+            if columns and (self._is_legacy(table, columns) or not set(expected) <= set(columns)):
+                return True
+        return False
+
+    def _detach_legacy_tables(self):
+        """Tarih sütunları TEXT veya araç durumu metin tanımlı tabloları '<tablo>_eski' adıyla kenara alır.
+
+        Yeni tablo DATE sütunlar ve durum kodlarıyla oluşturulduktan sonra
+        veriler _restore_legacy_tables ile taşınır. Yarıda kalmış bir taşıma
+        bir sonraki açılışta tamamlanır.
+        """
+        legacy = []
+        for table in self.DATE_COLUMNS:
+            if self._columns(f"{table}_eski"):
+                legacy.append(table)
+                continue
+            if not self._is_legacy(table, self._columns(table)):
+                continue
+            # İndeksler yeni tabloda yeniden oluşturulur
+            for index in self.conn.execute(f"PRAGMA index_list({table})").fetchall():
+                if index["origin"] == "c":
+                    self.conn.execute(f"DROP INDEX {index['name']}")
+            self.conn.execute(f"ALTER TABLE {table} RENAME TO {table}_eski")
+            legacy.append(table)
+        return legacy
+
+    def _restore_legacy_tables(self, tables):
+        """Kenara alınan tabloların verilerini tarihleri ISO biçimine, durumları koda çevirerek taşır."""
+        for table in tables:
+            old_columns = self._columns(f"{table}_eski")
+            columns = [col for col in self._columns(table) if col in old_columns]
+            date_positions = [i for i, col in enumerate(columns) if col in self.DATE_COLUMNS[table]]
+            status_position = columns.index('durum') if table == 'vehicles' and 'durum' in columns else None
+            insert = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                      f"VALUES ({', '.join('?' * len(columns))})")
+
+            c = self.conn.execute(f"SELECT {', '.join(columns)} FROM {table}_eski")
+            while True:
+                rows = c.fetchmany(5000)
+                if not rows:
+                    break
+                converted = []
+                for row in rows:
+                    row = list(row)
+                    for i in date_positions:
+                        row[i] = _safe_date(row[i])
+                    if status_position is not None:
+                        # Yazım hatalı eski durumlar kiralanamaz tarafta kalır; yönetici düzeltir
+                        row[status_position] = VehicleStatus.parse(row[status_position], VehicleStatus.BAKIMDA)
+                    converted.append(row)
+                self.conn.executemany(insert, converted)
+
+            self.conn.execute(f"DROP TABLE {table}_eski")
+            self.conn.commit()
+
     # ---------- USERS ----------
     def user_exists(self, username):
         c = self.conn.execute("SELECT 1 FROM users WHERE username=?", (username,))
         return c.fetchone() is not None
 
-    def create_user(self, username, password, role="user"):
+    def create_user(self, username, password_hash, role="user"):
+        """Kullanıcı ekler; parola önceden hasher.hash ile özetlenmiş olmalıdır."""
         try:
             self.conn.execute(
                 "INSERT INTO users VALUES (?, ?, ?)",
-                (username, password, role)
+                (username, password_hash, role)
             )
             self.conn.commit()
             return True
         except:
             return False
 
+    def get_credentials(self, username):
+        """(saklanan parola/özet, rol) veya kullanıcı yoksa None."""
+        row = self.conn.execute(
+            "SELECT password, role FROM users WHERE username=?", (username,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def set_password_hash(self, username, password_hash):
+        self.conn.execute("UPDATE users SET password=? WHERE username=?", (password_hash, username))
+        self.conn.commit()
+
     def authenticate_user(self, username, password):
-        c = self.conn.execute(
-            "SELECT * FROM users WHERE username=? AND password=?",
-            (username, password)
-        )
-        row = c.fetchone()
-        if not row:
+        """Parolayı doğrular; eski düz metin veya eski parametreli kaydı yeniden özetler.
+
+        KDF bilinçli olarak yavaştır; arayüz bu metodu değil, AuthWorker
+        üzerinden get_credentials + hasher.verify akışını kullanır.
+        """
+        credentials = self.get_credentials(username)
+        if credentials is None:
+            self.hasher.dummy_verify(password)
+            return None
+        stored, role = credentials
+        ok, needs_rehash = self.hasher.verify(password, stored)
+        if not ok:
             return None
-        return User(row["username"], row["role"])
+        if needs_rehash:
+            self.set_password_hash(username, self.hasher.hash(password))
+        return User(username, role)
 
     # ---------- VEHICLES ----------
     def add_vehicle(self, v: Vehicle):
@@ -151,39 +387,153 @@ class DataManager:
 
         self.conn.execute("""
                           INSERT INTO vehicles (plaka, marka, model, ucret, durum, kiralayan, baslangic_tarihi,
-                                                bitis_tarihi, sigorta_bitis, kasko_bitis)
-                          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                                bitis_tarihi, sigorta_bitis, kasko_bitis, musteri_id)
+                          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                           """, (v.plaka, v.marka, v.model, v.ucret, v.durum, v.kiralayan, v.baslangic_tarihi,
-                                v.bitis_tarihi, v.sigorta_bitis, v.kasko_bitis))
+                                v.bitis_tarihi, v.sigorta_bitis, v.kasko_bitis, self._customer_id(v.kiralayan)))
+        self.journal.vehicle_added(v)
         self.conn.commit()
+        if self._expiry_index is not None:
+            self._expiry_index.add_vehicle(v)
         return True
 
-    def get_all_vehicles(self):
-        c = self.conn.execute("SELECT * FROM vehicles")
-        return [Vehicle(**row) for row in map(dict, c.fetchall())]
+    def _fetch(self, model, query, params=()):
+        """Sorgu satırlarını model.from_row ile nesneye çevirir.
+
+        Satırlar sqlite3.Row yerine düz tuple olarak okunur; sorgu, modelin
+        sütun sırasını (VEHICLE_SELECT / HISTORY_SELECT) kullanmalıdır.
+        """
+        c = self.conn.cursor()
+        c.row_factory = None
+        return list(map(model.from_row, c.execute(query, params)))
+
+    def _view_class(self, model, columns):
+        """İstenen sütunlar için (önbellekli) satır görünümü sınıfı; anahtar sütun başa eklenir."""
+        columns = tuple(columns)
+        cls = self._views.get((model, columns))
+        if cls is None:
+            # Tekrarlanan metinler from_row'daki gibi intern edilir
+            if model is Vehicle:
+                key, allowed, table = 'plaka', VEHICLE_COLUMNS, 'vehicles'
+                loader, converters = self.get_vehicle_by_plaka, {'durum': STATUS_BY_CODE.__getitem__}
+                interned = ('marka', 'model')
+            else:
+                key, allowed, table = 'id', ('id', *HISTORY_COLUMNS), 'rental_history'
+                loader, converters = self._get_rental_history_by_id, None
+                interned = ('plaka', 'kiralayan')
+            unknown = set(columns) - set(allowed)
+            if unknown:
+                raise ValueError(f"{table} tablosunda olmayan sütun: {', '.join(sorted(unknown))}")
+            projection = (key, *(name for name in columns if name != key))
+            cls = make_view(model, projection, key, loader, converters, interned)
+            cls.select = f"SELECT {', '.join(projection)} FROM {table}"
+            self._views[(model, columns)] = cls
+        return cls
+
+    def _fetch_view(self, model, columns, where="", params=()):
+        """Sadece istenen sütunları okur ve satırları hafif görünümlere sarar.
+
+        Görünüm, projeksiyon dışındaki bir alana erişilince tam nesneyi
+        yükler (bkz. make_view); tablo ve sayım gibi birkaç alan yeten
+        yerlerde tam model nesnesi kurulmaz.
+        """
+        cls = self._view_class(model, columns)
+        c = self.conn.cursor()
+        c.row_factory = None
+        return list(map(cls.from_row, c.execute(f"{cls.select} {where}", params)))
+
+    def get_all_vehicles(self, columns=None):
+        """columns verilirse tam Vehicle yerine o sütunları taşıyan görünümler döner."""
+        if columns is not None:
+            return self._fetch_view(Vehicle, columns)
+        return self._fetch(Vehicle, VEHICLE_SELECT)
 
     def get_vehicle_by_plaka(self, plaka):
-        c = self.conn.execute("SELECT * FROM vehicles WHERE plaka=?", (plaka,))
-        row = c.fetchone()
-        return Vehicle(**row) if row else None
+        rows = self._fetch(Vehicle, f"{VEHICLE_SELECT} WHERE plaka=?", (plaka,))
+        return rows[0] if rows else None
 
     def update_vehicle(self, plaka: str, data: dict):
         """Araç bilgilerini günceller. data dict içinde güncellenecek alanlar olmalı."""
         allowed_fields = ['marka', 'model', 'ucret', 'durum', 'kiralayan', 'baslangic_tarihi', 'bitis_tarihi', 'sigorta_bitis', 'kasko_bitis']
-        updates = []
-        values = []
+        changes = {}
         for key, value in data.items():
             if key in allowed_fields:
-                updates.append(f"{key}=?")
-                values.append(value)
-        if updates:
-            values.append(plaka)
-            self.conn.execute(f"UPDATE vehicles SET {', '.join(updates)} WHERE plaka=?", values)
+                if key == 'durum':
+                    value = VehicleStatus.parse(value)
+                elif key in self.DATE_COLUMNS['vehicles']:
+                    value = to_date(value)
+                changes[key] = value
+        if changes:
+            columns = dict(changes)
+            if 'kiralayan' in changes:
+                columns['musteri_id'] = self._customer_id(changes['kiralayan'])
+            c = self.conn.execute(
+                f"UPDATE vehicles SET {', '.join(f'{key}=?' for key in columns)} WHERE plaka=?",
+                [*columns.values(), plaka]
+            )
+            if c.rowcount:
+                self.journal.append(update_event_type(changes), plaka, changes)
             self.conn.commit()
+            if c.rowcount and self._expiry_index is not None:
+                self._expiry_index.update(plaka, changes)
+
+    def renew_insurance(self, fields, new_date, plates=None, expiring_within: int = None, today=None):
+        """Sigorta ve/veya kasko bitişini tek UPDATE ifadesiyle toplu yeniler.
+
+        Araçlar plates listesiyle, expiring_within ile (bugünden itibaren o
+        kadar gün içinde biten veya süresi geçmiş olanlar) ya da ikisiyle
+        birlikte seçilir. expiring_within verildiğinde her alan ayrı
+        değerlendirilir: sigortası yaklaşan bir aracın kaskosu uzaksa
+        kaskosuna dokunulmaz. Journal olayları aynı transaction içinde yazılır.
+
+        Args:
+            fields: ('sigorta_bitis', 'kasko_bitis') alt kümesi
+            new_date: Yeni bitiş tarihi
+
+        Returns:
+            list: Güncellenen plakalar
+        """
+        fields = tuple(fields)
+        if not fields or set(fields) - {field for field, _ in EXPIRY_FIELDS}:
+            raise ValueError(f"Geçersiz alan: {fields}")
+        if plates is None and expiring_within is None:
+            raise ValueError("plates veya expiring_within verilmelidir")
+
+        params = {'yeni': to_date(new_date), 'plakalar': None, 'sinir': None}
+        conditions = []
+        if plates is not None:
+            params['plakalar'] = json.dumps(list(plates))
+            conditions.append("plaka IN (SELECT value FROM json_each(:plakalar))")
+        if expiring_within is not None:
+            params['sinir'] = (to_date(today) or date.today()) + timedelta(days=expiring_within)
+            conditions.append(f"({' OR '.join(f'{field} <= :sinir' for field in fields)})")
+        assignments = ', '.join(
+            f"{field} = CASE WHEN :sinir IS NULL OR {field} <= :sinir THEN :yeni ELSE {field} END"
+            for field in fields
+        )
+
+        with self.conn:
+            c = self.conn.cursor()
+            c.row_factory = None
+            rows = c.execute(
+                f"UPDATE vehicles SET {assignments} WHERE {' AND '.join(conditions)} "
+                f"RETURNING plaka, {', '.join(fields)}",
+                params
+            ).fetchall()
+            changes = [(row[0], dict(zip(fields, map(to_date, row[1:])))) for row in rows]
+            self.journal.append_many(update_event_type(fields), changes)
+        if self._expiry_index is not None:
+            for plaka, values in changes:
+                self._expiry_index.update(plaka, values)
+        return [plaka for plaka, _ in changes]
 
     def delete_vehicle(self, plaka):
-        self.conn.execute("DELETE FROM vehicles WHERE plaka=?", (plaka,))
+        c = self.conn.execute("DELETE FROM vehicles WHERE plaka=?", (plaka,))
+        if c.rowcount:
+            self.journal.append(VEHICLE_DELETED, plaka)
         self.conn.commit()
+        if c.rowcount and self._expiry_index is not None:
+            self._expiry_index.remove(plaka)
 
     def remove_vehicle(self, plaka):
         """delete_vehicle için alias - rental_service uyumluluğu."""
@@ -195,31 +545,324 @@ class DataManager:
         self.conn.commit()
 
     # ---------- RENTAL HISTORY ----------
+    def _insert_rental_histories(self, histories):
+        """Geçmiş kayıtlarını ve türetilmiş özetleri yazar (commit çağırana aittir)."""
+        customer_ids = [self._customer_id(h.kiralayan) for h in histories]
+        self.conn.executemany("""
+                              INSERT INTO rental_history
+                              (plaka, kiralayan, baslangic_tarihi, bitis_tarihi, toplam_ucret, iade_tarihi,
+                               musteri_id)
+                              VALUES (?, ?, ?, ?, ?, ?, ?)
+                              """, [(
+                                  h.plaka, h.kiralayan,
+                                  h.baslangic_tarihi, h.bitis_tarihi,
+                                  h.toplam_ucret, h.iade_tarihi,
+                                  customer_id
+                              ) for h, customer_id in zip(histories, customer_ids)])
+        for h, customer_id in zip(histories, customer_ids):
+            self.revenue_cube.add(h, customer_id)
+            row = self.conn.execute("SELECT marka FROM vehicles WHERE plaka=?", (h.plaka,)).fetchone()
+            self.quantiles.add(
+                row["marka"] if row else None, month_key(h.baslangic_tarihi),
+                RevenueCube.rental_days(h.baslangic_tarihi, h.bitis_tarihi), h.toplam_ucret
+            )
+
     def add_rental_history(self, h: RentalHistory):
-        self.conn.execute("""
-                          INSERT INTO rental_history
-                          (plaka, kiralayan, baslangic_tarihi, bitis_tarihi, toplam_ucret, iade_tarihi)
-                          VALUES (?, ?, ?, ?, ?, ?)
-                          """, (
-                              h.plaka, h.kiralayan,
-                              h.baslangic_tarihi, h.bitis_tarihi,
-                              h.toplam_ucret, h.iade_tarihi
-                          ))
+        self._insert_rental_histories([h])
+        self.journal.history_added(h)
+        self.conn.commit()
+
+    # ---------- STATE TRANSITIONS ----------
+    # müsait→kirada ve kirada→müsait geçişleri okuma-değiştirme-yazma yerine
+    # tek bir koşullu UPDATE ile yapılır; aynı araç için yarışan iki masadan
+    # sadece biri satırı güncelleyebilir.
+
+    # +r.durum: durum indeksi yerine araç başına (plaka, baslangic) indeksi kullanılsın
+    _OVERLAPPING_RESERVATION = """
+        SELECT 1 FROM reservations r
+        WHERE r.plaka = vehicles.plaka AND +r.durum = 'bekliyor'
+          AND r.baslangic_tarihi <= ? AND r.bitis_tarihi >= ?
+    """
+
+    def _start_rental_stmt(self, plaka, kiralayan, baslangic, bitis):
+        c = self.conn.execute(f"""
+            UPDATE vehicles SET durum={VehicleStatus.KIRADA:d}, kiralayan=?, baslangic_tarihi=?, bitis_tarihi=?
+            WHERE plaka=? AND durum={VehicleStatus.MUSAIT:d}
+              AND sigorta_bitis >= ? AND kasko_bitis >= ?
+              AND NOT EXISTS ({self._OVERLAPPING_RESERVATION})
+            RETURNING {', '.join(VEHICLE_COLUMNS)}
+        """, (kiralayan, baslangic, bitis, plaka, bitis, bitis, bitis, baslangic))
+        rows = c.fetchall()
+        if not rows:
+            return None
+        self._link_vehicle_customer(plaka, kiralayan)
+        self.journal.vehicle_rented(plaka, kiralayan, baslangic, bitis)
+        return Vehicle.from_row(rows[0])
+
+    def _add_reservation_stmt(self, plaka, kiralayan, baslangic, bitis):
+        c = self.conn.execute(f"""
+            INSERT INTO reservations (plaka, kiralayan, baslangic_tarihi, bitis_tarihi)
+            SELECT plaka, ?, ?, ? FROM vehicles
+            WHERE plaka=? AND durum != {VehicleStatus.BAKIMDA:d}
+              AND (durum != {VehicleStatus.KIRADA:d} OR bitis_tarihi < ?)
+              AND sigorta_bitis >= ? AND kasko_bitis >= ?
+              AND NOT EXISTS ({self._OVERLAPPING_RESERVATION})
+        """, (kiralayan, baslangic, bitis, plaka, baslangic, bitis, bitis, bitis, baslangic))
+        return c.lastrowid if c.rowcount == 1 else None
+
+    def _end_rental_stmt(self, vehicle: Vehicle, history: RentalHistory = None) -> bool:
+        # Okunan kiralama bilgisi hâlâ aynıysa (compare-and-swap) iade et
+        c = self.conn.execute(f"""
+            UPDATE vehicles SET durum={VehicleStatus.MUSAIT:d}, kiralayan=NULL, musteri_id=NULL,
+                                baslangic_tarihi=NULL, bitis_tarihi=NULL
+            WHERE plaka=? AND durum={VehicleStatus.KIRADA:d}
+              AND kiralayan IS ? AND baslangic_tarihi IS ? AND bitis_tarihi IS ?
+        """, (vehicle.plaka, vehicle.kiralayan, vehicle.baslangic_tarihi, vehicle.bitis_tarihi))
+        if c.rowcount != 1:
+            return False
+        self.journal.vehicle_returned(vehicle.plaka, history)
+        return True
+
+    def try_start_rental(self, plaka: str, kiralayan: str, baslangic: str, bitis: str):
+        """Araç müsaitse, sigorta/kaskosu bitişe kadar geçerliyse ve çakışan
+        rezervasyon yoksa kiralar.
+
+        Returns:
+            Vehicle | None: Güncellenmiş araç, koşul tutmadıysa None
+        """
+        vehicle = self._start_rental_stmt(plaka, kiralayan, baslangic, bitis)
+        self.conn.commit()
+        return vehicle
+
+    def try_add_reservation(self, plaka: str, kiralayan: str, baslangic: str, bitis: str):
+        """Araç uygunsa ve tarihler boşsa rezervasyon ekler; id veya None döndürür."""
+        reservation_id = self._add_reservation_stmt(plaka, kiralayan, baslangic, bitis)
         self.conn.commit()
+        return reservation_id
+
+    def try_end_rental(self, vehicle: Vehicle, history: RentalHistory = None) -> bool:
+        """Aracı iade alır ve geçmiş kaydını aynı transaction içinde yazar.
+
+        vehicle, iade öncesi okunan hâldir; bu arada başka biri iade ettiyse
+        hiçbir şey yazılmaz ve False döner.
+        """
+        with self.conn:
+            if not self._end_rental_stmt(vehicle, history):
+                return False
+            if history:
+                self._insert_rental_histories([history])
+        return True
 
-    def get_rental_history(self):
-        c = self.conn.execute("SELECT * FROM rental_history ORDER BY id DESC")
-        return [
-            RentalHistory(
-                row["plaka"],
-                row["kiralayan"],
-                row["baslangic_tarihi"],
-                row["bitis_tarihi"],
-                row["toplam_ucret"],
-                row["iade_tarihi"]
+    def try_activate_reservation(self, reservation: dict) -> bool:
+        """Bekleyen rezervasyonu, araç müsaitse kiralamaya çevirir."""
+        try:
+            c = self.conn.execute(
+                "UPDATE reservations SET durum='aktif' WHERE id=? AND durum='bekliyor'",
+                (reservation['id'],)
             )
-            for row in c.fetchall()
-        ]
+            if c.rowcount == 1:
+                c = self.conn.execute(f"""
+                    UPDATE vehicles SET durum={VehicleStatus.KIRADA:d}, kiralayan=?, baslangic_tarihi=?, bitis_tarihi=?
+                    WHERE plaka=? AND durum={VehicleStatus.MUSAIT:d}
+                """, (reservation['kiralayan'], reservation['baslangic_tarihi'],
+                      reservation['bitis_tarihi'], reservation['plaka']))
+            if c.rowcount != 1:
+                self.conn.rollback()
+                return False
+            self._link_vehicle_customer(reservation['plaka'], reservation['kiralayan'])
+            self.journal.vehicle_rented(reservation['plaka'], reservation['kiralayan'],
+                                        reservation['baslangic_tarihi'], reservation['bitis_tarihi'])
+            self.conn.commit()
+            return True
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+    def apply_rental_batch(self, rentals, reservations):
+        """Toplu kiralama ve rezervasyonları tek transaction içinde yazar.
+
+        Her öğe yine koşullu ifadeyle yazılır; bu arada başka bir masa aracı
+        kiraladıysa o öğe başarısız sayılır, diğerleri etkilenmez.
+
+        Args:
+            rentals: [(plaka, kiralayan, baslangic, bitis), ...] hemen başlayanlar
+            reservations: aynı biçimde ileri tarihli olanlar
+
+        Returns:
+            tuple: (kiralama başarı listesi, rezervasyon id listesi - başarısızsa None)
+        """
+        with self.conn:
+            rented = [self._start_rental_stmt(*row) is not None for row in rentals]
+            reservation_ids = [self._add_reservation_stmt(*row) for row in reservations]
+        return rented, reservation_ids
+
+    def apply_return_batch(self, items):
+        """Toplu iadeyi tek transaction içinde yazar.
+
+        Args:
+            items: [(iade öncesi Vehicle, RentalHistory | None), ...]
+
+        Returns:
+            list: Her öğe için iade başarılı mı
+        """
+        with self.conn:
+            returned = [self._end_rental_stmt(vehicle, h) for vehicle, h in items]
+            histories = [h for ok, (_, h) in zip(returned, items) if ok and h]
+            self._insert_rental_histories(histories)
+        return returned
+
+    def get_rental_history(self, columns=None):
+        """columns verilirse tam RentalHistory yerine o sütunları taşıyan görünümler döner."""
+        if columns is not None:
+            return self._fetch_view(RentalHistory, columns, "ORDER BY id DESC")
+        return self._fetch(RentalHistory, f"{HISTORY_SELECT} ORDER BY id DESC")
+
+    def _get_rental_history_by_id(self, history_id):
+        rows = self._fetch(RentalHistory, f"{HISTORY_SELECT} WHERE id=?", (history_id,))
+        return rows[0] if rows else None
+
+    def get_vehicles_covering(self, start_date: str, end_date: str, marka: str = None, max_ucret: float = None):
+        """Tarih aralığında kiralanmaya aday araçları ücrete göre sıralı getirir.
+
+        Bakımda olmayan, sigorta ve kaskosu end_date'e kadar geçerli, mevcut
+        kiralaması start_date'den önce biten ve aralıkla çakışan bekleyen
+        rezervasyonu olmayan araçlar döner. Rezervasyonlar burada elenir;
+        başka masaların eklediği rezervasyonlar süreç içi takvimde görünmez.
+        """
+        query = f"""
+            {VEHICLE_SELECT}
+            WHERE durum != {VehicleStatus.BAKIMDA:d}
+              AND sigorta_bitis >= ? AND kasko_bitis >= ?
+              AND (durum != {VehicleStatus.KIRADA:d} OR bitis_tarihi < ?)
+              AND NOT EXISTS ({self._OVERLAPPING_RESERVATION})
+        """
+        params = [end_date, end_date, start_date, end_date, start_date]
+        if marka:
+            query += " AND marka = ? COLLATE NOCASE"
+            params.append(marka)
+        if max_ucret is not None:
+            query += " AND ucret <= ?"
+            params.append(max_ucret)
+        return self._fetch(Vehicle, query + " ORDER BY ucret", params)
+
+    # ---------- CUSTOMERS ----------
+    # kiralayan serbest metin olarak kalır (journal ve eski raporlar onu okur);
+    # aynı kişinin farklı yazımları musteri_id ile tek müşteriye bağlanır.
+
+    def _customer_id(self, name):
+        """Adın müşteri id'si; müşteri yoksa eklenir, boş adlar için None (commit çağırana aittir)."""
+        key = customer_key(name)
+        if not key:
+            return None
+        row = self.conn.execute("SELECT id FROM customers WHERE anahtar=?", (key,)).fetchone()
+        if row:
+            return row[0]
+        customer_id = self.conn.execute(
+            "INSERT INTO customers (ad, anahtar) VALUES (?, ?) RETURNING id", (clean_name(name), key)
+        ).fetchall()[0][0]
+        if self._customer_index is not None:
+            self._customer_index.add(key, customer_id)
+        return customer_id
+
+    def _link_vehicle_customer(self, plaka, kiralayan):
+        # Müşteri, kiralama gerçekten başladıktan sonra oluşturulur; reddedilen
+        # denemeler customers tablosuna kayıt bırakmaz
+        self.conn.execute("UPDATE vehicles SET musteri_id=? WHERE plaka=?",
+                          (self._customer_id(kiralayan), plaka))
+
+    def _link_customers(self):
+        """musteri_id'si boş kayıtları müşterilere bağlar (eski veriler, journal'dan kurulum).
+
+        Müşterinin adı, o anahtarla ilk kaydedilen yazımdır. Bağlanmamış
+        satırlar indeksten okunduğu için her açılışta çalışması ucuzdur.
+        """
+        for table in ('vehicles', 'rental_history'):
+            self.conn.execute(f"""
+                INSERT INTO customers (ad, anahtar)
+                SELECT ad, anahtar FROM (
+                    SELECT musteri_adi(kiralayan) AS ad, musteri_anahtari(kiralayan) AS anahtar FROM {table}
+                    WHERE musteri_id IS NULL AND kiralayan IS NOT NULL
+                    ORDER BY rowid
+                )
+                WHERE anahtar != ''
+                ON CONFLICT (anahtar) DO NOTHING
+            """)
+            self.conn.execute(f"""
+                UPDATE {table}
+                SET musteri_id = (SELECT id FROM customers WHERE anahtar = musteri_anahtari(kiralayan))
+                WHERE musteri_id IS NULL AND kiralayan IS NOT NULL
+            """)
+        self._customer_index = None
+
+    @property
+    def customer_index(self) -> CustomerIndex:
+        """Müşteri anahtarlarının önek indeksi; ilk aramada UNIQUE indeksten sıralı okunur.
+
+        Sonraki erişimlerde başka masaların eklediği müşteriler (id'si son
+        okunandan büyük olanlar) indekse işlenir.
+        """
+        c = self.conn.cursor()
+        c.row_factory = None
+        last_id = c.execute("SELECT COALESCE(MAX(id), 0) FROM customers").fetchone()[0]
+        if self._customer_index is None:
+            self._customer_index = CustomerIndex.from_rows(
+                c.execute("SELECT anahtar, id FROM customers WHERE id <= ? ORDER BY anahtar", (last_id,)))
+        elif last_id > self._customer_last_id:
+            for key, customer_id in c.execute(
+                    "SELECT anahtar, id FROM customers WHERE id > ? AND id <= ?",
+                    (self._customer_last_id, last_id)):
+                self._customer_index.add(key, customer_id)
+        self._customer_last_id = last_id
+        return self._customer_index
+
+    def search_customers(self, prefix: str, limit: int = 10):
+        """Adı prefix ile başlayan müşterilerin adları, alfabetik (otomatik tamamlama için)."""
+        ids = self.customer_index.prefix(prefix, limit)
+        if not ids:
+            return []
+        key = customer_key(prefix)
+        c = self.conn.execute(
+            f"SELECT id, ad FROM customers WHERE id IN ({', '.join('?' * len(ids))}) AND substr(anahtar, 1, ?) = ?",
+            (*ids, len(key), key))
+        names = dict(c.fetchall())
+        # Geri alınmış bir transaction'da eklenen id'ler tabloda yoktur veya o id'yi
+        # sonradan başka bir müşteri almıştır (anahtarı önekle eşleşmez); atlanır
+        return [names[customer_id] for customer_id in ids if customer_id in names]
+
+    def get_customer_history(self, name: str):
+        """Müşterinin (yazımından bağımsız) kiralama geçmişi, en yeniden başlayarak."""
+        query = f"""
+                SELECT {', '.join(f'h.{col}' for col in HISTORY_COLUMNS)}
+                FROM customers c
+                JOIN rental_history h ON h.musteri_id = c.id
+                WHERE c.anahtar = ?
+                ORDER BY h.baslangic_tarihi DESC
+                """
+        return self._fetch(RentalHistory, query, (customer_key(name),))
+
+    # ---------- RESERVATIONS ----------
+    def get_reservations(self, plaka: str = None, durum: str = "bekliyor"):
+        """Rezervasyonları başlangıç tarihine göre sıralı sözlükler olarak getirir."""
+        query = "SELECT * FROM reservations WHERE durum=?"
+        params = [durum]
+        if plaka:
+            query += " AND plaka=?"
+            params.append(plaka)
+        c = self.conn.execute(query + " ORDER BY baslangic_tarihi", params)
+        return [dict(row) for row in c.fetchall()]
+
+    def get_due_reservations(self, today: str):
+        """Başlangıç tarihi gelmiş, henüz etkinleşmemiş rezervasyonlar."""
+        c = self.conn.execute(
+            "SELECT * FROM reservations WHERE durum='bekliyor' AND baslangic_tarihi <= ? "
+            "ORDER BY baslangic_tarihi",
+            (today,)
+        )
+        return [dict(row) for row in c.fetchall()]
+
+    def set_reservation_status(self, reservation_id: int, durum: str):
+        self.conn.execute("UPDATE reservations SET durum=? WHERE id=?", (durum, reservation_id))
+        self.conn.commit()
 
     def _create_default_admin(self):
         c = self.conn.execute(
@@ -228,92 +871,267 @@ class DataManager:
         if c.fetchone() is None:
             self.conn.execute(
                 "INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
-                ("admin", "admin", "admin")
+                ("admin", self.hasher.hash("admin"), "admin")
             )
             self.conn.commit()
 
-    def get_vehicles_by_status(self, durum: str):
-        c = self.conn.execute("SELECT * FROM vehicles WHERE durum=?", (durum,))
-        return [Vehicle(**row) for row in map(dict, c.fetchall())]
+    def get_vehicles_by_plates(self, plates):
+        """Birden fazla aracı tek sorguda {plaka: Vehicle} olarak getirir."""
+        plates = list(plates)
+        vehicles = {}
+        # SQLite parametre sınırına takılmamak için parçalar halinde
+        for i in range(0, len(plates), 500):
+            chunk = plates[i:i + 500]
+            query = f"{VEHICLE_SELECT} WHERE plaka IN ({', '.join('?' * len(chunk))})"
+            for v in self._fetch(Vehicle, query, chunk):
+                vehicles[v.plaka] = v
+        return vehicles
+
+    def vehicles_insured_through(self, day):
+        """Sigortası ve kaskosu day tarihine kadar (dahil) geçerli araçların plakaları.
+
+        Tarih sütunlarındaki indekslerle tek sorguda yanıtlanır.
+        """
+        c = self.conn.execute(
+            "SELECT plaka FROM vehicles WHERE sigorta_bitis >= ? AND kasko_bitis >= ?",
+            (day, day)
+        )
+        return {row[0] for row in c.fetchall()}
+
+    def get_vehicles_by_status(self, durum, columns=None):
+        """durum: VehicleStatus veya Türkçe etiketi; columns için bkz. get_all_vehicles."""
+        code = (int(VehicleStatus.parse(durum)),)
+        if columns is not None:
+            return self._fetch_view(Vehicle, columns, "WHERE durum=?", code)
+        return self._fetch(Vehicle, f"{VEHICLE_SELECT} WHERE durum=?", code)
 
     def get_rental_history_by_date(self, start_date: str, end_date: str):
-        query = """
-                SELECT * \
-                FROM rental_history
-                WHERE baslangic_tarihi >= ? \
+        query = f"""
+                {HISTORY_SELECT}
+                WHERE baslangic_tarihi >= ?
                   AND baslangic_tarihi <= ?
-                ORDER BY id DESC \
+                ORDER BY id DESC
                 """
-        c = self.conn.execute(query, (start_date, end_date))
-        return [
-            RentalHistory(
-                row["plaka"], row["kiralayan"], row["baslangic_tarihi"],
-                row["bitis_tarihi"], row["toplam_ucret"], row["iade_tarihi"]
-            )
-            for row in c.fetchall()
-        ]
+        return self._fetch(RentalHistory, query, (start_date, end_date))
+
+    def get_revenue_by_period(self, period: str = "month"):
+        """Kiralama gelirini gün/ay/çeyrek/yıl bazında gruplar.
+
+        Returns:
+            list: [(donem, islem_sayisi, gelir), ...] döneme göre sıralı
+        """
+        expressions = {
+            'day': "substr(baslangic_tarihi, 1, 10)",
+            'month': "substr(baslangic_tarihi, 1, 7)",
+            'quarter': "substr(baslangic_tarihi, 1, 4) || '-Q' || "
+                       "((CAST(substr(baslangic_tarihi, 6, 2) AS INTEGER) + 2) / 3)",
+            'year': "substr(baslangic_tarihi, 1, 4)",
+        }
+        if period not in expressions:
+            raise ValueError(f"Geçersiz dönem: {period}")
+        c = self.conn.execute(f"""
+            SELECT {expressions[period]} AS donem,
+                   COUNT(*), COALESCE(SUM(toplam_ucret), 0)
+            FROM rental_history
+            GROUP BY donem
+            ORDER BY donem
+        """)
+        return [tuple(row) for row in c.fetchall()]
 
-    def get_expiring_vehicles(self, days_threshold: int = 30):
+    def get_overdue_rentals(self, today: str = None):
+        """Bitiş tarihi geçtiği halde hâlâ kirada olan araçlar."""
+        today = to_date(today) or date.today()
+        return self._fetch(
+            Vehicle, f"{VEHICLE_SELECT} WHERE durum={VehicleStatus.KIRADA:d} AND bitis_tarihi < ? ORDER BY bitis_tarihi",
+            (today,)
+        )
+
+    def get_rental_due_dates(self, today: str = None):
+        """Henüz gecikmemiş kiralamaların [(bitis_tarihi, plaka), ...] listesi.
+
+        idx_vehicles_durum (durum, bitis_tarihi) indeksiyle sadece kiradaki
+        araçlar okunur.
+        """
+        today = to_date(today) or date.today()
+        c = self.conn.execute(
+            f"SELECT bitis_tarihi, plaka FROM vehicles WHERE durum={VehicleStatus.KIRADA:d} AND bitis_tarihi >= ?",
+            (today,)
+        )
+        return [tuple(row) for row in c.fetchall()]
+
+    def get_revenue_between(self, start_date: str, end_date: str):
+        """İki tarih arasında başlayan kiralamaların (sayı, gelir) değeri, O(log n)."""
+        return self.revenue_index.between(start_date, end_date)
+
+    def get_fleet_snapshot(self) -> FleetSnapshot:
+        """Tüm filoyu tek sorguda paralel dizilere okur."""
+        c = self.conn.cursor()
+        c.row_factory = None
+        return FleetSnapshot.from_rows(c.execute(SNAPSHOT_QUERY))
+
+    # Sigorta/kasko tarihini değiştirebilen journal olayları
+    _EXPIRY_EVENTS = (VEHICLE_ADDED, VEHICLE_UPDATED, VEHICLE_INSURED, VEHICLE_DELETED)
+
+    @property
+    def expiry_index(self) -> ExpiryIndex:
+        """Sigorta/kasko bitişlerinin sıralı indeksi.
+
+        Bir kez tüm filodan kurulur; bu süreçteki add_vehicle, update_vehicle
+        ve delete_vehicle indeksi artımlı günceller. Başka masaların
+        değişiklikleri her erişimde journal'dan yakalanır.
+        """
+        if self._expiry_index is None:
+            self._build_expiry_index()
+        else:
+            self._catch_up_expiry_index()
+        return self._expiry_index
+
+    def _journal_id(self):
+        try:
+            return self.conn.execute("SELECT COALESCE(MAX(id), 0), MIN(id) FROM journal").fetchone()
+        except sqlite3.OperationalError:
+            return None  # Salt okunur eski veritabanında journal yok
+
+    def _build_expiry_index(self):
+        ids = self._journal_id()
+        self._expiry_journal_id = ids[0] if ids else 0
+        c = self.conn.cursor()
+        c.row_factory = None
+        self._expiry_index = ExpiryIndex.from_rows(
+            c.execute("SELECT plaka, sigorta_bitis, kasko_bitis FROM vehicles"))
+
+    def _catch_up_expiry_index(self):
+        """Son okumadan beri journal'a yazılan araç değişikliklerini indekse işler.
+
+        Olayların içeriği okunmaz; değişen plakaların tarihleri vehicles'tan
+        yeniden alınır. Aradaki olaylar budanmışsa veya değişiklik filonun
+        yarısından fazlasına dokunuyorsa indeks yeniden kurulur.
+        """
+        ids = self._journal_id()
+        if ids is None or ids[0] <= self._expiry_journal_id:
+            return
+        last_id, first_id = ids
+        if first_id > self._expiry_journal_id + 1:
+            self._build_expiry_index()
+            return
+        marks = ', '.join('?' * len(self._EXPIRY_EVENTS))
+        plates = [row[0] for row in self.conn.execute(
+            f"SELECT DISTINCT plaka FROM journal WHERE id > ? AND id <= ? AND olay IN ({marks})",
+            (self._expiry_journal_id, last_id, *self._EXPIRY_EVENTS)
+        )]
+        if len(plates) > len(self._expiry_index) // 4:  # Her araç iki kayıt taşır
+            self._build_expiry_index()
+            return
+        self._expiry_journal_id = last_id
+        vehicles = self.get_vehicles_by_plates(plates)
+        for plaka in plates:
+            vehicle = vehicles.get(plaka)
+            if vehicle is None:
+                self._expiry_index.remove(plaka)
+            else:
+                self._expiry_index.add_vehicle(vehicle)
+
+    def get_expiring_vehicles(self, days_threshold: int = 30, today: date = None):
         """Sigorta veya kasko süresi yaklaşan/geçen araçları getir.
-        
+
+        Kayıtlar expiry_index'ten ikili aramayla okunur; sadece bulunan araçlar
+        nesneye çevrilir.
+
         Returns:
             dict: {'expired': [...], 'expiring_soon': [...]} formatında araç listeleri
         """
-        from datetime import datetime, timedelta
-        
-        today = datetime.now().date()
-        threshold_date = today + timedelta(days=days_threshold)
-        
-        vehicles = self.get_all_vehicles()
-        expired = []
-        expiring_soon = []
-        
-        for v in vehicles:
-            # Sigorta kontrolü
-            if v.sigorta_bitis:
-                try:
-                    sigorta_date = datetime.strptime(v.sigorta_bitis, "%Y-%m-%d").date()
-                    if sigorta_date < today:
-                        expired.append({'vehicle': v, 'type': 'Sigorta', 'date': v.sigorta_bitis})
-                    elif sigorta_date <= threshold_date:
-                        expiring_soon.append({'vehicle': v, 'type': 'Sigorta', 'date': v.sigorta_bitis})
-                except ValueError:
-                    pass
-            
-            # Kasko kontrolü
-            if v.kasko_bitis:
-                try:
-                    kasko_date = datetime.strptime(v.kasko_bitis, "%Y-%m-%d").date()
-                    if kasko_date < today:
-                        expired.append({'vehicle': v, 'type': 'Kasko', 'date': v.kasko_bitis})
-                    elif kasko_date <= threshold_date:
-                        expiring_soon.append({'vehicle': v, 'type': 'Kasko', 'date': v.kasko_bitis})
-                except ValueError:
-                    pass
-        
-        return {'expired': expired, 'expiring_soon': expiring_soon}
+        found = self.expiry_index.expiring(today, days_threshold)
+        vehicles = self.get_vehicles_by_plates(
+            {plaka for items in found.values() for _, plaka, _ in items}
+        )
+        return {
+            key: [{'vehicle': vehicles[plaka], 'type': label, 'date': expiry}
+                  for expiry, plaka, label in items if plaka in vehicles]
+            for key, items in found.items()
+        }
+
+    def get_notification_counts(self, days_threshold: int = 30, today: date = None) -> dict:
+        """Bildirim kategorilerinin sadece sayıları; liste veya nesne oluşturulmaz.
+
+        Her sayım kendi indeksini kullanır (idx_vehicles_sigorta/kasko,
+        idx_vehicles_durum, idx_event_log_tur). expired ve expiring_soon
+        get_expiring_vehicles ile aynı şekilde sigorta ve kasko kayıtlarını
+        ayrı sayar. Henüz yazılmamış başarısız kiralama olayları tampondan
+        sayılır; dakikalık rozet yenilemesi veritabanına yazmaz.
+
+        Returns:
+            dict: {'overdue', 'expired', 'expiring_soon', 'failed'} -> adet
+        """
+        today = to_date(today) or date.today()
+        params = {'bugun': today, 'sinir': today + timedelta(days=days_threshold),
+                  'tur': EVENT_FAILED_RENTAL}
+        with self.events.pending() if self.events is not None else nullcontext(()) as pending:
+            row = self._count_notifications(params)
+        counts = dict(zip(('overdue', 'expired', 'expiring_soon', 'failed'), row))
+        counts['failed'] += sum(1 for event in pending if event[1] == EVENT_FAILED_RENTAL)
+        return counts
+
+    def _count_notifications(self, params):
+        return self.conn.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM vehicles WHERE durum={VehicleStatus.KIRADA:d} AND bitis_tarihi < :bugun),
+                (SELECT COUNT(*) FROM vehicles WHERE sigorta_bitis < :bugun)
+                    + (SELECT COUNT(*) FROM vehicles WHERE kasko_bitis < :bugun),
+                (SELECT COUNT(*) FROM vehicles WHERE sigorta_bitis BETWEEN :bugun AND :sinir)
+                    + (SELECT COUNT(*) FROM vehicles WHERE kasko_bitis BETWEEN :bugun AND :sinir),
+                (SELECT COUNT(*) FROM event_log WHERE tur = :tur)
+        """, params).fetchone()
 
     def add_failed_rental(self, plaka: str, marka: str, model: str, sebep: str):
-        """Başarısız kiralama kaydı ekle."""
-        from datetime import datetime
-        tarih = datetime.now().strftime("%Y-%m-%d %H:%M")
-        self.conn.execute("""
-            INSERT INTO failed_rentals (plaka, marka, model, tarih, sebep)
-            VALUES (?, ?, ?, ?, ?)
-        """, (plaka, marka, model, tarih, sebep))
-        self.conn.commit()
+        """Başarısız kiralama olayını günlüğe ekle (commit beklemez)."""
+        self.log_event(EVENT_FAILED_RENTAL, plaka, sebep, marka=marka, model=model)
+
+    def log_event(self, tur: str, plaka: str = None, mesaj: str = "", **detay):
+        """Operasyonel bir olayı tamponlu günlüğe ekler."""
+        if self.events is not None:
+            self.events.log(tur, plaka, mesaj, **detay)
 
-    def get_failed_rentals(self):
-        """Başarısız kiralama kayıtlarını getir."""
-        c = self.conn.execute("SELECT * FROM failed_rentals ORDER BY id DESC LIMIT 50")
+    def _flush_events(self):
+        # Olayları yazıcı iş parçacığı yazar; bu bağlantı yazma transaction'ındayken
+        # beklemek kilitlenmeye yol açacağından o durumda tampondakiler sonraki okumaya kalır
+        if self.events is not None and not self.conn.in_transaction:
+            self.events.flush()
+
+    def get_events(self, tur: str = None, plaka: str = None, limit: int = 100, offset: int = 0):
+        """Olayları en yeniden eskiye, tür ve/veya plakaya göre getirir (offset: sayfalama)."""
+        self._flush_events()
+        query = "SELECT * FROM event_log"
+        conditions, params = [], []
+        if tur:
+            conditions.append("tur=?")
+            params.append(tur)
+        if plaka:
+            conditions.append("plaka=?")
+            params.append(plaka)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        c = self.conn.execute(query + " ORDER BY id DESC LIMIT ? OFFSET ?", params + [limit, offset])
         return [dict(row) for row in c.fetchall()]
 
+    def get_failed_rentals(self, limit: int = 50, offset: int = 0):
+        """Başarısız kiralama kayıtlarını en yeniden eskiye, sayfa sayfa getir."""
+        rentals = []
+        for e in self.get_events(EVENT_FAILED_RENTAL, limit=limit, offset=offset):
+            detay = json.loads(e['detay'] or '{}')
+            rentals.append({
+                'id': e['id'], 'plaka': e['plaka'],
+                'marka': detay.get('marka'), 'model': detay.get('model'),
+                'tarih': e['zaman'][:16], 'sebep': e['mesaj'],
+            })
+        return rentals
+
     def clear_failed_rentals(self):
         """Tüm başarısız kiralama kayıtlarını temizle."""
-        self.conn.execute("DELETE FROM failed_rentals")
+        self._flush_events()
+        self.conn.execute("DELETE FROM event_log WHERE tur=?", (EVENT_FAILED_RENTAL,))
         self.conn.commit()
 
     def delete_failed_rental(self, rental_id: int):
         """Tek bir başarısız kiralama kaydını sil."""
-        self.conn.execute("DELETE FROM failed_rentals WHERE id=?", (rental_id,))
-        self.conn.commit()
\ No newline at end of file
+        self.conn.execute("DELETE FROM event_log WHERE id=?", (rental_id,))
+        self.conn.commit()
@@ -0,0 +1,160 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# Olay türleri
+EVENT_FAILED_RENTAL = 'kiralama_hatasi'
+EVENT_VALIDATION_ERROR = 'dogrulama_hatasi'
+EVENT_OVERRIDE = 'mudahale'
+EVENT_TYPES = (EVENT_FAILED_RENTAL, EVENT_VALIDATION_ERROR, EVENT_OVERRIDE)
+
+
+class EventLog:
+    """Operasyonel olaylar için tamponlu, sınırlı denetim günlüğü.
+
+    log() olayı sadece bellekteki halka tampona ekler ve hemen döner; olaylar
+    arka plandaki iş parçacığı tarafından kendi bağlantısıyla partiler halinde
+    event_log tablosuna yazılır. Tampon doluysa en eski yazılmamış olay
+    düşürülür (dropped sayacı). Her yazımdan sonra saklama politikası
+    (retention_days ve max_rows) uygulanır. Tabloya sadece bu iş parçacığı
+    yazar; uygulamanın bağlantısındaki transaction'lara dokunulmaz.
+    """
+
+    def __init__(self, db_path: str, capacity: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 1.0, retention_days: int = 90, max_rows: int = 100000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self.dropped = 0
+        self._buffer = deque(maxlen=capacity)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flushed = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread = None
+
+    @staticmethod
+    def create_table(conn):
+        """event_log tablosunu oluşturur ve eski failed_rentals kayıtlarını taşır."""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS event_log
+            (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                zaman TEXT NOT NULL,
+                tur TEXT NOT NULL,
+                plaka TEXT,
+                mesaj TEXT,
+                detay TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_event_log_plaka ON event_log (plaka, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_event_log_tur ON event_log (tur, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_event_log_zaman ON event_log (zaman)")
+
+        legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='failed_rentals'"
+        ).fetchone()
+        if legacy:
+            conn.execute(f"""
+                INSERT INTO event_log (zaman, tur, plaka, mesaj, detay)
+                SELECT tarih, '{EVENT_FAILED_RENTAL}', plaka, sebep,
+                       json_object('marka', marka, 'model', model)
+                FROM failed_rentals ORDER BY id
+            """)
+            conn.execute("DROP TABLE failed_rentals")
+
+    def log(self, tur: str, plaka: str = None, mesaj: str = "", **detay):
+        """Olayı tampona ekler; veritabanına yazmayı beklemez."""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append((
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"), tur, plaka, mesaj,
+            json.dumps(detay, ensure_ascii=False, default=str) if detay else None
+        ))
+        if self._thread is None:
+            self._start()
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            while not self._stop.is_set():
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                if self._write(conn):
+                    self._apply_retention(conn)
+                self._flushed.set()
+            self._write(conn)
+        finally:
+            conn.close()
+
+    def _write(self, conn) -> int:
+        """Tampondaki olayları tek transaction ile yazar; yazılan olay sayısını döndürür."""
+        with self._write_lock:
+            batch = []
+            while self._buffer:
+                batch.append(self._buffer.popleft())
+            if batch:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO event_log (zaman, tur, plaka, mesaj, detay) VALUES (?, ?, ?, ?, ?)",
+                        batch
+                    )
+            return len(batch)
+
+    def _apply_retention(self, conn):
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+        with conn:
+            conn.execute("DELETE FROM event_log WHERE zaman < ?", (cutoff,))
+            # id'ler artan olduğundan son max_rows kayıt dışındakiler en eskilerdir
+            conn.execute(
+                "DELETE FROM event_log WHERE id <= (SELECT MAX(id) FROM event_log) - ?",
+                (self.max_rows,)
+            )
+
+    def flush(self, timeout: float = 5.0):
+        """Bekleyen olayları yazıcı iş parçacığına hemen yazdırır ve bitmesini bekler.
+
+        Çağıranın bağlantısı açık bir yazma transaction'ı tutuyorsa yazıcı
+        kilidi alamaz; bu durumda flush çağrılmamalıdır.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        while self._buffer and time.monotonic() < deadline:
+            self._flushed.clear()
+            self._wake.set()
+            self._flushed.wait(max(0.0, deadline - time.monotonic()))
+        # Tampondan alınıp henüz commit edilmemiş bir parti varsa onu da bekle
+        if self._write_lock.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            self._write_lock.release()
+
+    @contextmanager
+    def pending(self):
+        """Henüz yazılmamış olayları (zaman, tür, plaka, mesaj, detay) verir.
+
+        Blok süresince yazıcı bekletilir; tablo sayımı blok içinde yapılırsa
+        bir olay ne iki kez ne de hiç sayılmaz.
+        """
+        with self._write_lock:
+            yield list(self._buffer)
+
+    def close(self):
+        """İş parçacığını durdurur; kalan olaylar yazılır."""
+        if self._thread is not None and self._thread.is_alive():
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
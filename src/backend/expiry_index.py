@@ -0,0 +1,83 @@
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+
+from src.models.dates import to_date
+
+# vehicles sütunu -> bildirimlerde gösterilen tür
+EXPIRY_FIELDS = (('sigorta_bitis', 'Sigorta'), ('kasko_bitis', 'Kasko'))
+
+
+class ExpiryIndex:
+    """Sigorta ve kasko bitiş tarihlerinin bellek içi sıralı indeksi.
+
+    Kayıtlar (tarih, plaka, tür) üçlüleri olarak tarihe göre sıralı bir
+    listede tutulur. Heap'ten farklı olarak aralık sorgusu da yapılabildiği
+    için "süresi geçen" (tarih < bugün) ve "N gün içinde bitecek" soruları
+    iki ikili aramayla O(log n + k) sürede yanıtlanır; 7/30/90 günlük eşikler
+    aynı yapıdan okunur. Tarih değişikliklerinde eski kayıt ikili aramayla
+    bulunup silinir ve yenisi yerine eklenir.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._dates = {}  # (plaka, tür) -> tarih
+
+    @classmethod
+    def from_rows(cls, rows):
+        """(plaka, sigorta_bitis, kasko_bitis) satırlarından toplu kurar."""
+        index = cls()
+        for plaka, *dates in rows:
+            for (_, label), day in zip(EXPIRY_FIELDS, dates):
+                day = to_date(day)
+                if day is not None:
+                    index._dates[(plaka, label)] = day
+        index._entries = sorted((day, plaka, label) for (plaka, label), day in index._dates.items())
+        return index
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ---------- GÜNCELLEME ----------
+    def set(self, plaka: str, label: str, day):
+        """Aracın bir türdeki bitiş tarihini değiştirir (None: kaydı kaldırır)."""
+        old = self._dates.pop((plaka, label), None)
+        if old is not None:
+            del self._entries[bisect_left(self._entries, (old, plaka, label))]
+        day = to_date(day)
+        if day is not None:
+            self._dates[(plaka, label)] = day
+            insort(self._entries, (day, plaka, label))
+
+    def update(self, plaka: str, changes: dict):
+        """update_vehicle değişikliklerinden sigorta/kasko tarihlerini uygular."""
+        for field, label in EXPIRY_FIELDS:
+            if field in changes:
+                self.set(plaka, label, changes[field])
+
+    def add_vehicle(self, vehicle):
+        for field, label in EXPIRY_FIELDS:
+            self.set(vehicle.plaka, label, getattr(vehicle, field))
+
+    def remove(self, plaka: str):
+        for _, label in EXPIRY_FIELDS:
+            self.set(plaka, label, None)
+
+    # ---------- SORGU ----------
+    def expired(self, today: date = None):
+        """Süresi geçmiş [(tarih, plaka, tür), ...], en eskiden başlayarak."""
+        today = to_date(today) or date.today()
+        return self._entries[:bisect_left(self._entries, (today,))]
+
+    def expiring_within(self, days: int, today: date = None):
+        """Bugün ile days gün sonrası (dahil) arasında bitecek kayıtlar, tarihe göre sıralı."""
+        today = to_date(today) or date.today()
+        lo = bisect_left(self._entries, (today,))
+        hi = bisect_left(self._entries, (today + timedelta(days=days + 1),), lo)
+        return self._entries[lo:hi]
+
+    def expiring(self, today: date = None, days_threshold: int = 30) -> dict:
+        """{'expired': [...], 'expiring_soon': [...]} (tarih, plaka, tür) listeleri."""
+        return {
+            'expired': self.expired(today),
+            'expiring_soon': self.expiring_within(days_threshold, today),
+        }
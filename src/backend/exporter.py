@@ -0,0 +1,144 @@
+import csv
+import gzip
+import json
+import os
+import sqlite3
+
+from src.models.dates import to_date
+
+# Dışa aktarılabilen tablolar ve tarih filtresinin uygulanacağı sütun
+# (vehicles için tarih filtresi anlamlı değil, sadece plaka filtresi uygulanır)
+EXPORT_TABLES = {
+    'rental_history': 'baslangic_tarihi',
+    'vehicles': None,
+    'event_log': 'zaman',
+}
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+# Kod tutan sütunlar dışa aktarımda okunur adlarıyla yazılır
+_EXPORT_SOURCES = {
+    'vehicles': """(
+        SELECT v.plaka, v.marka, v.model, v.ucret, d.ad AS durum, v.kiralayan,
+               v.baslangic_tarihi, v.bitis_tarihi, v.sigorta_bitis, v.kasko_bitis
+        FROM vehicles v JOIN durumlar d ON d.kod = v.durum
+    )""",
+}
+
+
+class Exporter:
+    """Tabloları CSV veya JSON Lines olarak sabit boyutlu partilerle dışa aktarır.
+
+    Satırlar imleçten fetchmany ile okunur ve doğrudan dosyaya yazılır;
+    bellekte hiçbir zaman bir partiden fazla satır tutulmaz. Arka plan
+    iş parçacığından çağrılabilmesi için kendi bağlantısını açar.
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 5000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._cancelled = False
+
+    def cancel(self):
+        """Devam eden dışa aktarımı bir sonraki partide durdurur."""
+        self._cancelled = True
+
+    def _build_query(self, table, start_date, end_date, plaka):
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Bilinmeyen tablo: {table}")
+
+        try:
+            start_date, end_date = to_date(start_date), to_date(end_date)
+        except ValueError:
+            raise ValueError("Tarihler geçersiz! (Formatı: YYYY-AA-GG)") from None
+        if start_date and end_date and end_date < start_date:
+            raise ValueError("Bitiş tarihi başlangıçtan önce olamaz!")
+
+        date_column = EXPORT_TABLES[table]
+        conditions = []
+        params = []
+        if start_date and date_column:
+            conditions.append(f"{date_column} >= ?")
+            params.append(start_date.isoformat())
+        if end_date and date_column:
+            # event_log.zaman saat de içerdiği için gün sonuna kadar al
+            conditions.append(f"substr({date_column}, 1, 10) <= ?")
+            params.append(end_date.isoformat())
+        if plaka:
+            conditions.append("plaka = ?")
+            params.append(plaka)
+
+        query = f"SELECT * FROM {_EXPORT_SOURCES.get(table, table)}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return query, params
+
+    def count(self, table: str, start_date: str = None, end_date: str = None, plaka: str = None) -> int:
+        """Filtreye uyan satır sayısı (ilerleme yüzdesi için)."""
+        query, params = self._build_query(table, start_date, end_date, plaka)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+        finally:
+            conn.close()
+
+    def export(self, table: str, path: str, fmt: str = 'csv', start_date: str = None,
+               end_date: str = None, plaka: str = None, compress: bool = None,
+               progress=None) -> int:
+        """Tabloyu dosyaya aktarır ve yazılan satır sayısını döndürür.
+
+        compress verilmezse dosya adı .gz ile bitiyorsa gzip kullanılır.
+        progress(yazilan_satir) her partiden sonra çağrılır. Aktarım iptal
+        edilirse veya hata verirse yarım kalan dosya silinir; iptalde None döner.
+
+        Raises:
+            ValueError: Tarihler YYYY-AA-GG biçiminde değilse veya aralık tersse.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Geçersiz format: {fmt} ({', '.join(EXPORT_FORMATS)})")
+        if compress is None:
+            compress = path.endswith('.gz')
+
+        query, params = self._build_query(table, start_date, end_date, plaka)
+        self._cancelled = False
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(query, params)
+            columns = [d[0] for d in cursor.description]
+
+            if compress:
+                f = gzip.open(path, 'wt', encoding='utf-8', newline='')
+            else:
+                f = open(path, 'w', encoding='utf-8', newline='')
+
+            written = 0
+            try:
+                with f:
+                    if fmt == 'csv':
+                        writer = csv.writer(f)
+                        writer.writerow(columns)
+                        write_batch = writer.writerows
+                    else:
+                        def write_batch(rows):
+                            f.writelines(
+                                json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + "\n"
+                                for row in rows
+                            )
+
+                    while not self._cancelled:
+                        rows = cursor.fetchmany(self.batch_size)
+                        if not rows:
+                            break
+                        write_batch(rows)
+                        written += len(rows)
+                        if progress:
+                            progress(written)
+            except BaseException:
+                os.remove(path)
+                raise
+            if self._cancelled:
+                os.remove(path)
+                return None
+            return written
+        finally:
+            conn.close()
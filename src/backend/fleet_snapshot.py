@@ -0,0 +1,131 @@
+from array import array
+from itertools import compress, repeat
+from datetime import date
+from operator import mul, sub
+
+from src.models.dates import to_date
+from src.models.vehicle_status import VehicleStatus
+
+# julianday('0001-01-01') = 1721425.5, date.toordinal() ise 1'den başlar
+_ORDINAL = "COALESCE(CAST(julianday({0}) - 1721424.5 AS INTEGER), 0)"
+
+# Anlık görüntünün tek geçişte okunduğu sorgu; tarihler SQLite'ta ordinal'e çevrilir
+SNAPSHOT_QUERY = f"""
+    SELECT plaka, marka, durum, COALESCE(ucret, 0.0),
+           {_ORDINAL.format('sigorta_bitis')}, {_ORDINAL.format('kasko_bitis')},
+           {_ORDINAL.format('baslangic_tarihi')}, {_ORDINAL.format('bitis_tarihi')}
+    FROM vehicles
+"""
+
+
+def _ordinal(day) -> int:
+    return (to_date(day) or date.today()).toordinal()
+
+
+class FleetSnapshot:
+    """Filonun paralel tipli dizilerde tutulan anlık görüntüsü.
+
+    Araç i'nin bilgileri her dizinin i. elemanındadır: durum kodu (bytearray,
+    VehicleStatus değerleri), günlük ücret (array 'd'), sigorta/kasko/kiralama
+    tarihleri (date.toordinal, tarih yoksa 0) ve marka indeksi. Sayım ve filtreler nesne oluşturmadan
+    map/compress ile dizilerin üzerinden C seviyesinde yürür.
+    """
+
+    def __init__(self):
+        self.plates = []
+        self.index = {}         # plaka -> i
+        self.brands = []        # marka indeksi -> marka
+        self._brand_ids = {}
+        self.brand = array('I')
+        self.status = bytearray()
+        self.rate = array('d')
+        self.sigorta = array('l')
+        self.kasko = array('l')
+        self.start = array('l')
+        self.end = array('l')
+
+    @classmethod
+    def from_rows(cls, rows):
+        """SNAPSHOT_QUERY satırlarından kurar; sütunlar diziye toplu aktarılır."""
+        snap = cls()
+        rows = list(rows)
+        if not rows:
+            return snap
+        plates, brands, statuses, rates, sigorta, kasko, start, end = zip(*rows)
+        snap.plates = list(plates)
+        snap.index = dict(zip(plates, range(len(plates))))
+        brand_ids = snap._brand_ids
+        snap.brand = array('I', [brand_ids.setdefault(marka, len(brand_ids)) for marka in brands])
+        snap.brands = list(brand_ids)
+        snap.status = bytearray(statuses)
+        snap.rate = array('d', rates)
+        snap.sigorta = array('l', sigorta)
+        snap.kasko = array('l', kasko)
+        snap.start = array('l', start)
+        snap.end = array('l', end)
+        return snap
+
+    def __len__(self):
+        return len(self.plates)
+
+    # ---------- SAYIM VE FİLTRE ----------
+    def display_counts(self, day=None) -> dict:
+        """Listede gösterilen durumlara (display_status) göre {VehicleStatus: adet}."""
+        shown = self.display_status(day)
+        return {status: shown.count(status) for status in VehicleStatus}
+
+    def indices(self, durum):
+        """durum'daki araçların indeksleri (durum: VehicleStatus veya etiketi)."""
+        code = int(VehicleStatus.parse(durum))
+        return list(compress(range(len(self.plates)), map(code.__eq__, self.status)))
+
+    def _covered(self, day):
+        """Sigortası ve kaskosu day tarihine kadar (dahil) geçerli mi, araç başına bool akışı."""
+        return map(_ordinal(day).__le__, map(min, self.sigorta, self.kasko))
+
+    def insured_through(self, day=None) -> set:
+        """Sigortası ve kaskosu day tarihine kadar (dahil) geçerli plakalar."""
+        return set(compress(self.plates, self._covered(day)))
+
+    def display_status(self, day=None) -> bytearray:
+        """Listede gösterilecek durum kodları.
+
+        Kirada olmayıp sigortası veya kaskosu day tarihini (varsayılan bugün)
+        kapsamayan araç hiçbir kiralamayı alamaz, bakımda gösterilir.
+        """
+        rented = int(VehicleStatus.KIRADA)
+        uninsured = list(map(lambda covered, code: not covered and code != rented,
+                             self._covered(day), self.status))
+        shown = bytearray(self.status)
+        for i in compress(range(len(shown)), uninsured):
+            shown[i] = VehicleStatus.BAKIMDA
+        return shown
+
+    def plates_shown_as(self, durum, day=None) -> set:
+        """Listede durum ile gösterilen (display_status) araçların plakaları."""
+        code = int(VehicleStatus.parse(durum))
+        return set(compress(self.plates, map(code.__eq__, self.display_status(day))))
+
+    # ---------- GELİR ----------
+    def projected_revenue(self, start=None, end=None) -> float:
+        """Süren kiralamaların [start, end] aralığına düşen günlerinin taban ücretle geliri.
+
+        start varsayılan olarak bugündür; end verilmezse kiralamaların
+        bitişine kadar sayılır.
+        """
+        rented = self.indices(VehicleStatus.KIRADA)
+        starts = map(max, repeat(_ordinal(start)), (self.start[i] for i in rented))
+        ends = (self.end[i] for i in rented)
+        if end is not None:
+            ends = map(min, repeat(_ordinal(end)), ends)
+        days = map(max, repeat(0), map((1).__add__, map(sub, ends, starts)))
+        return sum(map(mul, (self.rate[i] for i in rented), days))
+
+    def brand_totals(self, per_plate: dict) -> dict:
+        """Plaka bazındaki değerleri (ör. kiralama adedi) markaya göre toplar."""
+        totals = [0] * len(self.brands)
+        for plaka, value in per_plate.items():
+            i = self.index.get(plaka)
+            if i is not None:
+                totals[self.brand[i]] += value
+        return {marka: total for marka, total in zip(self.brands, totals) if total}
@@ -0,0 +1,489 @@
+"""Araç ve kiralama geçmişi için yalnızca eklenen olay günlüğü (journal).
+
+Her durum değişikliği, değişikliği yapan transaction içinde journal tablosuna
+bir olay olarak yazılır. Belirli aralıklarla vehicles ve rental_history
+tablolarının tam anlık görüntüsü (snapshot) alınır; saklanan en eski
+görüntüden önceki olaylar budanır. Bozulmuş bir veritabanı, son anlık görüntü
+ve sonrasındaki olaylar yeniden oynatılarak kurulabilir:
+
+    python -m src.backend.journal --db car_rental.db --out yeniden.db [--verify]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+from src.models.rental_history import HISTORY_COLUMNS as MODEL_HISTORY_COLUMNS
+from src.models.vehicle import VEHICLE_COLUMNS
+from src.models.vehicle_status import VehicleStatus
+
+# Olay türleri
+VEHICLE_ADDED = 'arac_eklendi'
+VEHICLE_UPDATED = 'arac_guncellendi'
+VEHICLE_PRICED = 'fiyat_degisti'
+VEHICLE_INSURED = 'sigorta_degisti'
+VEHICLE_DELETED = 'arac_silindi'
+VEHICLE_RENTED = 'kiralandi'
+VEHICLE_RETURNED = 'iade_edildi'
+HISTORY_ADDED = 'gecmis_eklendi'
+
+# Anlık görüntü ve yeniden kurulumda geçmiş kayıtları id'leriyle saklanır
+HISTORY_COLUMNS = ('id', *MODEL_HISTORY_COLUMNS)
+
+_RENTAL_FIELDS = ('kiralayan', 'baslangic_tarihi', 'bitis_tarihi')
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, ensure_ascii=False, default=str, separators=(',', ':'))
+
+
+def update_event_type(fields) -> str:
+    """update_vehicle ile güncellenen alanlara göre olay türü."""
+    fields = set(fields)
+    if fields == {'ucret'}:
+        return VEHICLE_PRICED
+    if fields and fields <= {'sigorta_bitis', 'kasko_bitis'}:
+        return VEHICLE_INSURED
+    return VEHICLE_UPDATED
+
+
+class Journal:
+    """journal ve journal_snapshots tablolarını yönetir.
+
+    append commit etmez; olay, durum değişikliğiyle aynı transaction içinde
+    kalıcı olur.
+    """
+
+    # Bu kadar olayda bir yeni anlık görüntü alınır
+    SNAPSHOT_INTERVAL = 50000
+    # Saklanan anlık görüntü sayısı
+    KEEP_SNAPSHOTS = 2
+    # Anlık görüntü parçası başına satır; okuma ve sıkıştırma bu boyutta akar
+    CHUNK_ROWS = 20000
+    # Budanan journal satırları bu büyüklükte partilerle silinir
+    PRUNE_BATCH = 10000
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._snapshot_thread = None
+
+    def create_table(self):
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS journal
+            (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                zaman TEXT NOT NULL,
+                olay TEXT NOT NULL,
+                plaka TEXT,
+                veri TEXT
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_journal_plaka ON journal (plaka, id)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS journal_snapshots
+            (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                journal_id INTEGER NOT NULL,
+                zaman TEXT NOT NULL,
+                veri BLOB NOT NULL
+            )
+        """)
+        # Parçalı anlık görüntüler: başlık satırının veri'si boştur, tablolar
+        # CHUNK_ROWS satırlık sıkıştırılmış parçalar olarak burada durur
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS journal_snapshot_parts
+            (
+                journal_id INTEGER NOT NULL,
+                tablo TEXT NOT NULL,
+                parca INTEGER NOT NULL,
+                veri BLOB NOT NULL,
+                PRIMARY KEY (journal_id, tablo, parca)
+            )
+        """)
+        # İlk açılışta mevcut durum temel anlık görüntü olarak alınır
+        if self.conn.execute("SELECT 1 FROM journal_snapshots LIMIT 1").fetchone() is None:
+            self.take_snapshot()
+
+    def append(self, olay: str, plaka: str = None, veri=None):
+        """Olayı journal'a ekler (commit çağırana aittir)."""
+        self.conn.execute(
+            "INSERT INTO journal (zaman, olay, plaka, veri) VALUES (?, ?, ?, ?)",
+            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), olay, plaka,
+             None if veri is None else _dumps(veri))
+        )
+
+    def append_many(self, olay: str, items):
+        """Aynı türde birden çok olayı tek executemany ile ekler; items: [(plaka, veri), ...]."""
+        zaman = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.conn.executemany(
+            "INSERT INTO journal (zaman, olay, plaka, veri) VALUES (?, ?, ?, ?)",
+            ((zaman, olay, plaka, None if veri is None else _dumps(veri)) for plaka, veri in items)
+        )
+
+    def vehicle_added(self, vehicle):
+        self.append(VEHICLE_ADDED, vehicle.plaka, asdict(vehicle))
+
+    def vehicle_rented(self, plaka, kiralayan, baslangic, bitis):
+        self.append(VEHICLE_RENTED, plaka, dict(zip(_RENTAL_FIELDS, (kiralayan, baslangic, bitis))))
+
+    def vehicle_returned(self, plaka, history=None):
+        self.append(VEHICLE_RETURNED, plaka, {'gecmis': asdict(history) if history else None})
+
+    def history_added(self, history):
+        self.append(HISTORY_ADDED, history.plaka, asdict(history))
+
+    # ---------- SNAPSHOTS ----------
+    # Anlık görüntü tek bir blob yerine parçalar halinde yazılır: vehicles ve
+    # journal/geçmiş sınır id'leri tek kısa okuma işleminde alınır; geçmiş
+    # kayıtları sadece eklendiği için sınır id'ye kadarki satırlar sonradan
+    # id aralıklarıyla, her parça kendi kısa işleminde okunup yazılabilir.
+    # Başlık satırı en son yazılır; başlığı olmayan parçalar yarım kalmıştır.
+
+    def _last_event_id(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM journal").fetchone()[0]
+
+    def _snapshot_bounds(self):
+        """(son journal id'si, son geçmiş id'si)"""
+        return (self._last_event_id(),
+                self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM rental_history").fetchone()[0])
+
+    def _chunks(self, cursor):
+        """İmleçteki satırları CHUNK_ROWS'luk sıkıştırılmış JSON parçaları olarak verir."""
+        while True:
+            rows = cursor.fetchmany(self.CHUNK_ROWS)
+            if not rows:
+                return
+            yield rows, zlib.compress(_dumps([list(row) for row in rows]).encode())
+
+    def _vehicle_parts(self):
+        c = self.conn.execute(f"SELECT {', '.join(VEHICLE_COLUMNS)} FROM vehicles")
+        return [blob for _, blob in self._chunks(c)]
+
+    def _history_part(self, after_id, last_id):
+        """after_id'den sonraki en fazla CHUNK_ROWS geçmiş kaydı: (son id, parça) veya None."""
+        c = self.conn.execute(
+            f"SELECT {', '.join(HISTORY_COLUMNS)} FROM rental_history "
+            f"WHERE id > ? AND id <= ? ORDER BY id LIMIT ?",
+            (after_id, last_id, self.CHUNK_ROWS)
+        )
+        for rows, blob in self._chunks(c):
+            return rows[-1][0], blob
+        return None
+
+    def _write_part(self, journal_id, tablo, parca, blob):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO journal_snapshot_parts (journal_id, tablo, parca, veri) VALUES (?, ?, ?, ?)",
+            (journal_id, tablo, parca, blob)
+        )
+
+    def _write_header(self, journal_id):
+        self.conn.execute(
+            "INSERT INTO journal_snapshots (journal_id, zaman, veri) VALUES (?, ?, ?)",
+            (journal_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), b'')
+        )
+        self.conn.execute("""
+            DELETE FROM journal_snapshots WHERE id NOT IN
+            (SELECT id FROM journal_snapshots ORDER BY id DESC LIMIT ?)
+        """, (self.KEEP_SNAPSHOTS,))
+        # Silinen görüntülerin ve yarım kalmış eski denemelerin parçaları; daha yeni
+        # journal_id'li parçalar başka bir masada sürmekte olan bir görüntüye ait olabilir
+        self.conn.execute("""
+            DELETE FROM journal_snapshot_parts
+            WHERE journal_id < ? AND journal_id NOT IN (SELECT journal_id FROM journal_snapshots)
+        """, (journal_id,))
+
+    def take_snapshot(self):
+        """vehicles ve rental_history'nin parçalı, sıkıştırılmış kopyasını yazar (commit çağırana aittir)."""
+        journal_id, history_id = self._snapshot_bounds()
+        for i, blob in enumerate(self._vehicle_parts()):
+            self._write_part(journal_id, 'vehicles', i, blob)
+        after_id, i = 0, 0
+        while (part := self._history_part(after_id, history_id)) is not None:
+            after_id, blob = part
+            self._write_part(journal_id, 'rental_history', i, blob)
+            i += 1
+        self._write_header(journal_id)
+
+    def _take_snapshot_in_steps(self) -> bool:
+        """take_snapshot'ın kısa işlemlere bölünmüş hâli (kendi bağlantısında çalışır).
+
+        Uzun süren bir okuma işlemi diğer masaların yazmalarını bekletir;
+        burada en uzun kilit, vehicles'ın okunması veya tek bir parçanın
+        yazılmasıdır.
+
+        Returns:
+            bool: Görüntü tamamlandı mı
+        """
+        conn = self.conn
+        conn.execute("BEGIN")  # vehicles ve sınır id'leri aynı anı görsün
+        try:
+            journal_id, history_id = self._snapshot_bounds()
+            vehicle_parts = self._vehicle_parts()
+        finally:
+            conn.commit()
+
+        with conn:
+            for i, blob in enumerate(vehicle_parts):
+                self._write_part(journal_id, 'vehicles', i, blob)
+        counts = {'vehicles': len(vehicle_parts), 'rental_history': 0}
+        del vehicle_parts
+
+        after_id = 0
+        while True:
+            part = self._history_part(after_id, history_id)
+            if part is None:
+                break
+            after_id, blob = part
+            with conn:
+                self._write_part(journal_id, 'rental_history', counts['rental_history'], blob)
+            counts['rental_history'] += 1
+
+        with conn:
+            # Parçalar bu arada başka bir masanın budamasıyla silindiyse başlık yazılmaz
+            written = dict(conn.execute(
+                "SELECT tablo, COUNT(*) FROM journal_snapshot_parts WHERE journal_id=? GROUP BY tablo",
+                (journal_id,)
+            ).fetchall())
+            if any(written.get(tablo, 0) != count for tablo, count in counts.items()):
+                return False
+            if conn.execute("SELECT 1 FROM journal_snapshots WHERE journal_id=?", (journal_id,)).fetchone():
+                return False  # Aynı anı başka bir masa tamamladı
+            self._write_header(journal_id)
+        self.prune()
+        return True
+
+    def _snapshot_due(self) -> bool:
+        row = self.conn.execute("SELECT MAX(journal_id) FROM journal_snapshots").fetchone()
+        return self._last_event_id() - (row[0] or 0) >= self.SNAPSHOT_INTERVAL
+
+    def maybe_snapshot(self) -> bool:
+        """Son anlık görüntüden bu yana SNAPSHOT_INTERVAL olay biriktiyse yenisini alır.
+
+        Anlık görüntü yarım kalmış bir işlemin ortasında alınırsa (ör. iade
+        olayı yazılmış, geçmiş kaydı henüz eklenmemiş) yeniden oynatmada kayıt
+        kaybolur; bu yüzden açık işlem varken atlanır.
+        """
+        if self.conn.in_transaction or not self._snapshot_due():
+            return False
+        return self._take_snapshot_in_steps()
+
+    def snapshot_in_background(self, db_path) -> bool:
+        """Gerekiyorsa anlık görüntüyü kendi bağlantısıyla arka plan iş parçacığında alır.
+
+        Açılışta ve uzun süre açık kalan masalarda zamanlayıcıyla çağrılır;
+        bu bağlantıdaki işlemlere dokunmaz.
+
+        Returns:
+            bool: Yeni bir görüntü başlatıldı mı
+        """
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return False
+        if not self._snapshot_due():
+            return False
+        self._snapshot_thread = threading.Thread(
+            target=_snapshot_worker, args=(db_path,), name="journal-snapshot", daemon=True)
+        self._snapshot_thread.start()
+        return True
+
+    def prune(self):
+        """Saklanan en eski anlık görüntüden önceki journal satırlarını partiler halinde siler.
+
+        Yeniden oynatma bir görüntünün journal_id'sinden sonraki olayları
+        okur; daha eskileri hiçbir görüntü için gerekmez.
+        """
+        row = self.conn.execute("SELECT MIN(journal_id) FROM journal_snapshots").fetchone()
+        if row[0] is None:
+            return
+        while True:
+            with self.conn:
+                c = self.conn.execute(
+                    "DELETE FROM journal WHERE id IN (SELECT id FROM journal WHERE id <= ? ORDER BY id LIMIT ?)",
+                    (row[0], self.PRUNE_BATCH)
+                )
+            if c.rowcount < self.PRUNE_BATCH:
+                return
+
+
+def _snapshot_worker(db_path):
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        Journal(conn).maybe_snapshot()
+    except sqlite3.Error:
+        pass  # Bir sonraki denemede yeniden alınır; yarım parçalar budanır
+    finally:
+        conn.close()
+
+
+def _status(value):
+    # Durum kodlarından önceki kayıtlar metin taşır; taşıma ile aynı kural uygulanır
+    return VehicleStatus.parse(value, VehicleStatus.BAKIMDA)
+
+
+def apply_event(vehicles: dict, history: list, olay: str, plaka: str, veri):
+    """Tek bir olayı bellekteki duruma uygular."""
+    if veri and 'durum' in veri:
+        veri['durum'] = _status(veri['durum'])
+    if olay == VEHICLE_ADDED:
+        vehicles[plaka] = veri
+    elif olay == VEHICLE_DELETED:
+        vehicles.pop(plaka, None)
+    elif olay == VEHICLE_RENTED:
+        vehicles[plaka].update(veri, durum=VehicleStatus.KIRADA)
+    elif olay == VEHICLE_RETURNED:
+        vehicles[plaka].update(durum=VehicleStatus.MUSAIT, kiralayan=None, baslangic_tarihi=None, bitis_tarihi=None)
+        if veri['gecmis']:
+            history.append(veri['gecmis'])
+    elif olay == HISTORY_ADDED:
+        history.append(veri)
+    else:  # VEHICLE_UPDATED, VEHICLE_PRICED, VEHICLE_INSURED
+        vehicles[plaka].update(veri)
+
+
+def _read_parts(conn, journal_id, tablo):
+    c = conn.execute(
+        "SELECT veri FROM journal_snapshot_parts WHERE journal_id=? AND tablo=? ORDER BY parca",
+        (journal_id, tablo)
+    )
+    rows = []
+    for (blob,) in c:
+        rows += json.loads(zlib.decompress(blob))
+    return rows
+
+
+def replay(conn, snapshot_id: int = None):
+    """Anlık görüntü + sonraki olaylardan vehicles ve rental_history'yi bellekte kurar.
+
+    Returns:
+        tuple: (vehicles {plaka: dict}, history [dict], oynatılan olay sayısı)
+    """
+    query = "SELECT journal_id, veri FROM journal_snapshots"
+    params = ()
+    if snapshot_id is not None:
+        query += " WHERE id=?"
+        params = (snapshot_id,)
+    row = conn.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+    if row is None:
+        raise ValueError("Anlık görüntü bulunamadı")
+
+    journal_id, blob = row
+    if blob:
+        # Parçalı biçimden önceki görüntüler tek bir blob taşır
+        data = json.loads(zlib.decompress(blob))
+        vehicle_rows, history_rows = data['vehicles'], data['rental_history']
+    else:
+        vehicle_rows = _read_parts(conn, journal_id, 'vehicles')
+        history_rows = _read_parts(conn, journal_id, 'rental_history')
+    vehicles = {v[0]: dict(zip(VEHICLE_COLUMNS, v)) for v in vehicle_rows}
+    for v in vehicles.values():
+        v['durum'] = _status(v['durum'])
+    history = [dict(zip(HISTORY_COLUMNS, h)) for h in history_rows]
+
+    count = 0
+    c = conn.execute("SELECT olay, plaka, veri FROM journal WHERE id > ? ORDER BY id", (journal_id,))
+    while True:
+        rows = c.fetchmany(10000)
+        if not rows:
+            break
+        for olay, plaka, veri in rows:
+            apply_event(vehicles, history, olay, plaka, json.loads(veri) if veri else None)
+        count += len(rows)
+    return vehicles, history, count
+
+
+def write_state(db_path: str, vehicles: dict, history: list):
+    """Yeniden kurulan durumu yeni bir veritabanına yazar ve türetilmiş özetleri kurar."""
+    from src.backend.data_manager import DataManager
+
+    dm = DataManager(db_path)
+    with dm.conn:
+        dm.conn.executemany(
+            f"INSERT INTO vehicles ({', '.join(VEHICLE_COLUMNS)}) VALUES ({', '.join('?' * len(VEHICLE_COLUMNS))})",
+            [tuple(v.get(col) for col in VEHICLE_COLUMNS) for v in vehicles.values()]
+        )
+        dm.conn.executemany(
+            f"INSERT INTO rental_history ({', '.join(HISTORY_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(HISTORY_COLUMNS))})",
+            [tuple(h.get(col) for col in HISTORY_COLUMNS) for h in history]
+        )
+        # Olaylar müşteri id'si taşımaz; kayıtlar adlarından yeniden bağlanır
+        dm._link_customers()
+        dm.revenue_cube.rebuild()
+        dm.quantiles.rebuild()
+        # Yeni veritabanının journal'ı bu durumdan başlar
+        dm.journal.take_snapshot()
+    dm.conn.close()
+
+
+def _normalize(values):
+    # Sayılar JSON'dan int olarak dönebilir; karşılaştırma için float'a çevrilir
+    return tuple(
+        value if value is None else float(value) if isinstance(value, (int, float)) else str(value)
+        for value in values
+    )
+
+
+def _table_rows(conn, table, columns, key):
+    rows = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {key}").fetchall()
+    return [_normalize(row) for row in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.backend.journal",
+        description="vehicles ve rental_history tablolarını journal'dan yeniden kurar."
+    )
+    parser.add_argument('--db', default='car_rental.db', help="Journal'ın okunacağı veritabanı")
+    parser.add_argument('--out', help="Yeniden kurulan tabloların yazılacağı yeni veritabanı")
+    parser.add_argument('--snapshot', type=int, help="Başlangıç anlık görüntüsünün id'si (varsayılan: son)")
+    parser.add_argument('--verify', action='store_true', help="Sonucu mevcut tablolarla karşılaştır")
+    args = parser.parse_args(argv)
+
+    if args.out and os.path.exists(args.out):
+        parser.error(f"{args.out} zaten var; mevcut bir veritabanının üzerine yazılmaz")
+
+    conn = sqlite3.connect(Path(args.db).absolute().as_uri() + "?mode=ro", uri=True)
+    started = time.perf_counter()
+    try:
+        vehicles, history, count = replay(conn, args.snapshot)
+    except ValueError as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    print(f"{count} olay {elapsed:.2f} sn'de oynatıldı ({rate:,.0f} olay/sn)")
+    print(f"{len(vehicles)} araç, {len(history)} geçmiş kaydı")
+
+    status = 0
+    if args.verify:
+        expected_vehicles = _table_rows(conn, 'vehicles', VEHICLE_COLUMNS, 'plaka')
+        actual_vehicles = sorted(
+            (_normalize(v.get(col) for col in VEHICLE_COLUMNS) for v in vehicles.values()),
+            key=lambda row: row[0]
+        )
+        history_columns = HISTORY_COLUMNS[1:]  # id'ler olay sonrası kayıtlarda yeniden atanır
+        expected_history = _table_rows(conn, 'rental_history', history_columns, 'id')
+        actual_history = [_normalize(h.get(col) for col in history_columns) for h in history]
+        for name, expected, actual in (('vehicles', expected_vehicles, actual_vehicles),
+                                       ('rental_history', expected_history, actual_history)):
+            if expected == actual:
+                print(f"{name}: eşleşiyor ({len(actual)} satır)")
+            else:
+                status = 2
+                print(f"{name}: FARKLI (mevcut {len(expected)}, yeniden kurulan {len(actual)})")
+    conn.close()
+
+    if args.out:
+        write_state(args.out, vehicles, history)
+        print(f"Yeniden kurulan veritabanı: {args.out}")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import heapq
+from datetime import date, datetime, time, timedelta
+
+from src.models.dates import to_date
+from src.models.vehicle_status import VehicleStatus
+
+
+class OverdueWatcher:
+    """Kirada olup bitiş tarihi geçen araçları takip eder.
+
+    Yaklaşan bitiş tarihleri (bitis_tarihi, plaka) çiftleri olarak min-heap'te
+    tutulur; bir sonraki gecikmenin anı heap'in tepesinden okunur, böylece
+    arayüz tüm filoyu taramadan tam o ana zamanlayıcı kurabilir. İade edilen
+    veya uzatılan kiralamaların heap kayıtları silinmez; zamanı gelince
+    veritabanıyla karşılaştırılıp atlanır.
+    """
+
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        self._heap = []
+        self.overdue = {}  # plaka -> Vehicle
+
+    def reload(self, today: date = None):
+        """Geciken ve yaklaşan kiralamaları indeksli sorgularla baştan yükler."""
+        today = to_date(today) or date.today()
+        self.overdue = {v.plaka: v for v in self.data_manager.get_overdue_rentals(today)}
+        self._heap = self.data_manager.get_rental_due_dates(today)
+        heapq.heapify(self._heap)
+
+    def track(self, plaka: str, bitis) -> bool:
+        """Yeni başlayan kiralamayı ekler.
+
+        Returns:
+            bool: Bir sonraki gecikme anı öne çekildiyse True (zamanlayıcı yeniden kurulmalı)
+        """
+        bitis = to_date(bitis)
+        if bitis is None:
+            return False
+        earlier = not self._heap or bitis < self._heap[0][0]
+        heapq.heappush(self._heap, (bitis, plaka))
+        return earlier
+
+    def resolve(self, plaka: str) -> bool:
+        """İade edilen aracı geciken listesinden çıkarır."""
+        return self.overdue.pop(plaka, None) is not None
+
+    def next_due(self):
+        """Bir sonraki kiralamanın gecikmeye düşeceği an (bitiş gününün ertesi gece yarısı)."""
+        if not self._heap:
+            return None
+        return datetime.combine(self._heap[0][0] + timedelta(days=1), time())
+
+    def seconds_until_next(self, now: datetime = None):
+        due = self.next_due()
+        if due is None:
+            return None
+        return max(0.0, (due - (now or datetime.now())).total_seconds())
+
+    def poll(self, today: date = None):
+        """Zamanı gelen kayıtları heap'ten alır ve gerçekten gecikenleri döndürür."""
+        today = to_date(today) or date.today()
+        due = {}
+        while self._heap and self._heap[0][0] < today:
+            bitis, plaka = heapq.heappop(self._heap)
+            due[plaka] = bitis
+
+        newly = []
+        for v in self.data_manager.get_vehicles_by_plates(due).values():
+            # Bu arada iade edilen veya uzatılan kiralamalar atlanır
+            if v.durum == VehicleStatus.KIRADA and v.bitis_tarihi == due[v.plaka] and v.plaka not in self.overdue:
+                self.overdue[v.plaka] = v
+                newly.append(v)
+        return newly
+
+    def overdue_list(self):
+        """Geciken araçlar, en uzun süredir gecikenden başlayarak."""
+        return sorted(self.overdue.values(), key=lambda v: v.bitis_tarihi)
@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+from itertools import accumulate
+
+from src.models.dates import to_date
+
+
+class PricingRule:
+    """Fiyat kuralı arayüzü.
+
+    day_factor takvim gününün çarpanını, length_factor ise toplam kiralama
+    süresine göre uygulanan çarpanı döndürür. Kurallar birbirinin üzerine
+    çarpılarak uygulanır.
+    """
+
+    def day_factor(self, day: date) -> float:
+        return 1.0
+
+    def length_factor(self, days: int) -> float:
+        return 1.0
+
+
+class WeekendRule(PricingRule):
+    """Hafta sonu günleri için çarpan (varsayılan Cumartesi ve Pazar)."""
+
+    def __init__(self, factor: float = 1.15, weekdays=(5, 6)):
+        self.factor = factor
+        self.weekdays = frozenset(weekdays)
+
+    def day_factor(self, day):
+        return self.factor if day.weekday() in self.weekdays else 1.0
+
+
+class SeasonRule(PricingRule):
+    """Belirli aylar için sezon çarpanı."""
+
+    def __init__(self, factor: float = 1.25, months=(6, 7, 8)):
+        self.factor = factor
+        self.months = frozenset(months)
+
+    def day_factor(self, day):
+        return self.factor if day.month in self.months else 1.0
+
+
+class LongRentalDiscount(PricingRule):
+    """Süreye göre kademeli indirim: [(en az gün, indirim oranı), ...]."""
+
+    def __init__(self, tiers=((7, 0.10), (30, 0.20))):
+        self.tiers = sorted(tiers)
+
+    def length_factor(self, days):
+        discount = 0.0
+        for min_days, rate in self.tiers:
+            if days >= min_days:
+                discount = rate
+        return 1.0 - discount
+
+
+DEFAULT_RULES = (WeekendRule(), SeasonRule(), LongRentalDiscount())
+
+
+class PricingEngine:
+    """Kiralama ücretlerinin tek hesaplama noktası.
+
+    Günlük çarpanlar takvim yılı bazında önceden hesaplanıp önek toplamı
+    tablosuna derlenir; bir tarih aralığının çarpan toplamı iki tablo
+    okumasıyla bulunur. Aynı aralık için N aracın fiyatı tek çarpımla
+    hesaplanır (quote_many).
+    """
+
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = tuple(rules)
+        self._origin = None   # Tablonun ilk gününün ordinal değeri
+        self._prefix = [0.0]  # _prefix[i]: ilk i günün çarpan toplamı
+
+    def _compile(self, first: date, last: date):
+        """Tabloyu [first, last] aralığını kapsayacak şekilde tam yıllarla kurar."""
+        if self._origin is not None:
+            first = min(first, date.fromordinal(self._origin))
+            last = max(last, date.fromordinal(self._origin + len(self._prefix) - 2))
+        start = date(first.year, 1, 1)
+        days = (date(last.year, 12, 31) - start).days + 1
+
+        factors = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            factor = 1.0
+            for rule in self.rules:
+                factor *= rule.day_factor(day)
+            factors.append(factor)
+
+        self._origin = start.toordinal()
+        self._prefix = [0.0, *accumulate(factors)]
+
+    def _factor_sum(self, start: date, end: date) -> float:
+        lo = start.toordinal()
+        hi = end.toordinal()
+        if self._origin is None or lo < self._origin or hi - self._origin + 1 >= len(self._prefix):
+            self._compile(start, end)
+        return self._prefix[hi - self._origin + 1] - self._prefix[lo - self._origin]
+
+    def _length_factor(self, days: int) -> float:
+        factor = 1.0
+        for rule in self.rules:
+            factor *= rule.length_factor(days)
+        return factor
+
+    def multiplier(self, baslangic, bitis):
+        """Aralık için günlük ücretle çarpılacak değer ve gün sayısı.
+
+        Returns:
+            tuple: (çarpan, gün sayısı); tarihler geçersizse 1 günlük fiyat
+        """
+        try:
+            start, end = to_date(baslangic), to_date(bitis)
+            days = (end - start).days + 1
+        except (TypeError, ValueError):
+            return 1.0, 1
+        if days < 1:
+            return 1.0, 1
+        return self._factor_sum(start, end) * self._length_factor(days), days
+
+    def quote(self, ucret: float, baslangic, bitis) -> float:
+        factor, _ = self.multiplier(baslangic, bitis)
+        return round(ucret * factor, 2)
+
+    def quote_many(self, ucretler, baslangic, bitis):
+        """Aynı tarih aralığı için birden fazla günlük ücreti fiyatlandırır."""
+        factor, _ = self.multiplier(baslangic, bitis)
+        return [round(ucret * factor, 2) for ucret in ucretler]
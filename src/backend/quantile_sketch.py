@@ -0,0 +1,242 @@
+import json
+import random
+from math import ceil
+
+from src.backend.revenue_cube import RevenueCube
+
+# Yüzdelik özetlerin tutulduğu segment boyutları ve ölçüler
+SKETCH_DIMENSIONS = ('marka', 'ay')
+SKETCH_METRICS = ('gun', 'ucret')
+
+
+class KLLSketch:
+    """Birleştirilebilir akış yüzdelik özeti (KLL).
+
+    Bellek kullanımı yaklaşık 3k değerle sınırlıdır; sıra hatası k=200 için
+    tipik olarak %1 civarındadır. Aynı k ile oluşturulmuş iki özet merge ile
+    birleştirilebilir.
+    """
+
+    def __init__(self, k: int = 200, c: float = 2 / 3):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.compactors = []
+        self.size = 0
+        self.max_size = 0
+        self._random = random.Random()
+        self._grow()
+
+    def _grow(self):
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _capacity(self, height):
+        depth = len(self.compactors) - height - 1
+        return int(ceil(self.k * self.c ** depth)) + 1
+
+    def _compress(self):
+        while self.size >= self.max_size:
+            for height, items in enumerate(self.compactors):
+                if len(items) >= self._capacity(height):
+                    if height + 1 >= len(self.compactors):
+                        self._grow()
+                    items.sort()
+                    # Rastgele tek/çift elemanlar bir üst seviyeye çift ağırlıkla taşınır
+                    self.compactors[height + 1].extend(items[self._random.randint(0, 1)::2])
+                    items.clear()
+                    break
+            self.size = sum(len(items) for items in self.compactors)
+
+    def update(self, value):
+        self.compactors[0].append(value)
+        self.size += 1
+        self.n += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for height, items in enumerate(other.compactors):
+            self.compactors[height].extend(items)
+        self.n += other.n
+        self.size = sum(len(items) for items in self.compactors)
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        """Verilen oranlar (0..1) için yaklaşık değerleri döndürür."""
+        weighted = sorted(
+            (value, 1 << height)
+            for height, items in enumerate(self.compactors)
+            for value in items
+        )
+        if not weighted:
+            return [None for _ in qs]
+
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for q in qs:
+            target = q * total
+            cumulative = 0
+            result = weighted[-1][0]
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    result = value
+                    break
+            results.append(result)
+        return results
+
+    def to_dict(self):
+        return {'k': self.k, 'n': self.n, 'compactors': self.compactors}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['k'])
+        for _ in range(len(data['compactors']) - 1):
+            sketch._grow()
+        sketch.compactors = [list(items) for items in data['compactors']]
+        sketch.n = data['n']
+        sketch.size = sum(len(items) for items in sketch.compactors)
+        return sketch
+
+
+class QuantileStore:
+    """Marka ve ay segmentleri için kiralama süresi/tutarı özetlerini tutar.
+
+    Her segment, her ölçü için bir KLLSketch içerir ve quantile_sketches
+    tablosunda JSON olarak saklanır. Kiralama kapandığında sadece ilgili iki
+    segment güncellenir; sorgular ham geçmişi sıralamadan özetlerden yanıtlanır.
+    Birden fazla masa aynı veritabanına yazdığı için segmentler bellekte
+    tutulmaz, her okuma ve yazmada tablodan okunur.
+    """
+
+    def __init__(self, conn, k: int = 200):
+        self.conn = conn
+        self.k = k
+        self._cache = {}  # Sadece tablosu olmayan salt okunur veritabanı için
+
+    def create_table(self):
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS quantile_sketches
+            (
+                boyut TEXT NOT NULL,
+                segment TEXT NOT NULL,
+                veri TEXT NOT NULL,
+                PRIMARY KEY (boyut, segment)
+            )
+        """)
+        empty = self.conn.execute("SELECT 1 FROM quantile_sketches LIMIT 1").fetchone() is None
+        has_history = self.conn.execute("SELECT 1 FROM rental_history LIMIT 1").fetchone() is not None
+        if empty and has_history:
+            self.rebuild()
+
+    def _new_segment(self):
+        return {metric: KLLSketch(self.k) for metric in SKETCH_METRICS}
+
+    def _table_exists(self):
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='quantile_sketches'"
+        ).fetchone() is not None
+
+    def _scan_history(self):
+        """Geçmişi bir kez tarayarak tüm segmentleri bellekte oluşturur."""
+        segments = {}
+        c = self.conn.execute("""
+            SELECT COALESCE(v.marka, 'Bilinmiyor'), substr(h.baslangic_tarihi, 1, 7),
+                   h.baslangic_tarihi, h.bitis_tarihi, h.toplam_ucret
+            FROM rental_history h LEFT JOIN vehicles v ON v.plaka = h.plaka
+        """)
+        while True:
+            rows = c.fetchmany(5000)
+            if not rows:
+                break
+            for marka, ay, baslangic, bitis, ucret in rows:
+                days = RevenueCube.rental_days(baslangic, bitis)
+                for key in (('marka', marka), ('ay', ay)):
+                    segment = segments.get(key)
+                    if segment is None:
+                        segment = segments[key] = self._new_segment()
+                    segment['gun'].update(days)
+                    segment['ucret'].update(ucret or 0)
+        return segments
+
+    def rebuild(self):
+        """Tüm özetleri geçmişten yeniden oluşturur (commit çağırana aittir)."""
+        segments = self._scan_history()
+        self.conn.execute("DELETE FROM quantile_sketches")
+        self.conn.executemany(
+            "INSERT INTO quantile_sketches (boyut, segment, veri) VALUES (?, ?, ?)",
+            [(dim, seg, self._dump(segment)) for (dim, seg), segment in segments.items()]
+        )
+
+    @staticmethod
+    def _dump(segment):
+        return json.dumps({metric: sketch.to_dict() for metric, sketch in segment.items()})
+
+    @staticmethod
+    def _parse(veri):
+        data = json.loads(veri)
+        return {m: KLLSketch.from_dict(data[m]) for m in SKETCH_METRICS}
+
+    def _load(self, dimension, segment_name):
+        row = self.conn.execute(
+            "SELECT veri FROM quantile_sketches WHERE boyut=? AND segment=?", (dimension, segment_name)
+        ).fetchone()
+        return self._parse(row[0]) if row else self._new_segment()
+
+    def add(self, marka: str, ay: str, days: int, ucret: float):
+        """Kapanan bir kiralamayı marka ve ay segmentlerine işler (commit çağırana aittir).
+
+        Oku-birleştir-yaz adımları yazma kilidi altında yapılır; açık bir
+        transaction yoksa BEGIN IMMEDIATE ile alınır. Böylece iki masa aynı
+        segmenti birbirinin güncellemesini ezmeden günceller.
+        """
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+        for dimension, segment_name in (('marka', marka or 'Bilinmiyor'), ('ay', ay)):
+            segment = self._load(dimension, segment_name)
+            segment['gun'].update(days)
+            segment['ucret'].update(ucret or 0)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO quantile_sketches (boyut, segment, veri) VALUES (?, ?, ?)",
+                (dimension, segment_name, self._dump(segment))
+            )
+
+    def segments(self, dimension: str):
+        """Bir boyuttaki tüm segmentleri {segment: {metric: KLLSketch}} olarak döndürür."""
+        if dimension not in SKETCH_DIMENSIONS:
+            raise ValueError(f"Geçersiz boyut: {dimension}")
+
+        if not self._table_exists():
+            # Salt okunur eski veritabanı: özetleri bellekte bir kez oluştur
+            if not self._cache:
+                self._cache = self._scan_history()
+            return {seg: s for (dim, seg), s in self._cache.items() if dim == dimension}
+
+        c = self.conn.execute("SELECT segment, veri FROM quantile_sketches WHERE boyut=?", (dimension,))
+        return {segment: self._parse(veri) for segment, veri in c.fetchall()}
+
+    def percentiles(self, dimension: str, qs=(0.5, 0.9, 0.99)):
+        """Her segment ve tüm segmentlerin birleşimi için yüzdelikleri hesaplar.
+
+        Returns:
+            dict: {segment: {'adet': n, 'gun': [..], 'ucret': [..]}, ..., 'Tümü': {...}}
+        """
+        result = {}
+        merged = self._new_segment()
+        for name, segment in sorted(self.segments(dimension).items()):
+            result[name] = {
+                'adet': segment['gun'].n,
+                **{metric: segment[metric].quantiles(qs) for metric in SKETCH_METRICS},
+            }
+            for metric in SKETCH_METRICS:
+                merged[metric].merge(segment[metric])
+        if result:
+            result['Tümü'] = {
+                'adet': merged['gun'].n,
+                **{metric: merged[metric].quantiles(qs) for metric in SKETCH_METRICS},
+            }
+        return result
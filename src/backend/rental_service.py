@@ -1,19 +1,30 @@
 from datetime import datetime, date
 from typing import Tuple, List
 from src.backend.data_manager import DataManager
+from src.models.dates import to_date
 from src.models.vehicle import Vehicle
+from src.models.vehicle_status import VehicleStatus
 from src.models.rental_history import RentalHistory
+from src.backend.reservation_calendar import ReservationCalendar, CURRENT_RENTAL
+from src.backend.pricing import PricingEngine
+from src.backend.event_log import EVENT_VALIDATION_ERROR, EVENT_OVERRIDE
 
 
 class ValidationError(Exception):
     pass
 
 
+CONFLICT_MESSAGE = "Bu tarihlerle çakışan bir rezervasyon var. Kiralama yapılamaz!"
+
+
 class RentalService:
     DATE_FORMAT = "%Y-%m-%d"
 
-    def __init__(self, data_manager: DataManager):
+    def __init__(self, data_manager: DataManager, pricing: PricingEngine = None):
         self.data_manager = data_manager
+        self.pricing = pricing or PricingEngine()
+        self.calendar = ReservationCalendar()
+        self.calendar.build(data_manager)
 
     def validate_vehicle_data(self, plaka: str, marka: str, model: str, ucret: str) -> Tuple[bool, str]:
         if not plaka or not plaka.strip():
@@ -40,43 +51,55 @@ class RentalService:
 
         return True, ""
 
-    def validate_dates(self, baslangic: str, bitis: str) -> Tuple[bool, str]:
-        if not baslangic or not baslangic.strip():
-            return False, "Başlangıç tarihi boş olamaz!"
+    def _parse_dates(self, baslangic: str, bitis: str):
+        """Arayüzden gelen tarih metinlerini doğrulayıp date'e çevirir.
+
+        Returns:
+            tuple: (hata mesajı veya "", başlangıç date, bitiş date)
+        """
+        if not baslangic or not str(baslangic).strip():
+            return "Başlangıç tarihi boş olamaz!", None, None
 
-        if not bitis or not bitis.strip():
-            return False, "Bitiş tarihi boş olamaz!"
+        if not bitis or not str(bitis).strip():
+            return "Bitiş tarihi boş olamaz!", None, None
 
         try:
-            baslangic_date = datetime.strptime(baslangic.strip(), self.DATE_FORMAT).date()
+            baslangic_date = self._parse_date(baslangic)
         except ValueError:
-            return False, "Başlangıç tarihi geçersiz! (Formatı: YYYY-AA-GG)"
+            return "Başlangıç tarihi geçersiz! (Formatı: YYYY-AA-GG)", None, None
 
         try:
-            bitis_date = datetime.strptime(bitis.strip(), self.DATE_FORMAT).date()
+            bitis_date = self._parse_date(bitis)
         except ValueError:
-            return False, "Bitiş tarihi geçersiz! (Formatı: YYYY-AA-GG)"
+            return "Bitiş tarihi geçersiz! (Formatı: YYYY-AA-GG)", None, None
 
         if bitis_date < baslangic_date:
-            return False, "Bitiş tarihi başlangıç tarihinden önce olamaz!"
+            return "Bitiş tarihi başlangıç tarihinden önce olamaz!", None, None
 
         if baslangic_date < date.today():
-            return False, "Başlangıç tarihi bugünden önce olamaz!"
+            return "Başlangıç tarihi bugünden önce olamaz!", None, None
 
-        return True, ""
+        return "", baslangic_date, bitis_date
+
+    def _parse_date(self, value) -> date:
+        if isinstance(value, date):
+            return value
+        return datetime.strptime(value.strip(), self.DATE_FORMAT).date()
 
-    def calculate_rental_days(self, baslangic: str, bitis: str) -> int:
+    def validate_dates(self, baslangic: str, bitis: str) -> Tuple[bool, str]:
+        error_msg, _, _ = self._parse_dates(baslangic, bitis)
+        return not error_msg, error_msg
+
+    def calculate_rental_days(self, baslangic, bitis) -> int:
         try:
-            baslangic_date = datetime.strptime(baslangic, self.DATE_FORMAT).date()
-            bitis_date = datetime.strptime(bitis, self.DATE_FORMAT).date()
-            days = (bitis_date - baslangic_date).days + 1
+            days = (to_date(bitis) - to_date(baslangic)).days + 1
             return max(1, days)
-        except ValueError:
+        except (TypeError, ValueError):
             return 1
 
-    def calculate_total_cost(self, ucret: float, baslangic: str, bitis: str) -> float:
-        days = self.calculate_rental_days(baslangic, bitis)
-        return ucret * days
+    def calculate_total_cost(self, ucret: float, baslangic, bitis) -> float:
+        """Hafta sonu/sezon çarpanları ve uzun kiralama indirimiyle toplam ücret."""
+        return self.pricing.quote(ucret, baslangic, bitis)
 
     def add_vehicle(self, plaka: str, marka: str, model: str, ucret: str) -> Tuple[bool, str]:
         is_valid, error_msg = self.validate_vehicle_data(plaka, marka, model, ucret)
@@ -84,10 +107,8 @@ class RentalService:
             return False, error_msg
 
         #3 ay sonrasi sigorta ve kasko bitis tarihi
-        from datetime import datetime, timedelta
-        today = datetime.now().date()
-        three_months_later = today + timedelta(days=90)
-        insurance_date = three_months_later.strftime("%Y-%m-%d")
+        from datetime import timedelta
+        insurance_date = date.today() + timedelta(days=90)
 
         vehicle = Vehicle(
             plaka=plaka.strip().upper(),
@@ -103,34 +124,108 @@ class RentalService:
         else:
             return False, "Araç eklenirken bir hata oluştu!"
 
-    def start_rental(self, plaka: str, kiralayan: str, baslangic: str, bitis: str) -> Tuple[bool, str, float]:
-        vehicle = self.data_manager.get_vehicle_by_plaka(plaka)
-        if not vehicle:
-            return False, "Araç bulunamadı!", 0
+    def _check_request(self, plaka: str, kiralayan: str, baslangic: str, bitis: str):
+        """Kiralama isteğini veritabanına gitmeden doğrular.
 
-        if vehicle.durum != "müsait":
-            return False, f"Bu araç şu anda '{vehicle.durum}' durumunda. Kiralama yapılamaz!", 0
+        Araç durumu ve tarih çakışmaları burada okunmaz; koşullu yazma
+        ifadeleri karar verir. Takvim başka masaların yazdıklarını
+        görmediğinden burada ön kontrol olarak da kullanılmaz.
 
+        Returns:
+            tuple: (hata mesajı veya "", başlangıç date, bitiş date)
+        """
         if not kiralayan or not kiralayan.strip():
-            return False, "Müşteri adı boş olamaz!", 0
+            return "Müşteri adı boş olamaz!", None, None
 
-        is_valid, error_msg = self.validate_dates(baslangic, bitis)
-        if not is_valid:
+        error_msg, baslangic, bitis = self._parse_dates(baslangic, bitis)
+        if error_msg:
+            return error_msg, None, None
+
+        return "", baslangic, bitis
+
+    def _conflict_message(self, plaka: str, baslangic: date, bitis: date) -> str:
+        """Koşullu yazma reddedildikten sonra aracın takvimini yeniler ve nedeni söyler."""
+        self.calendar.reload_vehicle(self.data_manager, plaka)
+        if self.calendar.find_conflict(plaka, baslangic, bitis) == CURRENT_RENTAL:
+            return "Araç bu tarihlerde kirada. Kiralama yapılamaz!"
+        return CONFLICT_MESSAGE
+
+    def _check_insurance(self, vehicle, bitis: date):
+        """Sigorta/kasko kiralama bitişini kapsıyor mu?
+
+        Returns:
+            str | None: Hata mesajı veya None (geçerli ise)
+        """
+        errors = []
+
+        if not vehicle.sigorta_bitis:
+            errors.append("Araç sigortası tanımlanmamış.")
+        elif vehicle.sigorta_bitis < bitis:
+            errors.append(f"Sigorta bitiş tarihi ({vehicle.sigorta_bitis}) kiralama süresini kapsamıyor.")
+
+        if not vehicle.kasko_bitis:
+            errors.append("Araç kaskosu tanımlanmamış.")
+        elif vehicle.kasko_bitis < bitis:
+            errors.append(f"Kasko bitiş tarihi ({vehicle.kasko_bitis}) kiralama süresini kapsamıyor.")
+
+        return "\n".join(errors) if errors else None
+
+    def _rejection(self, vehicle, baslangic: date, bitis: date) -> str:
+        """Araç bu kiralamayı alamıyorsa nedenini, alabiliyorsa "" döndürür.
+
+        Sigorta/kasko kaynaklı redler başarısız kiralama olarak kaydedilir.
+        """
+        if not vehicle:
+            return "Araç bulunamadı!"
+
+        insurance_error = self._check_insurance(vehicle, bitis)
+        if insurance_error:
+            self.data_manager.add_failed_rental(vehicle.plaka, vehicle.marka, vehicle.model, insurance_error)
+            return insurance_error
+
+        is_future = baslangic > date.today()
+        if vehicle.durum == VehicleStatus.BAKIMDA or (not is_future and vehicle.durum != VehicleStatus.MUSAIT):
+            return f"Bu araç şu anda '{vehicle.durum.label}' durumunda. Kiralama yapılamaz!"
+        if vehicle.durum == VehicleStatus.KIRADA and vehicle.bitis_tarihi and vehicle.bitis_tarihi >= baslangic:
+            return f"Araç {vehicle.bitis_tarihi} tarihine kadar kirada. Bu tarihlerde kiralanamaz!"
+        return ""
+
+    def start_rental(self, plaka: str, kiralayan: str, baslangic: str, bitis: str) -> Tuple[bool, str, float]:
+        """Kiralamayı başlatır; başlangıç ileri bir tarihse rezervasyon oluşturur.
+
+        Durum geçişi tek bir koşullu UPDATE ile yapılır; aynı aracı aynı anda
+        kiralamaya çalışan iki masadan sadece biri başarılı olur.
+        """
+        error_msg, baslangic, bitis = self._check_request(plaka, kiralayan, baslangic, bitis)
+        if error_msg:
+            self.data_manager.log_event(EVENT_VALIDATION_ERROR, plaka, error_msg, kiralayan=kiralayan)
             return False, error_msg, 0
 
+        kiralayan = kiralayan.strip()
+        is_future = baslangic > date.today()
+
+        if is_future:
+            reservation_id = self.data_manager.try_add_reservation(plaka, kiralayan, baslangic, bitis)
+            vehicle = self.data_manager.get_vehicle_by_plaka(plaka)
+            if reservation_id is None:
+                return False, (self._rejection(vehicle, baslangic, bitis)
+                               or self._conflict_message(plaka, baslangic, bitis)), 0
+            self.calendar.add_reservation(reservation_id, plaka, baslangic, bitis)
+            title = f"Rezervasyon oluşturuldu! ({baslangic} tarihinde başlayacak)"
+        else:
+            vehicle = self.data_manager.try_start_rental(plaka, kiralayan, baslangic, bitis)
+            if vehicle is None:
+                vehicle = self.data_manager.get_vehicle_by_plaka(plaka)
+                return False, (self._rejection(vehicle, baslangic, bitis)
+                               or self._conflict_message(plaka, baslangic, bitis)), 0
+            self.calendar.set_current(plaka, baslangic, bitis)
+            title = "Kiralama başarıyla tamamlandı!"
+
         total_cost = self.calculate_total_cost(vehicle.ucret, baslangic, bitis)
         days = self.calculate_rental_days(baslangic, bitis)
 
-        self.data_manager.update_vehicle(plaka, {
-            'durum': 'kirada',
-            'kiralayan': kiralayan.strip(),
-            'baslangic_tarihi': baslangic,
-            'bitis_tarihi': bitis
-        })
-        self.data_manager.save_vehicles()
-
         message = (
-            f"Kiralama başarıyla tamamlandı!\n\n"
+            f"{title}\n\n"
             f"Araç: {vehicle.marka} {vehicle.model} ({vehicle.plaka})\n"
             f"Müşteri: {kiralayan}\n"
             f"Süre: {days} gün\n"
@@ -140,40 +235,187 @@ class RentalService:
 
         return True, message, total_cost
 
+    def activate_due_reservations(self, today: date = None) -> List[str]:
+        """Başlangıç tarihi gelen rezervasyonları kiralamaya çevirir.
+
+        Araç hâlâ önceki kiralamada ise rezervasyon bekletilir; bitiş tarihi de
+        geçmiş rezervasyonlar iptal edilir.
+
+        Returns:
+            List[str]: Kiralaması başlatılan plakalar
+        """
+        today = to_date(today) or date.today()
+        activated = []
+        for r in self.data_manager.get_due_reservations(today):
+            if r['bitis_tarihi'] < today:
+                self.data_manager.set_reservation_status(r['id'], 'iptal')
+                self.calendar.remove_reservation(r['id'], r['plaka'])
+                continue
+
+            if not self.data_manager.try_activate_reservation(r):
+                # Araç henüz iade edilmedi veya başka masa etkinleştirdi
+                self.calendar.reload_vehicle(self.data_manager, r['plaka'])
+                continue
+
+            self.calendar.remove_reservation(r['id'], r['plaka'])
+            self.calendar.set_current(r['plaka'], r['baslangic_tarihi'], r['bitis_tarihi'])
+            activated.append(r['plaka'])
+        return activated
+
+    def cancel_reservation(self, reservation_id: int, plaka: str) -> Tuple[bool, str]:
+        self.data_manager.set_reservation_status(reservation_id, 'iptal')
+        self.calendar.remove_reservation(reservation_id, plaka)
+        return True, "Rezervasyon iptal edildi."
+
+    def get_reservations(self, plaka: str = None) -> List[dict]:
+        return self.data_manager.get_reservations(plaka)
+
+    def _build_history(self, vehicle):
+        """Kiradaki aracın iadesi için geçmiş kaydını hazırlar (tarih yoksa None)."""
+        if not (vehicle.baslangic_tarihi and vehicle.bitis_tarihi):
+            return None
+        total_cost = self.calculate_total_cost(
+            vehicle.ucret,
+            vehicle.baslangic_tarihi,
+            vehicle.bitis_tarihi
+        )
+        return RentalHistory(
+            plaka=vehicle.plaka,
+            kiralayan=vehicle.kiralayan or "",
+            baslangic_tarihi=vehicle.baslangic_tarihi,
+            bitis_tarihi=vehicle.bitis_tarihi,
+            toplam_ucret=total_cost,
+            iade_tarihi=date.today()
+        )
+
+    def start_rentals(self, batch: List[dict]) -> List[dict]:
+        """Birden fazla kiralamayı tek işlemde başlatır.
+
+        Her öğe {'plaka', 'kiralayan', 'baslangic', 'bitis'} içerir. Önce tüm
+        öğeler doğrulanır, geçerli olanlar tek bir transaction içinde koşullu
+        ifadelerle yazılır; takvim ifadelerin sonucuna göre güncellenir.
+
+        Returns:
+            List[dict]: Her öğe için {'plaka', 'ok', 'mesaj', 'ucret'}; geçerli
+            öğelerde ileri tarihli olup olmadığı 'rezervasyon' anahtarındadır
+        """
+        vehicles = self.data_manager.get_vehicles_by_plates(item.get('plaka') for item in batch)
+        results = []
+        rentals = []       # (sonuç, satır)
+        reservations = []  # (sonuç, satır)
+        # Sadece aynı partideki öğelerin birbiriyle çakışmasını yakalar; veritabanındaki
+        # kiralama ve rezervasyonlarla çakışmalara koşullu ifadeler karar verir
+        batch_calendar = ReservationCalendar()
+
+        for i, item in enumerate(batch):
+            plaka = item.get('plaka')
+            vehicle = vehicles.get(plaka)
+            kiralayan, baslangic, bitis = item.get('kiralayan'), item.get('baslangic'), item.get('bitis')
+            error_msg, baslangic, bitis = self._check_request(plaka, kiralayan, baslangic, bitis)
+            if error_msg:
+                self.data_manager.log_event(EVENT_VALIDATION_ERROR, plaka, error_msg, kiralayan=kiralayan)
+            else:
+                error_msg = self._rejection(vehicle, baslangic, bitis)
+            if not error_msg and not batch_calendar.is_free(plaka, baslangic, bitis):
+                error_msg = "Bu tarihler aynı partideki başka bir kiralamayla çakışıyor!"
+            if error_msg:
+                results.append({'plaka': plaka, 'ok': False, 'mesaj': error_msg, 'ucret': 0})
+                continue
+
+            is_future = baslangic > date.today()
+            batch_calendar.add_reservation(i, plaka, baslangic, bitis)
+            result = {
+                'plaka': plaka, 'ok': True, 'rezervasyon': is_future,
+                'mesaj': "Rezervasyon oluşturuldu." if is_future else "Kiralama başlatıldı.",
+                'ucret': self.calculate_total_cost(vehicle.ucret, baslangic, bitis),
+            }
+            results.append(result)
+            row = (plaka, kiralayan.strip(), baslangic, bitis)
+            (reservations if is_future else rentals).append((result, row))
+
+        if rentals or reservations:
+            rented, reservation_ids = self.data_manager.apply_rental_batch(
+                [row for _, row in rentals], [row for _, row in reservations])
+
+            for ok, (result, (plaka, _, baslangic, bitis)) in zip(rented, rentals):
+                if ok:
+                    self.calendar.set_current(plaka, baslangic, bitis)
+                else:
+                    self.calendar.reload_vehicle(self.data_manager, plaka)
+                    result.update(ok=False, ucret=0, mesaj="Araç bu arada başka bir işlemle kiralandı!")
+
+            for reservation_id, (result, (plaka, _, baslangic, bitis)) in zip(reservation_ids, reservations):
+                if reservation_id is not None:
+                    self.calendar.add_reservation(reservation_id, plaka, baslangic, bitis)
+                else:
+                    self.calendar.reload_vehicle(self.data_manager, plaka)
+                    result.update(ok=False, ucret=0, mesaj="Bu tarihler bu arada başka bir işlemle dolduruldu!")
+
+        return results
+
+    def end_rentals(self, plates: List[str]) -> List[dict]:
+        """Birden fazla aracı tek işlemde iade alır.
+
+        Returns:
+            List[dict]: Her plaka için {'plaka', 'ok', 'mesaj', 'ucret'}
+        """
+        vehicles = self.data_manager.get_vehicles_by_plates(plates)
+        results = []
+        items = []  # (sonuç, araç, geçmiş)
+        seen = set()
+
+        for plaka in plates:
+            vehicle = vehicles.get(plaka)
+            if not vehicle:
+                results.append({'plaka': plaka, 'ok': False, 'mesaj': "Araç bulunamadı!", 'ucret': 0})
+                continue
+            if vehicle.durum != VehicleStatus.KIRADA or plaka in seen:
+                if vehicle.durum != VehicleStatus.KIRADA:
+                    self.calendar.clear_current(plaka)  # Başka masada iade edilmiş olabilir
+                results.append({'plaka': plaka, 'ok': False, 'mesaj': "Bu araç zaten kirada değil!", 'ucret': 0})
+                continue
+
+            seen.add(plaka)
+            history = self._build_history(vehicle)
+            result = {'plaka': plaka, 'ok': True, 'mesaj': "İade alındı.",
+                      'ucret': history.toplam_ucret if history else 0}
+            results.append(result)
+            items.append((result, vehicle, history))
+
+        if items:
+            returned = self.data_manager.apply_return_batch([(v, h) for _, v, h in items])
+            for ok, (result, vehicle, _) in zip(returned, items):
+                if ok:
+                    self.calendar.clear_current(vehicle.plaka)
+                else:
+                    self.calendar.reload_vehicle(self.data_manager, vehicle.plaka)
+                    result.update(ok=False, ucret=0, mesaj="Araç bu arada başka bir işlemle iade alındı!")
+            self.activate_due_reservations()
+
+        return results
+
     def end_rental(self, plaka: str) -> Tuple[bool, str]:
         vehicle = self.data_manager.get_vehicle_by_plaka(plaka)
         if not vehicle:
             return False, "Araç bulunamadı!"
 
-        if vehicle.durum != "kirada":
+        if vehicle.durum != VehicleStatus.KIRADA:
+            self.calendar.clear_current(plaka)  # Başka masada iade edilmiş olabilir
             return False, "Bu araç zaten kirada değil!"
 
         # Kiralayan bilgisini değişkene kaydet
         old_kiralayan = vehicle.kiralayan or "Bilinmiyor"
 
-        if vehicle.baslangic_tarihi and vehicle.bitis_tarihi:
-            total_cost = self.calculate_total_cost(
-                vehicle.ucret,
-                vehicle.baslangic_tarihi,
-                vehicle.bitis_tarihi
-            )
-            history = RentalHistory(
-                plaka=vehicle.plaka,
-                kiralayan=vehicle.kiralayan or "",
-                baslangic_tarihi=vehicle.baslangic_tarihi,
-                bitis_tarihi=vehicle.bitis_tarihi,
-                toplam_ucret=total_cost,
-                iade_tarihi=datetime.now().strftime(self.DATE_FORMAT)
-            )
-            self.data_manager.add_rental_history(history)
+        history = self._build_history(vehicle)
+        if not self.data_manager.try_end_rental(vehicle, history):
+            self.calendar.reload_vehicle(self.data_manager, plaka)
+            return False, "Araç bu arada başka bir işlemle iade alındı!"
+        self.calendar.clear_current(plaka)
 
-        self.data_manager.update_vehicle(plaka, {
-            'durum': 'müsait',
-            'kiralayan': None,
-            'baslangic_tarihi': None,
-            'bitis_tarihi': None
-        })
-        self.data_manager.save_vehicles()
+        # Bu aracı bekleyen, başlangıcı gelmiş bir rezervasyon varsa hemen başlat
+        if plaka in self.activate_due_reservations():
+            return True, (f"'{plaka}' plakalı araç başarıyla iade alındı!\nMüşteri: {old_kiralayan}\n\n"
+                          f"Bekleyen rezervasyon başlatıldı.")
 
         return True, f"'{plaka}' plakalı araç başarıyla iade alındı!\nMüşteri: {old_kiralayan}"
 
@@ -182,16 +424,20 @@ class RentalService:
         if not vehicle:
             return False, "Araç bulunamadı!"
 
-        if vehicle.durum == "kirada":
+        if vehicle.durum == VehicleStatus.KIRADA:
             return False, "Kirada olan araç silinemez! Önce iade alınmalıdır."
 
+        if self.data_manager.get_reservations(plaka):
+            return False, "Bekleyen rezervasyonu olan araç silinemez! Önce rezervasyon iptal edilmelidir."
+
         if self.data_manager.remove_vehicle(plaka):
             self.data_manager.save_vehicles()
+            self.calendar.remove_vehicle(plaka)
             return True, f"'{plaka}' plakalı araç başarıyla silindi!"
 
         return False, "Araç silinirken bir hata oluştu!"
 
-    def update_vehicle(self, plaka: str, marka: str, model: str, ucret: str, durum: str) -> Tuple[bool, str]:
+    def update_vehicle(self, plaka: str, marka: str, model: str, ucret: str, durum) -> Tuple[bool, str]:
         vehicle = self.data_manager.get_vehicle_by_plaka(plaka)
         if not vehicle:
             return False, "Araç bulunamadı!"
@@ -209,9 +455,15 @@ class RentalService:
         except ValueError:
             return False, "Günlük ücret geçerli bir sayı olmalıdır!"
 
-        valid_statuses = ["müsait", "kirada", "bakımda"]
-        if durum not in valid_statuses:
-            return False, f"Geçersiz durum! ({', '.join(valid_statuses)})"
+        try:
+            durum = VehicleStatus.parse(durum)
+        except ValueError:
+            return False, f"Geçersiz durum! ({', '.join(status.label for status in VehicleStatus)})"
+
+        if durum != vehicle.durum:
+            # Durumun elle değiştirilmesi (ör. iade almadan müsait yapmak) denetim için kaydedilir
+            self.data_manager.log_event(EVENT_OVERRIDE, plaka, "Durum elle değiştirildi",
+                                        eski=vehicle.durum.label, yeni=durum.label)
 
         self.data_manager.update_vehicle(plaka, {
             'marka': marka.strip(),
@@ -220,29 +472,150 @@ class RentalService:
             'durum': durum
         })
         self.data_manager.save_vehicles()
+        if durum != VehicleStatus.KIRADA:
+            self.calendar.clear_current(plaka)
 
         return True, f"'{plaka}' plakalı araç başarıyla güncellendi!"
 
-    def get_available_vehicles(self) -> List[Vehicle]:
-        return self.data_manager.get_vehicles_by_status("müsait")
-
-    def get_rented_vehicles(self) -> List[Vehicle]:
-        return self.data_manager.get_vehicles_by_status("kirada")
-
-    def get_all_vehicles(self) -> List[Vehicle]:
-        return self.data_manager.get_all_vehicles()
+    @staticmethod
+    def parse_plates(text: str) -> List[str]:
+        """Virgül, noktalı virgül veya satırla ayrılmış plaka listesini (ör. CSV) ayrıştırır.
+
+        Plakalar büyük harfe çevrilir, tekrarlar ve "plaka" başlığı atlanır.
+        """
+        plates = []
+        for line in text.splitlines():
+            for cell in line.replace(';', ',').split(','):
+                plaka = cell.strip().strip('"').upper()
+                if plaka and plaka != "PLAKA" and plaka not in plates:
+                    plates.append(plaka)
+        return plates
+
+    def renew_insurance(self, types, new_date, plates: List[str] = None, days=None) -> Tuple[bool, str, List[str]]:
+        """Sigorta ve/veya kaskoyu toplu yeniler.
+
+        Args:
+            types: 'sigorta' ve/veya 'kasko'
+            new_date: Yeni bitiş tarihi (YYYY-AA-GG veya date)
+            plates: Yenilenecek plakalar
+            days: Bu kadar gün içinde biten (ve süresi geçmiş) kayıtlar
+
+        Returns:
+            tuple: (başarılı mı, mesaj, yenilenen plakalar)
+        """
+        fields = [f"{kind}_bitis" for kind in ('sigorta', 'kasko') if kind in types]
+        if not fields:
+            return False, "Sigorta veya kasko seçilmelidir!", []
 
-    def get_statistics(self) -> dict:
-        all_vehicles = self.get_all_vehicles()
-        rental_history = self.data_manager.get_rental_history()
-
-        total_income = sum(h.toplam_ucret for h in rental_history)
+        try:
+            new_date = self._parse_date(new_date)
+        except (ValueError, AttributeError):
+            return False, "Yeni bitiş tarihi geçersiz! (Formatı: YYYY-AA-GG)", []
+        if new_date <= date.today():
+            return False, "Yeni bitiş tarihi bugünden sonra olmalıdır!", []
+
+        if days is not None:
+            try:
+                days = int(days)
+            except (TypeError, ValueError):
+                return False, "Gün sayısı geçerli bir sayı olmalıdır!", []
+            if days < 0:
+                return False, "Gün sayısı negatif olamaz!", []
+        if plates is not None:
+            plates = [p.strip().upper() for p in plates if p and p.strip()]
+            if not plates:
+                return False, "Plaka listesi boş!", []
+        if plates is None and days is None:
+            return False, "Plaka listesi veya gün sayısı verilmelidir!", []
+
+        renewed = self.data_manager.renew_insurance(fields, new_date, plates, days)
+        kind = " ve ".join(field.split('_')[0].capitalize() for field in fields)
+        msg = f"{len(renewed)} aracın {kind} bitişi {new_date} olarak güncellendi."
+        if plates is not None:
+            skipped = len(plates) - len(renewed)
+            if skipped:
+                # Bulunamayan veya (gün sınırıyla) yenilemeye gerek olmayan plakalar
+                msg += f"\n{skipped} plaka güncellenmedi."
+        return True, msg, renewed
+
+    def find_available(self, start: str, end: str, brand: str = None, max_price: float = None) -> List[Vehicle]:
+        """start-end aralığında kiralanabilecek araçları ücrete göre artan sırada döndürür.
+
+        Süren kiralamalar, sigorta/kasko kapsamı ve ileri tarihli
+        rezervasyonlar birlikte dikkate alınır.
+
+        Raises:
+            ValidationError: Tarihler geçersizse.
+        """
+        try:
+            start, end = self._parse_date(start), self._parse_date(end)
+        except (AttributeError, ValueError):
+            raise ValidationError("Tarihler geçersiz! (Formatı: YYYY-AA-GG)")
+        if end < start:
+            raise ValidationError("Bitiş tarihi başlangıç tarihinden önce olamaz!")
+
+        return self.data_manager.get_vehicles_covering(start, end, brand, max_price)
+
+    def quote_all(self, start: str, end: str, brand: str = None, max_price: float = None) -> List[dict]:
+        """Aralıkta kiralanabilecek tüm araçlar için toplam fiyat teklifi.
+
+        Returns:
+            List[dict]: {'vehicle', 'gun', 'toplam'} toplam fiyata göre artan sırada
+
+        Raises:
+            ValidationError: Tarihler geçersizse.
+        """
+        vehicles = self.find_available(start, end, brand, max_price)
+        start, end = self._parse_date(start), self._parse_date(end)  # find_available doğruladı
+        days = self.calculate_rental_days(start, end)
+        totals = self.pricing.quote_many([v.ucret for v in vehicles], start, end)
+        quotes = [{'vehicle': v, 'gun': days, 'toplam': total} for v, total in zip(vehicles, totals)]
+        quotes.sort(key=lambda q: q['toplam'])
+        return quotes
+
+    def vehicles_insured_through(self, day: date = None) -> set:
+        """Sigorta/kaskosu day (varsayılan bugün) tarihine kadar geçerli araç plakaları.
+
+        Bu kümede olmayan bir araç hiçbir kiralamayı karşılayamaz.
+        """
+        return self.data_manager.vehicles_insured_through(day or date.today())
+
+    def get_available_vehicles(self, columns=None) -> List[Vehicle]:
+        return self.data_manager.get_vehicles_by_status(VehicleStatus.MUSAIT, columns)
+
+    def get_rented_vehicles(self, columns=None) -> List[Vehicle]:
+        return self.data_manager.get_vehicles_by_status(VehicleStatus.KIRADA, columns)
+
+    def get_all_vehicles(self, columns=None) -> List[Vehicle]:
+        return self.data_manager.get_all_vehicles(columns)
+
+    def get_rental_percentiles(self, dimension: str = "marka", quantiles=(0.5, 0.9, 0.99)) -> dict:
+        """Kiralama süresi (gün) ve toplam tutar yüzdeliklerini segment bazında döndürür.
+
+        dimension 'marka' veya 'ay' olabilir. Değerler akış özetlerinden gelir,
+        yaklaşık ve sınırlı hatalıdır.
+        """
+        return self.data_manager.quantiles.percentiles(dimension, quantiles)
+
+    def get_statistics(self, snapshot=None) -> dict:
+        """Filo sayıları ve süren kiralamaların kalan geliri anlık görüntüden,
+        kiralama toplamları gelir küpünden okunur.
+
+        Durum sayıları listedeki gösterimle aynıdır: sigortası/kaskosu bugünü
+        kapsamayan araçlar bakımda sayılır.
+        """
+        if snapshot is None:
+            snapshot = self.data_manager.get_fleet_snapshot()
+        counts = snapshot.display_counts()
+        totals = self.data_manager.revenue_cube.query(group_by=())
+        total = totals[0] if totals else {'adet': 0, 'gelir': 0}
 
         return {
-            'toplam_arac': len(all_vehicles),
-            'musait_arac': len(self.get_available_vehicles()),
-            'kirada_arac': len(self.get_rented_vehicles()),
-            'bakim_arac': len(self.data_manager.get_vehicles_by_status("bakımda")),
-            'toplam_kiralama': len(rental_history),
-            'toplam_gelir': total_income
+            'toplam_arac': len(snapshot),
+            'musait_arac': counts[VehicleStatus.MUSAIT],
+            'kirada_arac': counts[VehicleStatus.KIRADA],
+            'bakim_arac': counts[VehicleStatus.BAKIMDA],
+            'toplam_kiralama': total['adet'],
+            'toplam_gelir': total['gelir'],
+            'beklenen_gelir': snapshot.projected_revenue(),
         }
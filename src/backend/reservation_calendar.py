@@ -0,0 +1,121 @@
+import sqlite3
+from bisect import bisect_right
+
+from src.models.dates import to_date
+from src.models.vehicle_status import VehicleStatus
+
+# Aracın mevcut kiralamasını temsil eden aralık anahtarı
+CURRENT_RENTAL = 'kiralama'
+
+
+def _ordinal(value) -> int:
+    return to_date(value).toordinal()
+
+
+class IntervalIndex:
+    """Tek bir araç için çakışmayan tarih aralıklarının sıralı indeksi.
+
+    Aralıklar çakışmadığı için bitişler de başlangıçlar gibi sıralıdır; bir
+    sorguyla çakışabilecek tek aday, başlangıcı sorgu bitişinden küçük veya
+    eşit olan son aralıktır. Bu yüzden çakışma kontrolü O(log n) sürer.
+    """
+
+    def __init__(self):
+        self._starts = []
+        self._items = []  # (baslangic, bitis, anahtar) başlangıca göre sıralı
+
+    def __len__(self):
+        return len(self._items)
+
+    def find_overlap(self, start: int, end: int):
+        """[start, end] ile çakışan aralığın anahtarını, yoksa None döndürür."""
+        i = bisect_right(self._starts, end) - 1
+        if i >= 0 and self._items[i][1] >= start:
+            return self._items[i][2]
+        return None
+
+    def add(self, start: int, end: int, key):
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._items.insert(i, (start, end, key))
+
+    def remove(self, key):
+        for i, item in enumerate(self._items):
+            if item[2] == key:
+                del self._starts[i]
+                del self._items[i]
+                return
+
+    def items(self):
+        return list(self._items)
+
+
+class ReservationCalendar:
+    """Araç başına aralık indeksleriyle kiralama/rezervasyon takvimi.
+
+    Başlangıçta veritabanındaki bekleyen rezervasyonlar ve süren kiralamalardan
+    kurulur; RentalService her yazma işleminde indeksi günceller. Başka
+    masaların yazdıkları buraya yansımaz, bu yüzden takvim hiçbir isteği
+    reddetmez: karar koşullu SQL ifadelerindedir, takvim sonuca göre
+    güncellenir ve bir istek reddedildiğinde o aracın satırları yeniden okunur.
+    """
+
+    def __init__(self):
+        self._vehicles = {}
+
+    def _index(self, plaka) -> IntervalIndex:
+        index = self._vehicles.get(plaka)
+        if index is None:
+            index = self._vehicles[plaka] = IntervalIndex()
+        return index
+
+    def build(self, data_manager):
+        self._vehicles = {}
+        try:
+            reservations = data_manager.get_reservations()
+        except sqlite3.OperationalError:
+            reservations = []  # Salt okunur eski veritabanında tablo yok
+        for r in reservations:
+            self.add_reservation(r['id'], r['plaka'], r['baslangic_tarihi'], r['bitis_tarihi'])
+
+        for v in data_manager.get_vehicles_by_status(VehicleStatus.KIRADA):
+            if v.baslangic_tarihi and v.bitis_tarihi:
+                self.set_current(v.plaka, v.baslangic_tarihi, v.bitis_tarihi)
+
+    def reload_vehicle(self, data_manager, plaka):
+        """Aracın aralıklarını veritabanından yeniden okur (başka masaların değişiklikleri için)."""
+        self._vehicles.pop(plaka, None)
+        for r in data_manager.get_reservations(plaka):
+            self.add_reservation(r['id'], plaka, r['baslangic_tarihi'], r['bitis_tarihi'])
+        v = data_manager.get_vehicle_by_plaka(plaka)
+        if v and v.durum == VehicleStatus.KIRADA and v.baslangic_tarihi and v.bitis_tarihi:
+            self.set_current(plaka, v.baslangic_tarihi, v.bitis_tarihi)
+
+    def find_conflict(self, plaka, baslangic, bitis):
+        """Çakışan aralığın anahtarını döndürür: rezervasyon id'si, CURRENT_RENTAL veya None."""
+        index = self._vehicles.get(plaka)
+        if index is None:
+            return None
+        return index.find_overlap(_ordinal(baslangic), _ordinal(bitis))
+
+    def is_free(self, plaka, baslangic, bitis) -> bool:
+        return self.find_conflict(plaka, baslangic, bitis) is None
+
+    def add_reservation(self, reservation_id, plaka, baslangic, bitis):
+        self._index(plaka).add(_ordinal(baslangic), _ordinal(bitis), reservation_id)
+
+    def remove_reservation(self, reservation_id, plaka):
+        self._index(plaka).remove(reservation_id)
+
+    def set_current(self, plaka, baslangic, bitis):
+        index = self._index(plaka)
+        index.remove(CURRENT_RENTAL)
+        index.add(_ordinal(baslangic), _ordinal(bitis), CURRENT_RENTAL)
+
+    def clear_current(self, plaka):
+        index = self._vehicles.get(plaka)
+        if index is not None:
+            index.remove(CURRENT_RENTAL)
+
+    def remove_vehicle(self, plaka):
+        self._vehicles.pop(plaka, None)
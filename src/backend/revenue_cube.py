@@ -0,0 +1,162 @@
+from src.models.dates import to_date, month_key
+from src.backend.customer_index import customer_key
+
+# Küpün boyutları ve dönem gruplamaları; 'kiralayan' boyutu musteri_id ile
+# gruplanır ve müşterinin kayıtlı adıyla gösterilir
+CUBE_DIMENSIONS = ('plaka', 'kiralayan', 'donem')
+CUBE_PERIODS = {
+    'month': "ay",
+    'quarter': "substr(ay, 1, 4) || '-Q' || ((CAST(substr(ay, 6, 2) AS INTEGER) + 2) / 3)",
+    'year': "substr(ay, 1, 4)",
+}
+
+# rental_history'den küp satırlarını üreten sorgu (yeniden oluşturma ve
+# küp tablosu olmayan salt okunur veritabanları için). Ay ve gün, artımlı
+# yolla aynı sonucu vermesi için RevenueCube'un Python fonksiyonlarıyla hesaplanır.
+_HISTORY_AGGREGATE = """
+    SELECT plaka,
+           COALESCE(musteri_id, 0) AS musteri_id,
+           kiralama_ayi(baslangic_tarihi) AS ay,
+           COUNT(*) AS adet,
+           SUM(kiralama_gunu(baslangic_tarihi, bitis_tarihi)) AS gun,
+           COALESCE(SUM(toplam_ucret), 0) AS gelir
+    FROM rental_history
+    GROUP BY plaka, COALESCE(musteri_id, 0), kiralama_ayi(baslangic_tarihi)
+"""
+
+
+class RevenueCube:
+    """Plaka × müşteri × ay boyutlarında önceden toplanmış gelir küpü.
+
+    Müşteri boyutu musteri_id'dir (müşterisiz kayıtlar için 0); aynı kişinin
+    farklı yazımları tek hücrede toplanır. Her hücre adet, gün ve gelir ölçülerini tutar. Kiralama geçmişine yazılan
+    her kayıt ilgili hücreyi artırır; böylece kırılım sorguları rental_history
+    yerine çok daha küçük olan küp üzerinden yanıtlanır.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        conn.create_function("kiralama_ayi", 1, self.rental_month, deterministic=True)
+        conn.create_function("kiralama_gunu", 2, self.rental_days, deterministic=True)
+
+    def _columns(self):
+        return {row[1] for row in self.conn.execute("PRAGMA table_info(revenue_cube)")}
+
+    def create_table(self):
+        # Serbest metin kiralayan ile anahtarlanmış eski küp musteri_id ile yeniden kurulur
+        if 'kiralayan' in self._columns():
+            self.conn.execute("DROP TABLE revenue_cube")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS revenue_cube
+            (
+                plaka TEXT NOT NULL,
+                musteri_id INTEGER NOT NULL,
+                ay TEXT NOT NULL,
+                adet INTEGER NOT NULL DEFAULT 0,
+                gun INTEGER NOT NULL DEFAULT 0,
+                gelir REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (plaka, musteri_id, ay)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_revenue_cube_ay ON revenue_cube (ay)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_revenue_cube_musteri ON revenue_cube (musteri_id)")
+
+        # İlk kurulumda mevcut geçmişten doldur
+        empty = self.conn.execute("SELECT 1 FROM revenue_cube LIMIT 1").fetchone() is None
+        has_history = self.conn.execute("SELECT 1 FROM rental_history LIMIT 1").fetchone() is not None
+        if empty and has_history:
+            self.rebuild()
+
+    def rebuild(self):
+        """Küpü rental_history'den sıfırdan oluşturur (commit çağırana aittir)."""
+        self.conn.execute("DELETE FROM revenue_cube")
+        self.conn.execute(f"""
+            INSERT INTO revenue_cube (plaka, musteri_id, ay, adet, gun, gelir)
+            SELECT plaka, musteri_id, ay, adet, gun, gelir FROM ({_HISTORY_AGGREGATE})
+        """)
+
+    @staticmethod
+    def rental_month(baslangic) -> str:
+        try:
+            return month_key(baslangic)
+        except (TypeError, ValueError):
+            return str(baslangic or '')[:7]
+
+    @staticmethod
+    def rental_days(baslangic, bitis) -> int:
+        try:
+            days = (to_date(bitis) - to_date(baslangic)).days + 1
+            return max(1, days)
+        except (TypeError, ValueError):
+            return 1
+
+    def add(self, h, musteri_id=None):
+        """Tek bir kiralama geçmişi kaydını küpe işler (commit çağırana aittir)."""
+        self.conn.execute("""
+            INSERT INTO revenue_cube (plaka, musteri_id, ay, adet, gun, gelir)
+            VALUES (?, ?, ?, 1, ?, ?)
+            ON CONFLICT (plaka, musteri_id, ay) DO UPDATE SET
+                adet = adet + 1,
+                gun = gun + excluded.gun,
+                gelir = gelir + excluded.gelir
+        """, (
+            h.plaka, musteri_id or 0, self.rental_month(h.baslangic_tarihi),
+            self.rental_days(h.baslangic_tarihi, h.bitis_tarihi), h.toplam_ucret or 0
+        ))
+
+    def _source(self):
+        # Küp tablosu olmayan veya eski küplü salt okunur veritabanlarında geçmişten toplanır
+        return "revenue_cube" if 'musteri_id' in self._columns() else f"({_HISTORY_AGGREGATE})"
+
+    def query(self, group_by=('plaka',), period: str = 'month', plaka: str = None,
+              kiralayan: str = None, start_month: str = None, end_month: str = None):
+        """Küpü istenen boyutlara göre toplar (roll-up) ve filtreler (slice).
+
+        Args:
+            group_by: CUBE_DIMENSIONS içinden boyutlar; boşsa genel toplam.
+            period: 'donem' boyutu için 'month', 'quarter' veya 'year'.
+            plaka: Sadece bu araca ait hücreler.
+            kiralayan: Sadece bu müşteriye (yazımından bağımsız) ait hücreler.
+            start_month, end_month: 'YYYY-AA' biçiminde kapsayıcı ay aralığı.
+
+        Returns:
+            list: [{boyut: değer, ..., 'adet', 'gun', 'gelir'}, ...] gelire göre azalan
+        """
+        for dim in group_by:
+            if dim not in CUBE_DIMENSIONS:
+                raise ValueError(f"Geçersiz boyut: {dim}")
+        if period not in CUBE_PERIODS:
+            raise ValueError(f"Geçersiz dönem: {period}")
+
+        expressions = {'plaka': "k.plaka", 'kiralayan': "COALESCE(m.ad, '')", 'donem': CUBE_PERIODS[period]}
+        groups = {'plaka': "k.plaka", 'kiralayan': "k.musteri_id", 'donem': "donem"}
+        select = [f"{expressions[dim]} AS {dim}" for dim in group_by]
+
+        conditions = []
+        params = []
+        if plaka is not None:
+            conditions.append("k.plaka = ?")
+            params.append(plaka)
+        if kiralayan is not None:
+            conditions.append("k.musteri_id = COALESCE((SELECT id FROM customers WHERE anahtar = ?), 0)")
+            params.append(customer_key(kiralayan))
+        if start_month:
+            conditions.append("ay >= ?")
+            params.append(start_month)
+        if end_month:
+            conditions.append("ay <= ?")
+            params.append(end_month)
+
+        query = f"SELECT {', '.join(select + ['SUM(adet) AS adet', 'SUM(gun) AS gun', 'SUM(gelir) AS gelir'])}"
+        query += f" FROM {self._source()} k"
+        if 'kiralayan' in group_by:
+            query += " LEFT JOIN customers m ON m.id = k.musteri_id"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if group_by:
+            query += " GROUP BY " + ", ".join(groups[dim] for dim in group_by)
+        query += " ORDER BY gelir DESC"
+
+        c = self.conn.execute(query, params)
+        columns = [d[0] for d in c.description]
+        return [dict(zip(columns, row)) for row in c.fetchall() if row[-3] is not None]
@@ -0,0 +1,150 @@
+from datetime import date
+
+from src.models.dates import to_date
+
+
+class FenwickTree:
+    """Önek toplamları için Fenwick (Binary Indexed) ağacı.
+
+    add ve prefix işlemleri O(log n) sürer.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    @classmethod
+    def from_values(cls, values):
+        """Değer listesinden O(n) sürede ağaç kurar."""
+        fenwick = cls(len(values))
+        tree = fenwick.tree
+        for i, value in enumerate(values, 1):
+            tree[i] += value
+            parent = i + (i & -i)
+            if parent <= fenwick.size:
+                tree[parent] += tree[i]
+        return fenwick
+
+    def add(self, index: int, delta):
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index: int):
+        """0..index (dahil) aralığının toplamı."""
+        total = 0
+        i = min(index, self.size - 1) + 1
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def range_sum(self, lo: int, hi: int):
+        if hi < lo:
+            return 0
+        return self.prefix(hi) - (self.prefix(lo - 1) if lo > 0 else 0)
+
+
+class RevenueIndex:
+    """Başlangıç tarihine göre kümülatif kiralama sayısı ve gelir indeksi.
+
+    İlk sorguda rental_history'den günlük toplamlarla kurulur. Sonraki her
+    sorgu önce MAX(id)'ye bakar ve son kurulumdan beri eklenen kayıtları
+    (başka masalarınkiler dahil) id sırasıyla artımlı ekler; rental_history
+    AUTOINCREMENT olduğundan id'ler tekrar kullanılmaz. Aralık dışına düşen
+    bir kayıt gelirse indeks baştan kurulur.
+    """
+
+    # Yeni kayıtların yeniden kurulum gerektirmeden eklenebilmesi için
+    # son tarihten sonra ayrılan gün sayısı
+    HEADROOM_DAYS = 366
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._built = False
+        self._last_id = 0  # İndekse işlenmiş en büyük rental_history.id
+        self._origin = 0
+        self._counts = None
+        self._revenue = None
+
+    def invalidate(self):
+        self._built = False
+
+    def _max_id(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM rental_history").fetchone()[0]
+
+    def _build(self):
+        # Toplamlar sabit bir id sınırına kadar okunur; arada eklenenler _catch_up'a kalır
+        self._last_id = self._max_id()
+        c = self.conn.execute("""
+            SELECT substr(baslangic_tarihi, 1, 10), COUNT(*), COALESCE(SUM(toplam_ucret), 0)
+            FROM rental_history
+            WHERE id <= ?
+            GROUP BY 1
+        """, (self._last_id,))
+        daily = []
+        for day, count, revenue in c.fetchall():
+            try:
+                daily.append((date.fromisoformat(day).toordinal(), count, revenue))
+            except (TypeError, ValueError):
+                continue  # Geçersiz tarihli kayıtlar indekslenmez
+
+        if daily:
+            self._origin = min(d[0] for d in daily)
+            last = max(d[0] for d in daily)
+        else:
+            self._origin = last = date.today().toordinal()
+
+        size = last - self._origin + 1 + self.HEADROOM_DAYS
+        counts = [0] * size
+        revenue = [0] * size
+        for ordinal, count, total in daily:
+            counts[ordinal - self._origin] += count
+            revenue[ordinal - self._origin] += total
+
+        self._counts = FenwickTree.from_values(counts)
+        self._revenue = FenwickTree.from_values(revenue)
+        self._built = True
+
+    def _catch_up(self):
+        """Son okumadan beri eklenen kayıtları indekse işler."""
+        last_id = self._max_id()
+        if last_id <= self._last_id:
+            return
+        c = self.conn.execute(
+            "SELECT baslangic_tarihi, toplam_ucret FROM rental_history WHERE id > ? AND id <= ?",
+            (self._last_id, last_id)
+        )
+        self._last_id = last_id
+        for baslangic_tarihi, toplam_ucret in c.fetchall():
+            try:
+                index = to_date(baslangic_tarihi).toordinal() - self._origin
+            except (AttributeError, ValueError):
+                continue  # Geçersiz tarihli kayıtlar indekslenmez
+            if not 0 <= index < self._counts.size:
+                self._build()
+                return
+            self._counts.add(index, 1)
+            self._revenue.add(index, toplam_ucret or 0)
+
+    def between(self, start, end):
+        """start ile end (dahil) arasında başlayan kiralamaların sayısı ve geliri.
+
+        start ve end date ya da YYYY-AA-GG metni olabilir.
+
+        Raises:
+            ValueError: Tarihler YYYY-AA-GG biçiminde değilse.
+        """
+        start, end = to_date(start), to_date(end)
+        if start is None or end is None:
+            raise ValueError("Başlangıç ve bitiş tarihi gerekli")
+        lo, hi = start.toordinal(), end.toordinal()
+        if not self._built:
+            self._build()
+        else:
+            self._catch_up()
+
+        lo = max(lo - self._origin, 0)
+        hi = min(hi - self._origin, self._counts.size - 1)
+        return self._counts.range_sum(lo, hi), self._revenue.range_sum(lo, hi)
@@ -0,0 +1,28 @@
+from datetime import date, datetime
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def to_date(value):
+    """date, datetime veya YYYY-AA-GG metnini datetime.date'e çevirir.
+
+    Sıfır doldurulmamış eski kayıtlar (ör. 2026-1-5) da kabul edilir. Boş
+    değerler için None döner; geçersiz metinde ValueError fırlatır.
+    """
+    if value is None or type(value) is date:
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return datetime.strptime(value.split()[0], DATE_FORMAT).date()
+
+
+def month_key(value) -> str:
+    """Tarihin 'YYYY-AA' biçimindeki ay anahtarı."""
+    d = to_date(value)
+    return f"{d.year:04d}-{d.month:02d}" if d else ""
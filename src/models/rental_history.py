@@ -1,10 +1,36 @@
 from dataclasses import dataclass
+from sys import intern
+from datetime import date
 
-@dataclass
+from src.models.dates import to_date
+
+# rental_history tablosundan okurken kullanılan sütun sırası (RentalHistory.from_row)
+HISTORY_COLUMNS = ('plaka', 'kiralayan', 'baslangic_tarihi', 'bitis_tarihi',
+                   'toplam_ucret', 'iade_tarihi')
+
+@dataclass(slots=True)
 class RentalHistory:
     plaka: str
     kiralayan: str
-    baslangic_tarihi: str
-    bitis_tarihi: str
+    baslangic_tarihi: date
+    bitis_tarihi: date
     toplam_ucret: float
-    iade_tarihi: str
+    iade_tarihi: date
+
+    def __post_init__(self):
+        # Metin olarak verilen tarihler (ör. arayüzden) bir kez date'e çevrilir
+        self.baslangic_tarihi = to_date(self.baslangic_tarihi)
+        self.bitis_tarihi = to_date(self.bitis_tarihi)
+        self.iade_tarihi = to_date(self.iade_tarihi)
+
+    @classmethod
+    def from_row(cls, row):
+        """HISTORY_COLUMNS sırasındaki bir veritabanı satırından kayıt oluşturur.
+
+        to_date atlanır; plaka ve müşteri adı çok tekrarlandığından intern edilir.
+        """
+        h = cls.__new__(cls)
+        plaka, kiralayan, h.baslangic_tarihi, h.bitis_tarihi, h.toplam_ucret, h.iade_tarihi = row
+        h.plaka = intern(plaka) if plaka else plaka
+        h.kiralayan = intern(kiralayan) if kiralayan else kiralayan
+        return h
@@ -0,0 +1,55 @@
+from collections import namedtuple
+from dataclasses import fields
+from sys import intern
+
+
+def make_view(model, columns, key, loader, converters=None, interned=()):
+    """model için yalnızca columns sütunlarını taşıyan hafif satır sınıfı üretir.
+
+    Dönen sınıf bir namedtuple alt sınıfıdır: satır başına tek tuple ayrılır,
+    sqlite3'ün döndürdüğü düz satır doğrudan _make ile sarılır. Projeksiyonda
+    olmayan bir model alanına erişilirse tam nesne key sütunuyla loader'dan
+    yüklenir (tuple olduğu için önbelleğe alınmaz; birden fazla ek alan
+    gerekiyorsa materialize() bir kez çağrılmalıdır).
+
+    Args:
+        model: Vehicle veya RentalHistory gibi dataclass
+        columns: Sütun adları; key ilk sıradadır
+        key: Tam nesneyi bulmak için kullanılan sütun (plaka, id)
+        loader: key değerinden tam nesneyi döndüren fonksiyon
+        converters: {sütun: fonksiyon}; ham değer okunurken çevrilir (ör. durum kodu)
+        interned: Çok tekrarlanan metin sütunları; from_row'da intern edilir
+    """
+    base = namedtuple(f"{model.__name__}View", columns)
+    model_fields = frozenset(f.name for f in fields(model))
+    key_index = columns.index(key)
+
+    def materialize(self):
+        """Satırın tam model nesnesini veritabanından yükler."""
+        return loader(tuple.__getitem__(self, key_index))
+
+    def __getattr__(self, name):
+        # Yalnızca projeksiyon dışındaki alanlar buraya düşer
+        if name in model_fields:
+            return getattr(self.materialize(), name)
+        raise AttributeError(f"{type(self).__name__} nesnesinde '{name}' yok")
+
+    intern_at = [i for i, name in enumerate(columns) if name in interned]
+    new = tuple.__new__
+
+    def from_row(cls, row):
+        """Düz veritabanı satırından görünüm; tekrarlanan metinler paylaşılır."""
+        if intern_at:
+            row = list(row)
+            for i in intern_at:
+                if row[i]:
+                    row[i] = intern(row[i])
+        return new(cls, row)
+
+    namespace = {'__slots__': (), 'materialize': materialize, '__getattr__': __getattr__,
+                 'from_row': classmethod(from_row), 'model': model}
+    for name, convert in (converters or {}).items():
+        if name in columns:
+            i = columns.index(name)
+            namespace[name] = property(lambda self, i=i, convert=convert: convert(tuple.__getitem__(self, i)))
+    return type(base.__name__, (base,), namespace)
@@ -1,26 +1,51 @@
 from dataclasses import dataclass
+from sys import intern
+from datetime import date
 
-@dataclass
+from src.models.dates import to_date
+from src.models.vehicle_status import VehicleStatus, STATUS_BY_CODE
+
+# vehicles tablosundan okurken kullanılan sütun sırası (Vehicle.from_row)
+VEHICLE_COLUMNS = ('plaka', 'marka', 'model', 'ucret', 'durum', 'kiralayan',
+                   'baslangic_tarihi', 'bitis_tarihi', 'sigorta_bitis', 'kasko_bitis')
+
+@dataclass(slots=True)
 class Vehicle:
     plaka: str
     marka: str
     model: str
     ucret: float
-    durum: str
+    durum: VehicleStatus
     kiralayan: str | None
-    baslangic_tarihi: str | None
-    bitis_tarihi: str | None
-    sigorta_bitis: str | None
-    kasko_bitis: str | None
+    baslangic_tarihi: date | None
+    bitis_tarihi: date | None
+    sigorta_bitis: date | None
+    kasko_bitis: date | None
 
-    def __init__(self, plaka: str, marka: str, model: str, ucret: float, durum: str = "müsait", kiralayan: str | None = None, baslangic_tarihi: str | None = None, bitis_tarihi: str | None = None, sigorta_bitis: str | None = None, kasko_bitis: str | None = None):
+    def __init__(self, plaka: str, marka: str, model: str, ucret: float, durum: VehicleStatus | str = VehicleStatus.MUSAIT, kiralayan: str | None = None, baslangic_tarihi: date | str | None = None, bitis_tarihi: date | str | None = None, sigorta_bitis: date | str | None = None, kasko_bitis: date | str | None = None):
         self.plaka = plaka
         self.marka = marka
         self.model = model
         self.ucret = ucret
-        self.durum = durum
+        self.durum = VehicleStatus.parse(durum)
         self.kiralayan = kiralayan
-        self.baslangic_tarihi = baslangic_tarihi
-        self.bitis_tarihi = bitis_tarihi
-        self.sigorta_bitis = sigorta_bitis
-        self.kasko_bitis = kasko_bitis
\ No newline at end of file
+        self.baslangic_tarihi = to_date(baslangic_tarihi)
+        self.bitis_tarihi = to_date(bitis_tarihi)
+        self.sigorta_bitis = to_date(sigorta_bitis)
+        self.kasko_bitis = to_date(kasko_bitis)
+
+    @classmethod
+    def from_row(cls, row):
+        """VEHICLE_COLUMNS sırasındaki bir veritabanı satırından araç oluşturur.
+
+        Tarihler sqlite3 dönüştürücüsüyle zaten date olarak geldiğinden
+        __init__'teki to_date dönüşümleri atlanır; durum kodu tablodan üyeye
+        çevrilir, tekrarlanan marka ve model metinleri intern edilir.
+        """
+        v = cls.__new__(cls)
+        (v.plaka, marka, model, v.ucret, durum, v.kiralayan,
+         v.baslangic_tarihi, v.bitis_tarihi, v.sigorta_bitis, v.kasko_bitis) = row
+        v.marka = intern(marka) if marka else marka
+        v.model = intern(model) if model else model
+        v.durum = STATUS_BY_CODE[durum]
+        return v
@@ -0,0 +1,44 @@
+from enum import IntEnum
+
+
+class VehicleStatus(IntEnum):
+    """Araç durumu.
+
+    Veritabanında küçük tamsayı kod olarak saklanır (durumlar tablosu ve
+    vehicles.durum CHECK kısıtı); arayüzde Türkçe etiketiyle gösterilir.
+    """
+    MUSAIT = 0
+    KIRADA = 1
+    BAKIMDA = 2
+
+    @property
+    def label(self) -> str:
+        return _LABELS[self]
+
+    @classmethod
+    def parse(cls, value, default=None) -> "VehicleStatus":
+        """Kod, üye veya Türkçe etiketten (büyük/küçük harf duyarsız) durum döndürür.
+
+        Raises:
+            ValueError: Tanımsız kod veya etiket (default verilmediyse)
+        """
+        try:
+            if isinstance(value, str):
+                return _BY_LABEL[value.strip().lower()]
+            return cls(value)
+        except (KeyError, ValueError):
+            if default is not None:
+                return default
+            raise ValueError(f"Geçersiz durum: {value}") from None
+
+
+_LABELS = {
+    VehicleStatus.MUSAIT: "müsait",
+    VehicleStatus.KIRADA: "kirada",
+    VehicleStatus.BAKIMDA: "bakımda",
+}
+_BY_LABEL = {label: status for status, label in _LABELS.items()}
+
+# Veritabanından okunan kodu üyeye çevirmek için (VehicleStatus(kod)'dan hızlı)
+STATUS_BY_CODE = tuple(VehicleStatus)
+STATUS_LABELS = tuple(_LABELS.values())
@@ -0,0 +1,176 @@
+"""Tkinter/matplotlib yüklemeden çalışan raporlama komut satırı aracı.
+
+Kullanım:
+    python -m src.reports [--db car_rental.db] [--format text|json]
+                          [--period day|month|year] [--days 30]
+                          [--section stats revenue expiry overdue percentiles]
+                          [--breakdown plaka kiralayan donem]
+"""
+import argparse
+import json
+import os
+import sys
+
+# DataManager ve RentalService (journal, olay kaydı, kimlik bilgileri, fiyatlama)
+# sadece rapor üretilirken yüklenir; --help ve hatalı argümanlar anında döner
+from src.backend.revenue_cube import CUBE_DIMENSIONS, CUBE_PERIODS
+
+SECTIONS = ('stats', 'revenue', 'expiry', 'overdue', 'percentiles')
+PERCENTILES = (0.5, 0.9, 0.99)
+DEFAULT_DB = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "car_rental.db"))
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m src.reports",
+                                     description="Araç kiralama raporları (salt okunur)")
+    parser.add_argument("--db", default=DEFAULT_DB, help="SQLite veritabanı yolu")
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("--period", choices=("day", "month", "quarter", "year"), default="month",
+                        help="Gelir raporu ve kırılım dönemi")
+    parser.add_argument("--days", type=int, default=30,
+                        help="Sigorta/kasko bitişi için gün eşiği")
+    parser.add_argument("--section", nargs="+", choices=SECTIONS,
+                        help="Yazdırılacak bölümler (varsayılan: hepsi, --breakdown ile hiçbiri)")
+    parser.add_argument("--breakdown", nargs="*", choices=CUBE_DIMENSIONS,
+                        help="Gelir küpünden kırılım (ör. --breakdown plaka donem)")
+    parser.add_argument("--segment", choices=("marka", "ay"), default="marka",
+                        help="Yüzdelik raporu segmenti")
+    parser.add_argument("--plaka", help="Kırılımı tek bir plakaya daralt")
+    parser.add_argument("--kiralayan", help="Kırılımı tek bir müşteriye daralt")
+    args = parser.parse_args(argv)
+    if args.breakdown is not None and args.period not in CUBE_PERIODS:
+        parser.error("Kırılım için dönem month, quarter veya year olmalı")
+    if args.section is None:
+        args.section = [] if args.breakdown is not None else list(SECTIONS)
+    return args
+
+
+def build_report(service, sections, period="month", days=30,
+                 breakdown=None, plaka=None, kiralayan=None, segment="marka") -> dict:
+    """İstenen bölümleri JSON'a çevrilebilir bir sözlük olarak toplar.
+
+    service bir RentalService örneğidir.
+    """
+    dm = service.data_manager
+    report = {}
+
+    if breakdown is not None:
+        report['breakdown'] = dm.revenue_cube.query(
+            group_by=tuple(breakdown), period=period, plaka=plaka, kiralayan=kiralayan)
+
+    if 'stats' in sections:
+        report['stats'] = service.get_statistics()
+
+    if 'revenue' in sections:
+        report['revenue'] = [
+            {'donem': donem, 'islem': adet, 'gelir': gelir}
+            for donem, adet, gelir in dm.get_revenue_by_period(period)
+        ]
+
+    if 'expiry' in sections:
+        expiry = dm.get_expiring_vehicles(days)
+        report['expiry'] = {
+            key: [{'plaka': item['vehicle'].plaka, 'tur': item['type'], 'tarih': item['date']}
+                  for item in items]
+            for key, items in expiry.items()
+        }
+
+    if 'overdue' in sections:
+        report['overdue'] = [
+            {'plaka': v.plaka, 'kiralayan': v.kiralayan, 'bitis_tarihi': v.bitis_tarihi}
+            for v in dm.get_overdue_rentals()
+        ]
+
+    if 'percentiles' in sections:
+        report['percentiles'] = service.get_rental_percentiles(segment, PERCENTILES)
+
+    return report
+
+
+def format_text(report: dict) -> str:
+    lines = []
+
+    if 'breakdown' in report:
+        lines.append("== Gelir Kırılımı ==")
+        for row in report['breakdown']:
+            dims = "  ".join(f"{str(row[d]):<14}" for d in CUBE_DIMENSIONS if d in row)
+            lines.append(f"{dims} {row['adet']:>6} işlem {row['gun']:>7} gün  {row['gelir']:>14,.2f} TL")
+        if not report['breakdown']:
+            lines.append("Kayıt yok")
+        lines.append("")
+
+    if 'stats' in report:
+        s = report['stats']
+        lines += [
+            "== Filo İstatistikleri ==",
+            f"Toplam araç     : {s['toplam_arac']}",
+            f"Müsait          : {s['musait_arac']}",
+            f"Kirada          : {s['kirada_arac']}",
+            f"Bakımda         : {s['bakim_arac']}",
+            f"Toplam kiralama : {s['toplam_kiralama']}",
+            f"Toplam gelir    : {s['toplam_gelir']:,.2f} TL",
+            f"Beklenen gelir  : {s['beklenen_gelir']:,.2f} TL (süren kiralamalar)",
+            "",
+        ]
+
+    if 'revenue' in report:
+        lines.append("== Dönemlik Gelir ==")
+        for r in report['revenue']:
+            lines.append(f"{r['donem']:<10} {r['islem']:>6} işlem  {r['gelir']:>14,.2f} TL")
+        if not report['revenue']:
+            lines.append("Kayıt yok")
+        lines.append("")
+
+    if 'expiry' in report:
+        lines.append("== Sigorta / Kasko ==")
+        for key, title in (('expired', "Süresi geçen"), ('expiring_soon', "Yaklaşan")):
+            items = report['expiry'].get(key, [])
+            lines.append(f"{title}: {len(items)}")
+            for item in items:
+                lines.append(f"  {item['plaka']:<12} {item['tur']:<8} {item['tarih']}")
+        lines.append("")
+
+    if 'overdue' in report:
+        lines.append("== Gecikmiş İadeler ==")
+        for item in report['overdue']:
+            lines.append(f"{item['plaka']:<12} {item['kiralayan'] or '—':<20} {item['bitis_tarihi']}")
+        if not report['overdue']:
+            lines.append("Gecikmiş iade yok")
+        lines.append("")
+
+    if 'percentiles' in report:
+        lines.append("== Süre / Tutar Yüzdelikleri (p50 / p90 / p99) ==")
+        for name, values in report['percentiles'].items():
+            days = " / ".join(f"{d:.0f}" for d in values['gun'])
+            costs = " / ".join(f"{u:,.0f}" for u in values['ucret'])
+            lines.append(f"{name:<14} {values['adet']:>6} adet  gün {days:<12} tutar {costs} TL")
+        if not report['percentiles']:
+            lines.append("Kayıt yok")
+        lines.append("")
+
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Veritabanı bulunamadı: {args.db}", file=sys.stderr)
+        return 1
+
+    from src.backend.data_manager import DataManager
+    from src.backend.rental_service import RentalService
+
+    dm = DataManager(args.db, read_only=True)
+    try:
+        report = build_report(RentalService(dm), args.section, args.period, args.days,
+                              args.breakdown, args.plaka, args.kiralayan, args.segment)
+    finally:
+        dm.conn.close()
+
+    if args.format == "json":
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2, default=str)
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(format_text(report))
+    return 0
@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import messagebox
 from src.backend.data_manager import DataManager
+from src.backend.credentials import AuthWorker
+from src.models.user import User
 from constants import COLORS
 
 class AuthWindow(tk.Toplevel):
@@ -18,6 +20,9 @@ class AuthWindow(tk.Toplevel):
         self.username = tk.StringVar()
         self.password = tk.StringVar()
         self.role = tk.StringVar(value="user")
+        # Parola özetleme arka planda yapılır; ana döngü girişte donmaz
+        self.worker = AuthWorker(root)
+        self._busy = False
 
         self._build()
 
@@ -32,7 +37,7 @@ class AuthWindow(tk.Toplevel):
         tk.Entry(frame, textvariable=self.password, show="*", bg='#2d2d3f', fg=COLORS['text_primary'], insertbackground=COLORS['text_primary']).pack(fill="x")
 
         # Giriş butonu (Label tabanlı - macOS uyumlu)
-        login_btn = tk.Label(frame, text="Giriş Yap", bg=COLORS['accent'], fg=COLORS['text_primary'],
+        self.login_btn = login_btn = tk.Label(frame, text="Giriş Yap", bg=COLORS['accent'], fg=COLORS['text_primary'],
                             font=("Helvetica", 11, "bold"), pady=8, cursor="hand2")
         login_btn.pack(fill="x", pady=(15, 5))
         login_btn.bind("<Button-1>", lambda e: self.login())
@@ -49,7 +54,14 @@ class AuthWindow(tk.Toplevel):
         exit_btn.pack(fill="x", pady=5)
         exit_btn.bind("<Button-1>", lambda e: self._exit_app())
 
+    def _set_busy(self, busy):
+        self._busy = busy
+        self.login_btn.config(text="Kontrol ediliyor..." if busy else "Giriş Yap",
+                              cursor="watch" if busy else "hand2")
+
     def login(self):
+        if self._busy:
+            return
         username = self.username.get().strip()
         password = self.password.get().strip()
 
@@ -57,16 +69,42 @@ class AuthWindow(tk.Toplevel):
             messagebox.showerror("Hata", "Kullanıcı adı ve şifre boş olamaz")
             return
 
-        user = self.dm.authenticate_user(username, password)
-
-        if not user:
+        # Veritabanı okuması ana iş parçacığında, KDF iş parçacığında yapılır
+        hasher = self.dm.hasher
+        credentials = self.dm.get_credentials(username)
+        self._set_busy(True)
+        if credentials is None:
+            self.worker.submit(hasher.dummy_verify, password,
+                               callback=lambda result: self._on_verified(None, password, result),
+                               errback=self._on_login_error)
+        else:
+            stored, role = credentials
+            self.worker.submit(hasher.verify, password, stored,
+                               callback=lambda result: self._on_verified(User(username, role), password, result),
+                               errback=self._on_login_error)
+
+    def _on_login_error(self, error):
+        # KDF hatası başarısız giriş sayılır; form kilitli kalmaz
+        self._on_verified(None, None, (False, False))
+
+    def _on_verified(self, user, password, result):
+        ok, needs_rehash = result
+        if not ok:
+            self._set_busy(False)
             messagebox.showerror("Hata", "Kullanıcı adı veya şifre yanlış")
             return
 
+        if needs_rehash:
+            # Düz metin veya eski parametreli kayıt; yeni özet girişi bekletmeden yazılır
+            self.worker.submit(self.dm.hasher.hash, password,
+                               callback=lambda password_hash: self.dm.set_password_hash(user.username, password_hash))
+
         self.destroy()
         self.on_success(user)
 
     def register(self):
+        if self._busy:
+            return
         username = self.username.get().strip()
         password = self.password.get().strip()
 
@@ -74,13 +112,24 @@ class AuthWindow(tk.Toplevel):
             messagebox.showerror("Hata", "Bu kullanıcı adı zaten var")
             return
 
-        ok = self.dm.create_user(username, password, "user")
+        self._set_busy(True)
+        self.worker.submit(self.dm.hasher.hash, password,
+                           callback=lambda password_hash: self._on_registered(username, password_hash),
+                           errback=self._on_register_error)
+
+    def _on_registered(self, username, password_hash):
+        self._set_busy(False)
+        ok = self.dm.create_user(username, password_hash, "user")
 
         if ok:
             messagebox.showinfo("Başarılı", "Kayıt tamamlandı, giriş yapabilirsiniz")
         else:
             messagebox.showerror("Hata", "Kayıt başarısız")
 
+    def _on_register_error(self, error):
+        self._set_busy(False)
+        messagebox.showerror("Hata", "Kayıt başarısız")
+
     def _exit_app(self):
         """Uygulamadan Çıkış"""
         if messagebox.askyesno("Çıkış", "Uygulamadan çıkmak istiyor musunuz?"):
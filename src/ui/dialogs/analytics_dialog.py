@@ -27,11 +27,13 @@ class AnalyticsDialog(tk.Toplevel):
         tk.Label(main, text="📊 Son 30 Günlük Toplam Gelir Grafiği", font=(FONT_FAMILY, 18, "bold"),
                  bg=COLORS['bg_primary'], fg=COLORS['text_primary']).pack(pady=(0, 20))
 
-        history = self.dm.get_rental_history()
+        history = self.dm.get_rental_history(('baslangic_tarihi', 'toplam_ucret'))
         daily_data = {}
 
         for h in history:
-            day = h.baslangic_tarihi[:10]
+            if h.baslangic_tarihi is None:
+                continue
+            day = h.baslangic_tarihi.isoformat()
             daily_data[day] = daily_data.get(day, 0) + h.toplam_ucret
 
         if not daily_data:
@@ -0,0 +1,156 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from datetime import datetime, timedelta
+
+from constants import COLORS, FONT_FAMILY
+from src.ui.styled_button import StyledButton
+
+
+class BulkRenewalDialog(tk.Toplevel):
+    """Sigorta/Kasko toplu yenileme diyalogu.
+
+    Araçlar ya "N gün içinde bitenler" ya da plaka listesi (elle veya CSV'den)
+    ile seçilir; doğrulama ve yazma RentalService.renew_insurance'a bırakılır.
+    """
+
+    def __init__(self, parent, parse_plates):
+        super().__init__(parent)
+        self.title("Toplu Yenileme")
+        self.geometry("480x560")
+        self.resizable(True, True)
+        self.minsize(440, 520)
+        self.transient(parent)
+        self.grab_set()
+
+        self.configure(bg=COLORS['bg_primary'])
+        self.parse_plates = parse_plates
+        self.result = None
+        self._create_widgets()
+        self._center_window()
+
+    def _center_window(self):
+        self.update_idletasks()
+        x = (self.winfo_screenwidth() // 2) - (self.winfo_width() // 2)
+        y = (self.winfo_screenheight() // 2) - (self.winfo_height() // 2)
+        self.geometry(f"+{x}+{y}")
+
+    def _entry(self, parent, default):
+        entry = tk.Entry(parent, font=(FONT_FAMILY, 12),
+                         bg=COLORS['bg_secondary'], fg=COLORS['text_primary'],
+                         insertbackground=COLORS['text_primary'], relief='flat',
+                         highlightthickness=2, highlightbackground=COLORS['bg_card'],
+                         highlightcolor=COLORS['accent'])
+        entry.insert(0, default)
+        return entry
+
+    def _check(self, parent, text, variable):
+        return tk.Checkbutton(parent, text=text, variable=variable,
+                              font=(FONT_FAMILY, 11), bg=COLORS['bg_primary'], fg=COLORS['text_primary'],
+                              selectcolor=COLORS['bg_card'], activebackground=COLORS['bg_primary'],
+                              activeforeground=COLORS['accent'], highlightthickness=0)
+
+    def _radio(self, parent, text, value):
+        return tk.Radiobutton(parent, text=text, variable=self.mode_var, value=value,
+                              command=self._update_mode,
+                              font=(FONT_FAMILY, 11), bg=COLORS['bg_primary'], fg=COLORS['text_primary'],
+                              selectcolor=COLORS['bg_card'], activebackground=COLORS['bg_primary'],
+                              activeforeground=COLORS['accent'], highlightthickness=0)
+
+    def _create_widgets(self):
+        main = tk.Frame(self, bg=COLORS['bg_primary'])
+        main.pack(fill=tk.BOTH, expand=True, padx=25, pady=20)
+
+        tk.Label(main, text="🛡️ Toplu Yenileme",
+                 font=(FONT_FAMILY, 16, "bold"),
+                 bg=COLORS['bg_primary'], fg=COLORS['text_primary']).pack(pady=(0, 15))
+
+        # Tür
+        types = tk.Frame(main, bg=COLORS['bg_primary'])
+        types.pack(anchor=tk.W)
+        self.sigorta_var = tk.BooleanVar(value=True)
+        self.kasko_var = tk.BooleanVar(value=True)
+        self._check(types, "Sigorta", self.sigorta_var).pack(side=tk.LEFT, padx=(0, 10))
+        self._check(types, "Kasko", self.kasko_var).pack(side=tk.LEFT)
+
+        # Yeni tarih (varsayılan: 1 yıl sonra)
+        tk.Label(main, text="Yeni Bitiş Tarihi (YYYY-MM-DD):",
+                 font=(FONT_FAMILY, 11),
+                 bg=COLORS['bg_primary'], fg=COLORS['text_secondary']).pack(anchor=tk.W, pady=(12, 0))
+        self.date_entry = self._entry(main, (datetime.now() + timedelta(days=365)).strftime("%Y-%m-%d"))
+        self.date_entry.pack(fill=tk.X, pady=(5, 12), ipady=6)
+
+        # Seçim: gün sınırı veya plaka listesi
+        self.mode_var = tk.StringVar(value="days")
+        days_row = tk.Frame(main, bg=COLORS['bg_primary'])
+        days_row.pack(fill=tk.X)
+        self._radio(days_row, "Şu kadar gün içinde bitenler:", "days").pack(side=tk.LEFT)
+        self.days_entry = self._entry(days_row, "30")
+        self.days_entry.configure(width=6)
+        self.days_entry.pack(side=tk.LEFT, padx=(8, 0), ipady=4)
+
+        plates_row = tk.Frame(main, bg=COLORS['bg_primary'])
+        plates_row.pack(fill=tk.X, pady=(10, 5))
+        self._radio(plates_row, "Plaka listesi:", "plates").pack(side=tk.LEFT)
+        self.csv_btn = StyledButton(plates_row, "📂 CSV", self._load_csv,
+                                    COLORS['bg_secondary'], COLORS['text_primary'],
+                                    font_size=9, padx=10, pady=3)
+        self.csv_btn.pack(side=tk.RIGHT)
+
+        self.plates_text = tk.Text(main, height=8, font=(FONT_FAMILY, 11),
+                                   bg=COLORS['bg_secondary'], fg=COLORS['text_primary'],
+                                   insertbackground=COLORS['text_primary'], relief='flat',
+                                   highlightthickness=2, highlightbackground=COLORS['bg_card'],
+                                   highlightcolor=COLORS['accent'])
+        self.plates_text.pack(fill=tk.BOTH, expand=True)
+
+        # Butonlar
+        btn_frame = tk.Frame(main, bg=COLORS['bg_primary'])
+        btn_frame.pack(pady=(15, 0))
+
+        StyledButton(btn_frame, "✓ YENİLE", self._on_save,
+                     COLORS['success'], '#ffffff', padx=25, pady=10).pack(side=tk.LEFT, padx=5)
+
+        StyledButton(btn_frame, "✗ İPTAL", self._on_cancel,
+                     COLORS['danger'], '#ffffff', padx=25, pady=10).pack(side=tk.LEFT, padx=5)
+
+        self.bind("<Escape>", lambda e: self._on_cancel())
+        self._update_mode()
+
+    def _update_mode(self):
+        by_days = self.mode_var.get() == "days"
+        self.days_entry.configure(state=tk.NORMAL if by_days else tk.DISABLED)
+        self.plates_text.configure(state=tk.DISABLED if by_days else tk.NORMAL)
+        if by_days:
+            self.csv_btn.disable()
+        else:
+            self.csv_btn.enable()
+
+    def _load_csv(self):
+        path = filedialog.askopenfilename(
+            parent=self, title="Plaka Listesi",
+            filetypes=[("CSV", "*.csv"), ("Metin", "*.txt"), ("Tümü", "*.*")])
+        if not path:
+            return
+        try:
+            with open(path, encoding="utf-8-sig") as f:
+                plates = self.parse_plates(f.read())
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Hata", f"Dosya okunamadı:\n{e}", parent=self)
+            return
+        self.plates_text.delete("1.0", tk.END)
+        self.plates_text.insert("1.0", "\n".join(plates))
+
+    def _on_save(self):
+        types = [kind for kind, var in (("sigorta", self.sigorta_var), ("kasko", self.kasko_var)) if var.get()]
+        by_days = self.mode_var.get() == "days"
+        self.result = {
+            'types': types,
+            'new_date': self.date_entry.get(),
+            'days': self.days_entry.get() if by_days else None,
+            'plates': None if by_days else self.parse_plates(self.plates_text.get("1.0", tk.END)),
+        }
+        self.destroy()
+
+    def _on_cancel(self):
+        self.result = None
+        self.destroy()
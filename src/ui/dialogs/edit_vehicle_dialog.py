@@ -1,5 +1,6 @@
 import tkinter as tk
 from constants import COLORS, FONT_FAMILY
+from src.models.vehicle_status import VehicleStatus
 from src.ui.styled_button import StyledButton
 
 
@@ -71,13 +72,13 @@ class EditVehicleDialog(tk.Toplevel):
                  bg=COLORS['bg_primary'], fg=COLORS['text_secondary']).grid(
             row=3, column=0, sticky=tk.W, pady=8)
 
-        self.durum_var = tk.StringVar(value=self.vehicle.durum)
+        self.durum_var = tk.IntVar(value=self.vehicle.durum)
         durum_frame = tk.Frame(form, bg=COLORS['bg_primary'])
         durum_frame.grid(row=3, column=1, pady=8, padx=(15, 0), sticky=tk.W)
 
-        for text, value in [("Müsait", "müsait"), ("Kirada", "kirada"), ("Bakımda", "bakımda")]:
+        for status in VehicleStatus:
             tk.Radiobutton(
-                durum_frame, text=text, variable=self.durum_var, value=value,
+                durum_frame, text=status.label.capitalize(), variable=self.durum_var, value=status,
                 font=(FONT_FAMILY, 11), bg=COLORS['bg_primary'], fg=COLORS['text_primary'],
                 selectcolor=COLORS['bg_card'], activebackground=COLORS['bg_primary'],
                 activeforeground=COLORS['accent'], highlightthickness=0
@@ -101,7 +102,7 @@ class EditVehicleDialog(tk.Toplevel):
             'marka': self.marka_entry.get(),
             'model': self.model_entry.get(),
             'ucret': self.ucret_entry.get(),
-            'durum': self.durum_var.get()
+            'durum': VehicleStatus(self.durum_var.get())
         }
         self.destroy()
 
@@ -1,10 +1,94 @@
 import tkinter as tk
+from bisect import bisect_right
+from datetime import date
+
 from constants import COLORS, FONT_FAMILY
 from src.ui.styled_button import StyledButton
 
+ITEM_HEIGHT = 64
+HEADER_HEIGHT = 40
+PAGE_SIZE = 50  # Araç ayrıntıları ve başarısız girişimler bu büyüklükte sayfalarla okunur
+
+# Grup anahtarı, başlık, renk (gruplu görünümdeki sıra)
+GROUPS = (
+    ('overdue', "Gecikmiş İadeler", COLORS['danger']),
+    ('expired', "Süresi Geçenler", COLORS['danger']),
+    ('expiring_soon', "{days} Gün İçinde Bitecek", COLORS['warning']),
+    ('failed', "Başarısız Kiralama Girişimleri", COLORS['danger']),
+)
+GROUP_COLORS = {key: color for key, _, color in GROUPS}
+
+
+class _HeaderCard:
+    """Grup başlığı; görünür başlıklar arasında yeniden kullanılır."""
+
+    def __init__(self, canvas):
+        self.frame = tk.Frame(canvas, bg=COLORS['bg_primary'])
+        self.title = tk.Label(self.frame, font=(FONT_FAMILY, 13, "bold"), bg=COLORS['bg_primary'])
+        self.title.pack(side=tk.LEFT)
+        self.count = tk.Label(self.frame, font=(FONT_FAMILY, 11),
+                              bg=COLORS['bg_primary'], fg=COLORS['text_secondary'])
+        self.count.pack(side=tk.LEFT, padx=5)
+        self.window = canvas.create_window(0, 0, window=self.frame, anchor="nw", state="hidden")
+        self.row = None
+
+
+class _ItemCard:
+    """Tek bildirim kartı.
+
+    Kaydırma sırasında yok edilmez; görünür alana giren başka bir satıra
+    yeniden bağlanır ve sadece metin/renkleri değiştirilir.
+    """
+
+    def __init__(self, canvas, on_mark):
+        self.frame = tk.Frame(canvas, bg=COLORS['bg_card'], padx=12, pady=10)
+
+        # Sol - Araç bilgisi
+        left = tk.Frame(self.frame, bg=COLORS['bg_card'])
+        left.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.title = tk.Label(left, font=(FONT_FAMILY, 11, "bold"),
+                              bg=COLORS['bg_card'], fg=COLORS['text_primary'])
+        self.title.pack(anchor=tk.W)
+        self.subtitle = tk.Label(left, font=(FONT_FAMILY, 10),
+                                 bg=COLORS['bg_card'], fg=COLORS['text_secondary'])
+        self.subtitle.pack(anchor=tk.W)
+
+        # Sağ - Tür/tarih veya tarih/sebep
+        right = tk.Frame(self.frame, bg=COLORS['bg_card'])
+        right.pack(side=tk.RIGHT)
+        self.kind = tk.Label(right, bg=COLORS['bg_card'])
+        self.kind.pack(anchor=tk.E)
+        self.detail = tk.Label(right, bg=COLORS['bg_card'])
+        self.detail.pack(anchor=tk.E)
+
+        # Okundu butonu (sadece başarısız girişimlerde gösterilir)
+        self.mark_btn = tk.Label(self.frame, text="✓",
+                                 font=(FONT_FAMILY, 12, "bold"),
+                                 bg=COLORS['success'], fg="white",
+                                 padx=8, pady=2, cursor="hand2")
+        self.mark_btn.bind("<Button-1>", lambda e: on_mark(self.row))
+        self.mark_visible = False
+
+        self.window = canvas.create_window(0, 0, window=self.frame, anchor="nw", state="hidden")
+        self.row = None
+
+    def show_mark(self, visible):
+        if visible != self.mark_visible:
+            if visible:
+                self.mark_btn.pack(side=tk.RIGHT, padx=(10, 0))
+            else:
+                self.mark_btn.pack_forget()
+            self.mark_visible = visible
+
 
 class ExpiryNotificationDialog(tk.Toplevel):
-    """Sigorta/Kasko süresi dolan araçlar için bildirim diyalogu."""
+    """Sigorta/Kasko süresi dolan araçlar için bildirim diyalogu.
+
+    Liste sanallaştırılmıştır: bildirimler widget değil (tür, grup, veri)
+    satırları olarak tutulur, yalnızca görünür alandaki satırlar için kart
+    çizilir ve kartlar kaydırıldıkça yeni satırlara yeniden bağlanır. Araç
+    ayrıntıları ve başarısız girişimler DataManager'dan sayfa sayfa okunur.
+    """
 
     def __init__(self, parent, expiry_data, data_manager=None, on_vehicle_click=None):
         super().__init__(parent)
@@ -16,13 +100,42 @@ class ExpiryNotificationDialog(tk.Toplevel):
         self.grab_set()
 
         self.configure(bg=COLORS['bg_primary'])
-        self.expiry_data = expiry_data
-        self.failed_rentals = expiry_data.get('failed_rentals', [])
         self.data_manager = data_manager
         self.on_vehicle_click = on_vehicle_click
+        self.days = expiry_data.get('days', 30)
+
+        # Sigorta/kasko kayıtları (tarih, plaka, tür); araçlar görünür oldukça yüklenir
+        self._vehicles = {}
+        self._data = {
+            'overdue': list(expiry_data.get('overdue', [])),
+            'expired': [self._entry(item) for item in expiry_data.get('expired', [])],
+            'expiring_soon': [self._entry(item) for item in expiry_data.get('expiring_soon', [])],
+            'failed': [],
+        }
+        self._failed_offset = 0
+        self._failed_done = data_manager is None
+        if data_manager is None:
+            self._data['failed'] = list(expiry_data.get('failed_rentals', []))
+        else:
+            self._load_failed_page()
+
+        self._grouped = True
+        self._descending = False
+        self._rows = []
+        self._offsets = [0]
+        self._pools = {'header': [], 'item': []}
+
         self._create_widgets()
+        self._build_rows()
         self._center_window()
 
+    def _entry(self, item):
+        """get_expiring_vehicles sözlüklerini de (tarih, plaka, tür) kaydına çevirir."""
+        if isinstance(item, dict):
+            self._vehicles[item['vehicle'].plaka] = item['vehicle']
+            return item['date'], item['vehicle'].plaka, item['type']
+        return item
+
     def _center_window(self):
         self.update_idletasks()
         x = (self.winfo_screenwidth() // 2) - (self.winfo_width() // 2)
@@ -36,168 +149,216 @@ class ExpiryNotificationDialog(tk.Toplevel):
         # Başlık
         tk.Label(main, text="Bildirimler",
                  font=(FONT_FAMILY, 18, "bold"),
-                 bg=COLORS['bg_primary'], fg=COLORS['text_primary']).pack(pady=(0, 15))
-
-        # Scrollable frame
-        canvas = tk.Canvas(main, bg=COLORS['bg_primary'], highlightthickness=0)
-        scrollbar = tk.Scrollbar(main, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=COLORS['bg_primary'])
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Süresi geçmiş
-        expired = self.expiry_data.get('expired', [])
-        if expired:
-            self._create_section(scrollable_frame, "Süresi Geçenler", expired, COLORS['danger'])
-
-        # Süresi yaklaşan
-        expiring = self.expiry_data.get('expiring_soon', [])
-        if expiring:
-            self._create_section(scrollable_frame, "30 Gün İçinde Bitecek", expiring, COLORS['warning'])
-
-        # Başarısız kiralama girişimleri
-        if self.failed_rentals:
-            self._create_failed_section(scrollable_frame, "Başarısız Kiralama Girişimleri", self.failed_rentals, COLORS['danger'])
-
-        # Bildirim yoksa
-        if not expired and not expiring and not self.failed_rentals:
-            tk.Label(scrollable_frame, text="Bildirim yok",
-                     font=(FONT_FAMILY, 12),
-                     bg=COLORS['bg_primary'], fg=COLORS['text_secondary']).pack(pady=20)
-
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+                 bg=COLORS['bg_primary'], fg=COLORS['text_primary']).pack(pady=(0, 10))
+
+        # Gruplama ve sıralama
+        controls = tk.Frame(main, bg=COLORS['bg_primary'])
+        controls.pack(fill=tk.X, pady=(0, 10))
+        self.group_btn = StyledButton(controls, "", self._toggle_grouping,
+                                      COLORS['bg_secondary'], COLORS['text_primary'],
+                                      font_size=9, padx=10, pady=4)
+        self.group_btn.pack(side=tk.LEFT)
+        self.sort_btn = StyledButton(controls, "", self._toggle_sort,
+                                     COLORS['bg_secondary'], COLORS['text_primary'],
+                                     font_size=9, padx=10, pady=4)
+        self.sort_btn.pack(side=tk.LEFT, padx=(8, 0))
+        self._update_control_texts()
 
         # Kapat butonu
         StyledButton(main, "KAPAT", self.destroy,
                      COLORS['bg_secondary'], COLORS['text_primary'],
-                     font_size=11, padx=30, pady=10).pack(pady=(15, 0))
-
-        self.bind("<Escape>", lambda e: self.destroy())
-
-    def _create_section(self, parent, title, items, color):
-        """Bildirim bölümü oluştur."""
-        section = tk.Frame(parent, bg=COLORS['bg_primary'])
-        section.pack(fill=tk.X, pady=(0, 15))
-
-        # Başlık
-        header = tk.Frame(section, bg=COLORS['bg_primary'])
-        header.pack(fill=tk.X, pady=(0, 8))
-
-        tk.Label(header, text=title,
-                 font=(FONT_FAMILY, 13, "bold"),
-                 bg=COLORS['bg_primary'], fg=color).pack(side=tk.LEFT)
+                     font_size=11, padx=30, pady=10).pack(side=tk.BOTTOM, pady=(15, 0))
 
-        tk.Label(header, text=f"({len(items)})",
-                 font=(FONT_FAMILY, 11),
-                 bg=COLORS['bg_primary'], fg=COLORS['text_secondary']).pack(side=tk.LEFT, padx=5)
+        # Sanal liste: kaydırma bölgesi tüm satırların yüksekliği kadardır
+        self.canvas = tk.Canvas(main, bg=COLORS['bg_primary'], highlightthickness=0,
+                                yscrollincrement=ITEM_HEIGHT // 2)
+        scrollbar = tk.Scrollbar(main, orient="vertical", command=self.canvas.yview)
 
-        # Öğeler
-        for item in items:
-            self._create_item(section, item, color)
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            self._render()
 
-    def _create_item(self, parent, item, color):
-        """Tek bir bildirim öğesi oluştur."""
-        v = item['vehicle']
-        card = tk.Frame(parent, bg=COLORS['bg_card'], padx=12, pady=10)
-        card.pack(fill=tk.X, pady=3)
+        self.canvas.configure(yscrollcommand=on_scroll)
+        self.canvas.bind("<Configure>", lambda e: self._render())
+        self.empty_label = tk.Label(self.canvas, text="Bildirim yok",
+                                    font=(FONT_FAMILY, 12),
+                                    bg=COLORS['bg_primary'], fg=COLORS['text_secondary'])
+        self.empty_window = self.canvas.create_window(0, 20, window=self.empty_label,
+                                                      anchor="nw", state="hidden")
 
-        # Sol - Araç bilgisi
-        left = tk.Frame(card, bg=COLORS['bg_card'])
-        left.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-        tk.Label(left, text=f"{v.marka} {v.model}",
-                 font=(FONT_FAMILY, 11, "bold"),
-                 bg=COLORS['bg_card'], fg=COLORS['text_primary']).pack(anchor=tk.W)
-
-        tk.Label(left, text=v.plaka,
-                 font=(FONT_FAMILY, 10),
-                 bg=COLORS['bg_card'], fg=COLORS['text_secondary']).pack(anchor=tk.W)
-
-        # Sağ - Tür ve tarih
-        right = tk.Frame(card, bg=COLORS['bg_card'])
-        right.pack(side=tk.RIGHT)
-
-        tk.Label(right, text=item['type'],
-                 font=(FONT_FAMILY, 10, "bold"),
-                 bg=COLORS['bg_card'], fg=color).pack(anchor=tk.E)
-
-        tk.Label(right, text=item['date'],
-                 font=(FONT_FAMILY, 10),
-                 bg=COLORS['bg_card'], fg=COLORS['text_secondary']).pack(anchor=tk.E)
-
-    def _create_failed_section(self, parent, title, items, color):
-        """Başarısız kiralama bölümü oluştur."""
-        section = tk.Frame(parent, bg=COLORS['bg_primary'])
-        section.pack(fill=tk.X, pady=(0, 15))
-
-        # Başlık
-        header = tk.Frame(section, bg=COLORS['bg_primary'])
-        header.pack(fill=tk.X, pady=(0, 8))
-
-        tk.Label(header, text=title,
-                 font=(FONT_FAMILY, 13, "bold"),
-                 bg=COLORS['bg_primary'], fg=color).pack(side=tk.LEFT)
-
-        tk.Label(header, text=f"({len(items)})",
-                 font=(FONT_FAMILY, 11),
-                 bg=COLORS['bg_primary'], fg=COLORS['text_secondary']).pack(side=tk.LEFT, padx=5)
-
-        # Öğeler
-        for item in items:
-            self._create_failed_item(section, item, color)
-
-    def _create_failed_item(self, parent, item, color):
-        """Başarısız kiralama öğesi oluştur."""
-        card = tk.Frame(parent, bg=COLORS['bg_card'], padx=12, pady=10)
-        card.pack(fill=tk.X, pady=3)
-
-        # Sol - Araç bilgisi
-        left = tk.Frame(card, bg=COLORS['bg_card'])
-        left.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-        tk.Label(left, text=f"{item['marka']} {item['model']}",
-                 font=(FONT_FAMILY, 11, "bold"),
-                 bg=COLORS['bg_card'], fg=COLORS['text_primary']).pack(anchor=tk.W)
-
-        tk.Label(left, text=item['plaka'],
-                 font=(FONT_FAMILY, 10),
-                 bg=COLORS['bg_card'], fg=COLORS['text_secondary']).pack(anchor=tk.W)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        # Sağ - Tarih ve sebep
-        right = tk.Frame(card, bg=COLORS['bg_card'])
-        right.pack(side=tk.RIGHT)
+        # Tekerlek olayları Toplevel'in bindtag'i üzerinden tüm kartlardan gelir
+        self.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        self.bind("<Button-4>", lambda e: self._scroll(-1))
+        self.bind("<Button-5>", lambda e: self._scroll(1))
+        self.bind("<Escape>", lambda e: self.destroy())
 
-        tk.Label(right, text=item['tarih'],
-                 font=(FONT_FAMILY, 9),
-                 bg=COLORS['bg_card'], fg=COLORS['text_secondary']).pack(anchor=tk.E)
-
-        # Sebep kısalt
-        sebep = item['sebep'][:40] + "..." if len(item['sebep']) > 40 else item['sebep']
-        tk.Label(right, text=sebep,
-                 font=(FONT_FAMILY, 9),
-                 bg=COLORS['bg_card'], fg=color).pack(anchor=tk.E)
-
-        # Okundu butonu
-        if self.data_manager:
-            btn_frame = tk.Frame(card, bg=COLORS['bg_card'])
-            btn_frame.pack(side=tk.RIGHT, padx=(10, 0))
-            
-            okundu_btn = tk.Label(btn_frame, text="✓", 
-                                  font=(FONT_FAMILY, 12, "bold"),
-                                  bg=COLORS['success'], fg="white",
-                                  padx=8, pady=2, cursor="hand2")
-            okundu_btn.pack()
-            okundu_btn.bind("<Button-1>", lambda e, id=item['id'], c=card: self._mark_as_read(id, c))
-
-    def _mark_as_read(self, rental_id, card_widget):
-        """Bildirimi okundu olarak işaretle ve kaldır."""
-        if self.data_manager:
-            self.data_manager.delete_failed_rental(rental_id)
-            card_widget.destroy()
+    def _scroll(self, units):
+        self.canvas.yview_scroll(units * 2, "units")
+
+    # ---------- SATIRLAR ----------
+    @staticmethod
+    def _sort_key(row):
+        group, payload = row
+        if group == 'overdue':
+            return str(payload.bitis_tarihi)
+        if group == 'failed':
+            return payload['tarih']
+        return str(payload[0])
+
+    def _build_rows(self):
+        """Veriden (grup, veri) satırlarını ve dikey konumlarını yeniden kurar."""
+        rows = []
+        if self._grouped:
+            for group, _, _ in GROUPS:
+                items = [(group, payload) for payload in self._data[group]]
+                if not items:
+                    continue
+                # Başarısız girişimler sayfalı okunduğu için veritabanı sırasında kalır
+                if group != 'failed':
+                    items.sort(key=self._sort_key, reverse=self._descending)
+                rows.append(('header', group))
+                rows.extend(items)
+        else:
+            rows = [(group, payload) for group, _, _ in GROUPS for payload in self._data[group]]
+            rows.sort(key=self._sort_key, reverse=self._descending)
+        self._rows = rows
+        self._layout()
+
+    def _layout(self):
+        offsets = [0]
+        for group, _ in self._rows:
+            offsets.append(offsets[-1] + (HEADER_HEIGHT if group == 'header' else ITEM_HEIGHT))
+        self._offsets = offsets
+        self.canvas.itemconfigure(self.empty_window, state="hidden" if self._rows else "normal")
+        self.canvas.configure(scrollregion=(0, 0, 0, offsets[-1]))
+        self._render()
+
+    def _render(self):
+        """Görünür satırlara havuzdaki kartları bağlar, kalanları gizler."""
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        width = self.canvas.winfo_width()
+        first = max(0, bisect_right(self._offsets, top) - 1)
+        last = min(len(self._rows), bisect_right(self._offsets, bottom))
+
+        if not self._failed_done and last >= len(self._rows) - PAGE_SIZE // 5:
+            self._load_failed_page()
+            self._build_rows()
+            return
+        self._prefetch_vehicles(first, last)
+
+        used = {'header': 0, 'item': 0}
+        for i in range(first, last):
+            row = self._rows[i]
+            kind = 'header' if row[0] == 'header' else 'item'
+            pool = self._pools[kind]
+            if used[kind] == len(pool):
+                pool.append(_HeaderCard(self.canvas) if kind == 'header'
+                            else _ItemCard(self.canvas, self._mark_as_read))
+            card = pool[used[kind]]
+            used[kind] += 1
+            if kind == 'header':
+                self._bind_header(card, row)
+                height = HEADER_HEIGHT - 8
+            else:
+                if card.row is not row:
+                    self._bind_item(card, row)
+                height = ITEM_HEIGHT - 6
+            self.canvas.coords(card.window, 0, self._offsets[i] + 3)
+            self.canvas.itemconfigure(card.window, state="normal", width=width, height=height)
+
+        for kind, pool in self._pools.items():
+            for card in pool[used[kind]:]:
+                card.row = None
+                self.canvas.itemconfigure(card.window, state="hidden")
+
+    def _bind_header(self, card, row):
+        group = row[1]
+        title, color = next((t, c) for key, t, c in GROUPS if key == group)
+        count = len(self._data[group])
+        more = "+" if group == 'failed' and not self._failed_done else ""
+        card.title.configure(text=title.format(days=self.days), fg=color)
+        card.count.configure(text=f"({count}{more})")
+        card.row = row
+
+    def _bind_item(self, card, row):
+        group, payload = row
+        color = GROUP_COLORS[group]
+        if group == 'failed':
+            card.title.configure(text=f"{payload['marka']} {payload['model']}")
+            card.subtitle.configure(text=payload['plaka'])
+            card.kind.configure(text=payload['tarih'], font=(FONT_FAMILY, 9), fg=COLORS['text_secondary'])
+            # Sebep kısalt
+            sebep = payload['sebep'][:40] + "..." if len(payload['sebep']) > 40 else payload['sebep']
+            card.detail.configure(text=sebep, font=(FONT_FAMILY, 9), fg=color)
+            card.show_mark(self.data_manager is not None)
+        else:
+            if group == 'overdue':
+                v = payload
+                kind = f"{(date.today() - v.bitis_tarihi).days} gün gecikme"
+                detail = f"{v.kiralayan} · {v.bitis_tarihi}"
+            else:
+                expiry, plaka, kind = payload
+                v = self._vehicles.get(plaka)
+                detail = expiry
+            card.title.configure(text=f"{v.marka} {v.model}" if v else "—")
+            card.subtitle.configure(text=v.plaka if v else payload[1])
+            card.kind.configure(text=kind, font=(FONT_FAMILY, 10, "bold"), fg=color)
+            card.detail.configure(text=detail, font=(FONT_FAMILY, 10), fg=COLORS['text_secondary'])
+            card.show_mark(False)
+        card.row = row
+
+    # ---------- SAYFALAMA ----------
+    def _prefetch_vehicles(self, first, last):
+        """Görünür alan ve sonraki sayfa için eksik araçları tek sorguda okur."""
+        if self.data_manager is None:
+            return
+        missing = {
+            payload[1] for group, payload in self._rows[first:last + PAGE_SIZE]
+            if group in ('expired', 'expiring_soon') and payload[1] not in self._vehicles
+        }
+        if missing:
+            found = self.data_manager.get_vehicles_by_plates(missing)
+            for plaka in missing:
+                # Silinmiş araçlar tekrar sorgulanmasın diye None ile işaretlenir
+                self._vehicles[plaka] = found.get(plaka)
+
+    def _load_failed_page(self):
+        page = self.data_manager.get_failed_rentals(PAGE_SIZE, self._failed_offset)
+        self._failed_offset += len(page)
+        self._failed_done = len(page) < PAGE_SIZE
+        self._data['failed'].extend(page)
+
+    # ---------- EYLEMLER ----------
+    def _toggle_grouping(self):
+        self._grouped = not self._grouped
+        self._update_control_texts()
+        self._build_rows()
+
+    def _toggle_sort(self):
+        self._descending = not self._descending
+        self._update_control_texts()
+        self._build_rows()
+
+    def _update_control_texts(self):
+        self.group_btn.set_text("Gruplama: Kategori" if self._grouped else "Gruplama: Yok")
+        self.sort_btn.set_text("Tarih: Yeni → Eski" if self._descending else "Tarih: Eski → Yeni")
+
+    def _mark_as_read(self, row):
+        """Bildirimi okundu olarak işaretle; liste yeniden kurulmadan satır çıkarılır."""
+        if self.data_manager is None or row is None:
+            return
+        payload = row[1]
+        self.data_manager.delete_failed_rental(payload['id'])
+        self._data['failed'].remove(payload)
+        # Silinen kayıt sonraki sayfanın başlangıcını bir geri çeker
+        self._failed_offset -= 1
+
+        i = next(i for i, r in enumerate(self._rows) if r is row)
+        del self._rows[i]
+        if self._grouped and not self._data['failed'] and self._failed_done:
+            del self._rows[i - 1]  # Boşalan grubun başlığı
+        self._layout()
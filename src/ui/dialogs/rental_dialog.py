@@ -5,9 +5,15 @@ from src.ui.styled_button import StyledButton
 
 
 class RentalDialog(tk.Toplevel):
-    """Kiralama bilgileri giriş diyalogu."""
+    """Kiralama bilgileri giriş diyalogu.
 
-    def __init__(self, parent, vehicle_info: str, customer_name: str = ""):
+    search_customers verilirse müşteri adı yazılırken eşleşen kayıtlı
+    müşteriler alttaki listede önerilir (↓ ile listeye geçilir, Enter ile seçilir).
+    """
+
+    SUGGESTION_LIMIT = 8
+
+    def __init__(self, parent, vehicle_info: str, customer_name: str = "", search_customers=None):
         super().__init__(parent)
         self.title("Kiralama Başlat")
         self.geometry("550x520")
@@ -20,6 +26,7 @@ class RentalDialog(tk.Toplevel):
 
         self.result = None
         self.customer_name = customer_name
+        self.search_customers = search_customers
         self._create_widgets(vehicle_info)
         self._center_window()
 
@@ -82,7 +89,78 @@ class RentalDialog(tk.Toplevel):
 
         self.bind("<Return>", lambda e: self._on_confirm())
         self.bind("<Escape>", lambda e: self._on_cancel())
+        if self.search_customers:
+            self._create_suggestions()
+        self.customer_entry.focus_set()
+
+    # ---------- MÜŞTERİ ÖNERİLERİ ----------
+    def _create_suggestions(self):
+        # Liste formun üzerine place ile bindirilir; yerleşimi kaydırmaz
+        self.suggestions = tk.Listbox(self, font=(FONT_FAMILY, 11), height=self.SUGGESTION_LIMIT,
+                                      bg=COLORS['bg_card'], fg=COLORS['text_primary'],
+                                      selectbackground=COLORS['accent'], selectforeground='#ffffff',
+                                      relief='flat', highlightthickness=1,
+                                      highlightbackground=COLORS['accent'], activestyle='none')
+        entry = self.customer_entry
+        entry.bind("<KeyRelease>", self._on_customer_key)
+        entry.bind("<Down>", self._focus_suggestions)
+        entry.bind("<Escape>", self._hide_suggestions_key)
+        entry.bind("<FocusOut>", lambda e: self.after(100, self._hide_if_unfocused))
+        self.suggestions.bind("<Return>", self._pick_suggestion)
+        self.suggestions.bind("<Double-Button-1>", self._pick_suggestion)
+        self.suggestions.bind("<Escape>", self._hide_suggestions_key)
+        self.suggestions.bind("<FocusOut>", lambda e: self.after(100, self._hide_if_unfocused))
+
+    def _on_customer_key(self, event):
+        if event.keysym in ("Down", "Up", "Return", "Escape", "Tab"):
+            return
+        names = self.search_customers(self.customer_entry.get(), self.SUGGESTION_LIMIT)
+        # Yazılanla birebir aynı tek öneri gösterilmez
+        if not names or names == [self.customer_entry.get().strip()]:
+            self._hide_suggestions()
+            return
+        self.suggestions.delete(0, tk.END)
+        self.suggestions.insert(tk.END, *names)
+        self.suggestions.configure(height=len(names))
+        entry = self.customer_entry
+        self.suggestions.place(x=entry.winfo_rootx() - self.winfo_rootx(),
+                               y=entry.winfo_rooty() - self.winfo_rooty() + entry.winfo_height(),
+                               width=entry.winfo_width())
+        self.suggestions.lift()
+
+    def _focus_suggestions(self, event=None):
+        if not self.suggestions.winfo_ismapped():
+            return None
+        self.suggestions.focus_set()
+        self.suggestions.selection_clear(0, tk.END)
+        self.suggestions.selection_set(0)
+        self.suggestions.activate(0)
+        return "break"
+
+    def _pick_suggestion(self, event=None):
+        selection = self.suggestions.curselection()
+        if selection:
+            self.customer_entry.delete(0, tk.END)
+            self.customer_entry.insert(0, self.suggestions.get(selection[0]))
+        self._hide_suggestions()
         self.customer_entry.focus_set()
+        self.customer_entry.icursor(tk.END)
+        return "break"
+
+    def _hide_suggestions(self):
+        self.suggestions.place_forget()
+
+    def _hide_suggestions_key(self, event=None):
+        # Liste açıksa Escape sadece listeyi kapatır, diyaloğu değil
+        if not self.suggestions.winfo_ismapped():
+            return None
+        self._hide_suggestions()
+        self.customer_entry.focus_set()
+        return "break"
+
+    def _hide_if_unfocused(self):
+        if self.winfo_exists() and self.focus_get() not in (self.customer_entry, self.suggestions):
+            self._hide_suggestions()
 
     def _on_confirm(self):
         """Kiralama bilgilerini onayla."""
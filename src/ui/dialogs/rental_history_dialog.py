@@ -1,6 +1,8 @@
+import threading
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
 from constants import COLORS, FONT_FAMILY
+from src.backend.exporter import Exporter
 from src.ui.styled_button import StyledButton
 
 
@@ -18,6 +20,11 @@ class RentalHistoryDialog(tk.Toplevel):
 
         self.configure(bg=COLORS['bg_primary'])
         self.data_manager = data_manager
+        self._exporter = None
+        self._export_progress = 0
+        self._export_total = 0
+        self._export_result = None
+        self._export_poll_id = None
 
         self._create_widgets()
         self._load_history()
@@ -63,6 +70,7 @@ class RentalHistoryDialog(tk.Toplevel):
                                        highlightbackground=COLORS['bg_primary'])
         self.start_date_ent.insert(0, "2025-01-01")
         self.start_date_ent.pack(side=tk.LEFT, padx=5, ipady=3)
+        self.start_date_ent.bind("<KeyRelease>", lambda e: self._update_range_summary())
 
         # Bitiş Girişi
         tk.Label(filter_bar, text="Bitiş:", font=(FONT_FAMILY, 9),
@@ -74,6 +82,7 @@ class RentalHistoryDialog(tk.Toplevel):
                                      highlightbackground=COLORS['bg_primary'])
         self.end_date_ent.insert(0, "2025-12-31")
         self.end_date_ent.pack(side=tk.LEFT, padx=5, ipady=3)
+        self.end_date_ent.bind("<KeyRelease>", lambda e: self._update_range_summary())
 
         # Butonları sağa itmek için boşluk
         tk.Label(filter_bar, bg=COLORS['bg_card']).pack(side=tk.LEFT, expand=True)
@@ -90,6 +99,12 @@ class RentalHistoryDialog(tk.Toplevel):
         reset_btn.pack(side=tk.LEFT, padx=5)
         reset_btn.bind("<Button-1>", lambda e: self._load_history())
 
+        # Dışa Aktar Butonu
+        self.export_btn = tk.Label(filter_bar, text="💾 Dışa Aktar", font=(FONT_FAMILY, 10, "bold"),
+                                   bg=COLORS['info'], fg="white", padx=15, pady=7, cursor="hand2")
+        self.export_btn.pack(side=tk.LEFT, padx=5)
+        self.export_btn.bind("<Button-1>", lambda e: self._export())
+
         # 3. Treeview (Liste) Bölümü
         tree_frame = tk.Frame(main, bg=COLORS['bg_secondary'])
         tree_frame.pack(fill=tk.BOTH, expand=True)
@@ -122,15 +137,30 @@ class RentalHistoryDialog(tk.Toplevel):
         btn_frame = tk.Frame(main, bg=COLORS['bg_primary'])
         btn_frame.pack(fill=tk.X, pady=(20, 0))
 
-        StyledButton(btn_frame, "✓ KAPAT", self.destroy,
+        StyledButton(btn_frame, "✓ KAPAT", self._on_close,
                      COLORS['bg_card'], COLORS['text_primary'], padx=40, pady=12).pack()
 
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
     def _apply_filter(self):
         """Kullanıcının girdiği tarihlere göre filtreleme yapar."""
         start = self.start_date_ent.get()
         end = self.end_date_ent.get()
         filtered_history = self.data_manager.get_rental_history_by_date(start, end)
         self._load_history(data=filtered_history)
+        self._update_range_summary()
+
+    def _update_range_summary(self):
+        """Tarihler yazılırken aralık özetini gelir indeksinden günceller."""
+        start = self.start_date_ent.get().strip()
+        end = self.end_date_ent.get().strip()
+        try:
+            count, income = self.data_manager.get_revenue_between(start, end)
+        except ValueError:
+            return  # Tarih henüz tamamlanmadı
+        self.summary_label.config(
+            text=f"{start} → {end}: {count} işlem | Hasılat: {income:,.0f}₺"
+        )
 
     def _load_history(self, data=None):
         """Listeyi verilerle doldurur."""
@@ -153,4 +183,73 @@ class RentalHistoryDialog(tk.Toplevel):
 
         self.summary_label.config(
             text=f"Toplam: {len(history)} işlem | Hasılat: {total_income:,.0f}₺"
-        )
\ No newline at end of file
+        )
+
+    def _export(self):
+        """Filtredeki tarih aralığını arka planda dosyaya aktarır."""
+        if self._exporter is not None:
+            return
+
+        start = self.start_date_ent.get().strip() or None
+        end = self.end_date_ent.get().strip() or None
+        exporter = Exporter(self.data_manager.db_path)
+        try:
+            total = exporter.count('rental_history', start, end)
+        except ValueError as e:
+            messagebox.showerror("✗ Hata", str(e), parent=self)
+            return
+
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Kiralama Geçmişini Dışa Aktar",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("CSV (gzip)", "*.csv.gz"),
+                       ("JSON Lines", "*.jsonl"), ("JSON Lines (gzip)", "*.jsonl.gz")])
+        if not path:
+            return
+
+        fmt = 'jsonl' if path.endswith(('.jsonl', '.jsonl.gz')) else 'csv'
+
+        self._exporter = exporter
+        self._export_progress = 0
+        self._export_total = total
+        self._export_result = None
+        self.export_btn.config(text="⏳ Aktarılıyor...", cursor="arrow")
+
+        def worker():
+            try:
+                count = self._exporter.export('rental_history', path, fmt, start, end,
+                                              progress=self._set_export_progress)
+                self._export_result = (True, count)
+            except Exception as e:
+                self._export_result = (False, str(e))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self._export_poll_id = self.after(200, self._poll_export)
+
+    def _set_export_progress(self, count):
+        # İş parçacığından çağrılır, sadece sayacı günceller (Tk'ya dokunmaz)
+        self._export_progress = count
+
+    def _poll_export(self):
+        """Dışa aktarma durumunu ana döngüden takip eder."""
+        if self._export_result is None:
+            percent = 100 * self._export_progress // self._export_total if self._export_total else 0
+            self.export_btn.config(text=f"⏳ %{percent} ({self._export_progress:,} satır)")
+            self._export_poll_id = self.after(200, self._poll_export)
+            return
+
+        ok, value = self._export_result
+        self._export_poll_id = None
+        self._exporter = None
+        self.export_btn.config(text="💾 Dışa Aktar", cursor="hand2")
+        if ok:
+            messagebox.showinfo("✓ Başarılı", f"{value:,} kayıt dışa aktarıldı.", parent=self)
+        else:
+            messagebox.showerror("✗ Hata", f"Dışa aktarma hatası: {value}", parent=self)
+
+    def _on_close(self):
+        if self._exporter is not None:
+            self._exporter.cancel()
+        if self._export_poll_id is not None:
+            self.after_cancel(self._export_poll_id)
+        self.destroy()
@@ -1,15 +1,32 @@
 import tkinter as tk
+from tkinter import ttk
 from constants import COLORS, FONT_FAMILY
+from src.models.vehicle_status import VehicleStatus
+
+# Kırılım seçenekleri: görünen ad -> küp boyutları
+BREAKDOWN_DIMENSIONS = {
+    "Araç": ('plaka',),
+    "Müşteri": ('kiralayan',),
+    "Araç × Müşteri": ('plaka', 'kiralayan'),
+    "Dönem": ('donem',),
+    "Araç × Dönem": ('plaka', 'donem'),
+    "Müşteri × Dönem": ('kiralayan', 'donem'),
+}
+BREAKDOWN_PERIODS = {"Ay": 'month', "Çeyrek": 'quarter', "Yıl": 'year'}
+PERCENTILE_DIMENSIONS = {"Marka": 'marka', "Ay": 'ay'}
+PERCENTILES = (0.5, 0.9, 0.99)
+DIMENSION_TITLES = {'plaka': "Plaka", 'kiralayan': "Müşteri", 'donem': "Dönem"}
 
 
 class ReportsDialog(tk.Toplevel):
 
-    def __init__(self, parent, data_manager):
+    def __init__(self, parent, data_manager, rental_service=None):
         super().__init__(parent)
         self.title("📊 Raporlama ve Analiz")
-        self.geometry("600x500")
+        self.geometry("760x920")
         self.configure(bg=COLORS['bg_primary'])
         self.dm = data_manager
+        self.rental_service = rental_service
 
         self.transient(parent)
         self.grab_set()
@@ -39,6 +56,110 @@ class ReportsDialog(tk.Toplevel):
         self._create_stat_card(stats_frame, "🚗 Kiradaki Araçlar", f"{stats['rented_count']} Adet", 1)
         self._create_stat_card(stats_frame, "🏆 En Popüler Marka", stats['top_brand'], 2)
         self._create_stat_card(stats_frame, "🛠 Bakımdaki Araçlar", f"{stats['maintenance_count']} Adet", 3)
+        self._create_stat_card(stats_frame, "📈 Süren Kiralamalardan Beklenen",
+                               f"{stats['projected_revenue']:,.0f} ₺", 4)
+
+        self._create_breakdown_section(main)
+        if self.rental_service:
+            self._create_percentile_section(main)
+
+    def _create_breakdown_section(self, parent):
+        """Gelir küpünden istenen kırılımı gösteren bölüm."""
+        section = tk.Frame(parent, bg=COLORS['bg_secondary'], padx=15, pady=15,
+                           highlightthickness=1, highlightbackground=COLORS['bg_card'])
+        section.pack(fill=tk.BOTH, expand=True, pady=(15, 0))
+
+        controls = tk.Frame(section, bg=COLORS['bg_secondary'])
+        controls.pack(fill=tk.X, pady=(0, 10))
+
+        tk.Label(controls, text="📊 Gelir Kırılımı", font=(FONT_FAMILY, 12, "bold"),
+                 bg=COLORS['bg_secondary'], fg=COLORS['text_primary']).pack(side=tk.LEFT)
+
+        self.period_var = tk.StringVar(value="Ay")
+        period_box = ttk.Combobox(controls, textvariable=self.period_var, state="readonly",
+                                  values=list(BREAKDOWN_PERIODS), width=8)
+        period_box.pack(side=tk.RIGHT)
+        period_box.bind("<<ComboboxSelected>>", lambda e: self._load_breakdown())
+
+        self.dimension_var = tk.StringVar(value="Araç")
+        dimension_box = ttk.Combobox(controls, textvariable=self.dimension_var, state="readonly",
+                                     values=list(BREAKDOWN_DIMENSIONS), width=16)
+        dimension_box.pack(side=tk.RIGHT, padx=(0, 8))
+        dimension_box.bind("<<ComboboxSelected>>", lambda e: self._load_breakdown())
+
+        tree_frame = tk.Frame(section, bg=COLORS['bg_secondary'])
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+
+        scrollbar = ttk.Scrollbar(tree_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.breakdown_tree = ttk.Treeview(tree_frame, show="headings", height=8,
+                                           yscrollcommand=scrollbar.set, style="Custom.Treeview")
+        self.breakdown_tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.breakdown_tree.yview)
+
+        self._load_breakdown()
+
+    def _load_breakdown(self):
+        dims = BREAKDOWN_DIMENSIONS[self.dimension_var.get()]
+        period = BREAKDOWN_PERIODS[self.period_var.get()]
+        rows = self.dm.revenue_cube.query(group_by=dims, period=period)
+
+        columns = list(dims) + ['adet', 'gun', 'gelir']
+        self.breakdown_tree.delete(*self.breakdown_tree.get_children())
+        self.breakdown_tree.configure(columns=columns)
+        titles = dict(DIMENSION_TITLES, adet="Kiralama", gun="Gün", gelir="Gelir")
+        for col in columns:
+            self.breakdown_tree.heading(col, text=titles[col])
+            self.breakdown_tree.column(col, width=110, minwidth=60, anchor=tk.CENTER)
+
+        for row in rows:
+            self.breakdown_tree.insert("", tk.END, values=(
+                *(row[d] or "—" for d in dims), row['adet'], row['gun'], f"{row['gelir']:,.0f} ₺"
+            ))
+
+    def _create_percentile_section(self, parent):
+        """Kiralama süresi ve tutarı için medyan / p90 / p99 bölümü."""
+        section = tk.Frame(parent, bg=COLORS['bg_secondary'], padx=15, pady=15,
+                           highlightthickness=1, highlightbackground=COLORS['bg_card'])
+        section.pack(fill=tk.BOTH, expand=True, pady=(15, 0))
+
+        controls = tk.Frame(section, bg=COLORS['bg_secondary'])
+        controls.pack(fill=tk.X, pady=(0, 10))
+
+        tk.Label(controls, text="⏱ Süre ve Tutar Dağılımı", font=(FONT_FAMILY, 12, "bold"),
+                 bg=COLORS['bg_secondary'], fg=COLORS['text_primary']).pack(side=tk.LEFT)
+
+        self.percentile_var = tk.StringVar(value="Marka")
+        box = ttk.Combobox(controls, textvariable=self.percentile_var, state="readonly",
+                           values=list(PERCENTILE_DIMENSIONS), width=8)
+        box.pack(side=tk.RIGHT)
+        box.bind("<<ComboboxSelected>>", lambda e: self._load_percentiles())
+
+        columns = ("segment", "adet", "gun_p50", "gun_p90", "gun_p99",
+                   "ucret_p50", "ucret_p90", "ucret_p99")
+        titles = ("Segment", "Adet", "Gün p50", "Gün p90", "Gün p99",
+                  "Tutar p50", "Tutar p90", "Tutar p99")
+        self.percentile_tree = ttk.Treeview(section, columns=columns, show="headings", height=6,
+                                            style="Custom.Treeview")
+        for col, title in zip(columns, titles):
+            self.percentile_tree.heading(col, text=title)
+            self.percentile_tree.column(col, width=80, minwidth=60, anchor=tk.CENTER)
+        self.percentile_tree.pack(fill=tk.BOTH, expand=True)
+
+        self._load_percentiles()
+
+    def _load_percentiles(self):
+        dimension = PERCENTILE_DIMENSIONS[self.percentile_var.get()]
+        data = self.rental_service.get_rental_percentiles(dimension, PERCENTILES)
+
+        self.percentile_tree.delete(*self.percentile_tree.get_children())
+        for segment, values in data.items():
+            self.percentile_tree.insert("", tk.END, values=(
+                segment, values['adet'],
+                *(f"{d:.0f}" for d in values['gun']),
+                *(f"{u:,.0f} ₺" for u in values['ucret'])
+            ))
 
     def _create_stat_card(self, parent, title, value, row):
         card = tk.Frame(parent, bg=COLORS['bg_secondary'], padx=15, pady=15,
@@ -51,29 +172,21 @@ class ReportsDialog(tk.Toplevel):
                  bg=COLORS['bg_secondary'], fg=COLORS['accent']).pack(side=tk.RIGHT)
 
     def _calculate_stats(self):
-        vehicles = self.dm.get_all_vehicles()
-        history = self.dm.get_rental_history()
+        fleet = self.dm.get_fleet_snapshot()
+        counts = fleet.display_counts()
 
-        # Gelir Hesapla
-        total_revenue = sum(h.toplam_ucret for h in history)
-
-        # Kiradaki ve Bakımdaki Sayısı
-        rented = len([v for v in vehicles if v.durum.lower() == 'kirada'])
-        maintenance = len([v for v in vehicles if v.durum.lower() == 'bakımda'])
+        # Gelir ve plaka bazında kiralama adedi gelir küpünden
+        totals = self.dm.revenue_cube.query(group_by=())
+        per_plate = {row['plaka']: row['adet'] for row in self.dm.revenue_cube.query(group_by=('plaka',))}
 
         # En çok kiralanan marka
-        brand_counts = {}
-        for h in history:
-            brand_counts[h.plaka[:2]] = brand_counts.get(h.plaka[:2], 0) + 1  # Örnek mantık
-
-        top_brand = "Veri Yetersiz"
-        if history:
-            top_brand = max(set([h.plaka for h in history]), key=[h.plaka for h in history].count)
-            top_brand = f"Plaka: {top_brand}"
+        brand_counts = fleet.brand_totals(per_plate)
+        top_brand = max(brand_counts, key=brand_counts.get) if brand_counts else "Veri Yetersiz"
 
         return {
-            "revenue": total_revenue,
-            "rented_count": rented,
-            "maintenance_count": maintenance,
-            "top_brand": top_brand
+            "revenue": totals[0]['gelir'] if totals else 0,
+            "rented_count": counts[VehicleStatus.KIRADA],
+            "maintenance_count": counts[VehicleStatus.BAKIMDA],
+            "top_brand": top_brand,
+            "projected_revenue": fleet.projected_revenue(),
         }
\ No newline at end of file
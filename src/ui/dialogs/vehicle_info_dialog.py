@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from constants import COLORS, FONT_FAMILY
 from src.ui.styled_button import StyledButton
 
@@ -100,24 +100,18 @@ class VehicleInfoDialog(tk.Toplevel):
 
         self.bind("<Escape>", lambda e: self.destroy())
 
-    def _get_date_color(self, date_str):
+    def _get_date_color(self, expiry):
         """Tarih durumuna göre renk döndür."""
-        if not date_str:
+        if not expiry:
             return COLORS['text_secondary']
 
-        try:
-            date = datetime.strptime(date_str, "%Y-%m-%d")
-            today = datetime.now()
-            days_left = (date - today).days
-
-            if days_left < 0:
-                return COLORS['danger']  # Süresi geçmiş
-            elif days_left <= 30:
-                return COLORS['warning']  # 30 gün içinde
-            else:
-                return COLORS['success']  # İyi durumda
-        except ValueError:
-            return COLORS['text_secondary']
+        days_left = (expiry - date.today()).days
+        if days_left < 0:
+            return COLORS['danger']  # Süresi geçmiş
+        elif days_left <= 30:
+            return COLORS['warning']  # 30 gün içinde
+        else:
+            return COLORS['success']  # İyi durumda
 
     def _renew_sigorta(self):
         """Sigorta yenileme diyalogu aç."""
@@ -218,8 +212,7 @@ class RenewalDialog(tk.Toplevel):
 
         # Tarih formatı kontrolü
         try:
-            datetime.strptime(date_str, "%Y-%m-%d")
-            self.result = date_str
+            self.result = datetime.strptime(date_str, "%Y-%m-%d").date()
             self.destroy()
         except ValueError:
             messagebox.showerror("Hata", "Geçersiz tarih formatı!\nLütfen YYYY-MM-DD formatında girin.")
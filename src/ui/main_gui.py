@@ -1,11 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import os
 
 from constants import COLORS, FONT_FAMILY
 from src.backend.data_manager import DataManager
-from src.backend.rental_service import RentalService
+from src.backend.overdue_watcher import OverdueWatcher
+from src.models.vehicle_status import VehicleStatus
+from src.models.dates import to_date
+from src.backend.rental_service import RentalService, ValidationError
 from src.ui.styled_button import StyledButton
 
 from src.ui.dialogs.edit_vehicle_dialog import EditVehicleDialog
@@ -14,7 +17,20 @@ from src.ui.dialogs.rental_history_dialog import RentalHistoryDialog
 from src.ui.dialogs.reports_dialog import ReportsDialog
 from src.ui.dialogs.vehicle_info_dialog import VehicleInfoDialog
 from src.ui.dialogs.expiry_notification_dialog import ExpiryNotificationDialog
+from src.ui.dialogs.bulk_renewal_dialog import BulkRenewalDialog
 
+# Araç tablosunun ihtiyaç duyduğu sütunlar; liste yenilenirken tam Vehicle kurulmaz
+TREE_COLUMNS = ('plaka', 'marka', 'model', 'ucret', 'durum', 'kiralayan')
+
+# Bildirim rozetleri: kategori, simge, renk (get_notification_counts anahtarları)
+NOTIFICATION_BADGES = (
+    ('overdue', "⏰", COLORS['danger']),
+    ('expired', "⛔", COLORS['danger']),
+    ('expiring_soon', "⚠", COLORS['warning']),
+    ('failed', "✗", COLORS['danger']),
+)
+BADGE_REFRESH_MS = 60 * 1000
+JOURNAL_SNAPSHOT_MS = 5 * 60 * 1000
 
 
 class CarRentalApp:
@@ -34,6 +50,11 @@ class CarRentalApp:
         db_path = os.path.join(project_root, "car_rental.db")
         self.data_manager = DataManager(db_path)
         self.rental_service = RentalService(self.data_manager)
+        self.fleet = None  # Filo anlık görüntüsü, her liste yenilemesinde güncellenir
+        self.insured_plates = set()  # Her liste yenilemesinde güncellenir
+        self.overdue_watcher = OverdueWatcher(self.data_manager)
+        self._overdue_job = None
+        self.notification_counts = {}
 
         self._running = True  # Timer kontrolü için
 
@@ -44,11 +65,124 @@ class CarRentalApp:
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
 
     def _initial_load(self):
+        self._activate_reservations()
         self._refresh_vehicle_list()
         self._set_status("Veriler yülendi")
+        self.overdue_watcher.reload()
+        self._watch_overdue()
+        self._refresh_badges_periodically()
+        self.root.after(JOURNAL_SNAPSHOT_MS, self._snapshot_journal_periodically)
         # Başlangıçta bildirim kontrolü
         self.root.after(500, self._check_notifications_on_startup)
 
+    def _activate_reservations(self):
+        """Başlangıç tarihi gelen rezervasyonları başlat ve saatlik tekrar planla."""
+        if not self._running:
+            return
+        try:
+            activated = self.rental_service.activate_due_reservations()
+            if activated:
+                self._track_rentals(activated)
+                self._refresh_vehicle_list()
+                self._set_status(f"{len(activated)} rezervasyon başlatıldı")
+            self.root.after(60 * 60 * 1000, self._activate_reservations)
+        except tk.TclError:
+            pass  # Widget yok artık
+
+    def _watch_overdue(self):
+        """Bitiş tarihi geçen kiralamaları işaretle ve bir sonraki gecikme anına zamanlayıcı kur."""
+        if not self._running:
+            return
+        try:
+            newly = self.overdue_watcher.poll()
+            if newly:
+                self._set_status(f"{len(newly)} kiralamanın iade tarihi geçti")
+            self._update_notification_badge()
+            self._schedule_overdue_check()
+        except tk.TclError:
+            pass  # Widget yok artık
+
+    def _schedule_overdue_check(self):
+        if self._overdue_job is not None:
+            self.root.after_cancel(self._overdue_job)
+        # Başka masalarda başlayan kiralamalar için en geç saatte bir yeniden yüklenir
+        wait = self.overdue_watcher.seconds_until_next()
+        if wait is None or wait > 60 * 60:
+            self._overdue_job = self.root.after(60 * 60 * 1000, self._reload_overdue)
+        else:
+            # Gün dönümünden sonra uyanmak için 1 sn pay
+            self._overdue_job = self.root.after(int(wait * 1000) + 1000, self._watch_overdue)
+
+    def _track_rentals(self, plates):
+        """Yeni başlayan kiralamaları gecikme izleyicisine ekler.
+
+        Bitiş tarihi veritabanından okunur; sadece gerçekten kirada olan
+        araçlar eklenir (iadede hemen başlayan rezervasyonlar dahil).
+        """
+        plates = list(plates)
+        if not plates:
+            return
+        earlier = False
+        for v in self.data_manager.get_vehicles_by_plates(plates).values():
+            if v.durum == VehicleStatus.KIRADA:
+                earlier |= self.overdue_watcher.track(v.plaka, v.bitis_tarihi)
+        if earlier:
+            self._schedule_overdue_check()
+
+    def _resolve_returns(self, plates):
+        """İade edilen araçları geciken listesinden çıkarır; iadeyle başlayan
+        rezervasyonlar yeni kiralama olarak izlenir."""
+        plates = list(plates)
+        resolved = [plaka for plaka in plates if self.overdue_watcher.resolve(plaka)]
+        if resolved:
+            self._update_notification_badge()
+        self._track_rentals(plates)
+
+    def _reload_overdue(self):
+        self._overdue_job = None
+        self.overdue_watcher.reload()
+        self._watch_overdue()
+
+    def _refresh_badges_periodically(self):
+        """Başarısız girişimler ve başka masalardaki değişiklikler için rozetleri düzenli yenile."""
+        if not self._running or not self.is_admin:
+            return
+        try:
+            self._update_notification_badge()
+            self.root.after(BADGE_REFRESH_MS, self._refresh_badges_periodically)
+        except tk.TclError:
+            pass  # Widget yok artık
+
+    def _snapshot_journal_periodically(self):
+        """Açık kalan masada da olay günlüğü için düzenli anlık görüntü al (arka planda)."""
+        if not self._running:
+            return
+        try:
+            # Önce yeniden planlanır; anlık görüntü hatası zinciri koparmasın
+            self.root.after(JOURNAL_SNAPSHOT_MS, self._snapshot_journal_periodically)
+            self.data_manager.journal.snapshot_in_background(self.data_manager.db_path)
+        except tk.TclError:
+            pass  # Widget yok artık
+
+    def _update_notification_badge(self):
+        """Bildirim butonunda toplamı, rozetlerde kategori sayılarını göster (sadece admin).
+
+        Sayılar indeksli COUNT sorgularından gelir; listeler yalnızca
+        bildirim diyalogu açıldığında okunur.
+        """
+        if not self.is_admin:
+            return
+        self.notification_counts = counts = self.data_manager.get_notification_counts()
+        total = sum(counts.values())
+        self.notification_btn.set_text(f"Bildirimler ({total})" if total else "Bildirimler")
+        self.notification_btn.set_color(COLORS['danger'] if total else COLORS['warning'])
+        for key, icon, color in NOTIFICATION_BADGES:
+            count = counts[key]
+            self.badge_labels[key].config(
+                text=f"{icon} {count}",
+                bg=color if count else COLORS['bg_card'],
+                fg='#ffffff' if count else COLORS['text_secondary'])
+
     def _setup_styles(self):
         style = ttk.Style()
         style.theme_use('clam')
@@ -144,11 +278,24 @@ class CarRentalApp:
 
             self.analytics_btn.bind("<Button-1>", lambda e: self._show_analytics())
 
+            StyledButton(right_frame, "🛡️ Yenile", self._bulk_renew,
+                         COLORS['success'], '#ffffff', font_size=10, padx=15, pady=8).pack(side=tk.LEFT, padx=(0, 15))
+
         # Bildirim butonu - sadece admin
         if self.is_admin:
             self.notification_btn = StyledButton(right_frame, "Bildirimler", self._show_notifications,
                          COLORS['warning'], '#ffffff', font_size=10, padx=15, pady=8)
-            self.notification_btn.pack(side=tk.LEFT, padx=(0, 15))
+            self.notification_btn.pack(side=tk.LEFT, padx=(0, 6))
+
+            # Kategori rozetleri: gecikme, süresi geçen, yaklaşan, başarısız girişim
+            badges = tk.Frame(right_frame, bg=COLORS['bg_primary'])
+            badges.pack(side=tk.LEFT, padx=(0, 15))
+            self.badge_labels = {}
+            for key, icon, _ in NOTIFICATION_BADGES:
+                lbl = tk.Label(badges, text=f"{icon} 0", font=(FONT_FAMILY, 9, "bold"),
+                               bg=COLORS['bg_card'], fg=COLORS['text_secondary'], padx=5, pady=2)
+                lbl.pack(anchor=tk.W, pady=1)
+                self.badge_labels[key] = lbl
 
         stats = tk.Frame(right_frame, bg=COLORS['bg_primary'])
         stats.pack(side=tk.LEFT)
@@ -218,7 +365,7 @@ class CarRentalApp:
                  bg=COLORS['bg_card'], fg=COLORS['text_primary']).pack(anchor=tk.W, pady=(0, 6))
 
         self.filter_var = tk.StringVar(value="Tümü")
-        for text in ["Tümü", "Müsait", "Kirada", "Bakımda"]:
+        for text in ["Tümü", "Müsait", "Kirada", "Bakımda", "Tarih Aralığı"]:
             tk.Radiobutton(
                 filter_card, text=text, variable=self.filter_var, value=text,
                 command=self._refresh_vehicle_list,
@@ -227,6 +374,21 @@ class CarRentalApp:
                 indicatoron=0, padx=10, pady=3, width=10, relief='flat'
             ).pack(fill=tk.X, pady=1)
 
+        # Tarih aralığı filtresi - o tarihlerde kiralanabilir araçlar
+        range_frame = tk.Frame(filter_card, bg=COLORS['bg_card'])
+        range_frame.pack(fill=tk.X, pady=(6, 0))
+
+        today = datetime.now().date()
+        for attr, default in [("range_start_entry", today),
+                              ("range_end_entry", today + timedelta(days=3))]:
+            entry = tk.Entry(range_frame, font=(FONT_FAMILY, 9), width=11,
+                             bg=COLORS['bg_secondary'], fg=COLORS['text_primary'],
+                             insertbackground=COLORS['text_primary'], relief='flat')
+            entry.insert(0, default.strftime("%Y-%m-%d"))
+            entry.pack(side=tk.LEFT, padx=(0, 4), ipady=3, expand=True, fill=tk.X)
+            entry.bind("<Return>", lambda e: self._apply_date_range_filter())
+            setattr(self, attr, entry)
+
     def _create_list_panel(self, parent):
         card = tk.Frame(parent, bg=COLORS['bg_card'], padx=15, pady=15)
         card.pack(fill=tk.BOTH, expand=True)
@@ -251,7 +413,7 @@ class CarRentalApp:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         columns = ("plaka", "marka", "model", "ucret", "durum", "kiralayan")
-        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings",
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode="extended",
                                  yscrollcommand=scrollbar.set, style="Custom.Treeview")
 
         for col, (text, w) in {"plaka": ("Plaka", 100), "marka": ("Marka", 100),
@@ -275,6 +437,8 @@ class CarRentalApp:
         buttons = [
             ("🔑 KİRALA", self._start_rental, COLORS['success'], "rent"),
             ("↩️ İADE", self._end_rental, COLORS['warning'], "return"),
+            ("🔑 TOPLU KİRALA", self._start_batch_rental, COLORS['success'], "batch_rent"),
+            ("↩️ TOPLU İADE", self._end_batch_rental, COLORS['warning'], "batch_return"),
         ]
 
         if self.is_admin:
@@ -325,77 +489,94 @@ class CarRentalApp:
         for item in self.tree.get_children():
             self.tree.delete(item)
 
+        # Sayımlar, sigorta kontrolü ve gösterilen durum tek sorguluk filo anlık
+        # görüntüsünden gelir; sigortası/kaskosu bugünü kapsamayan araçlar hiçbir
+        # kiralamayı alamaz ve bakımda gösterilir
+        self.fleet = self.data_manager.get_fleet_snapshot()
+        self.insured_plates = self.fleet.insured_through()
+        shown = self.fleet.display_status()
+
         f = self.filter_var.get()
-        if f == "Tümü":
-            vehicles = self.rental_service.get_all_vehicles()
-        elif f == "Müsait":
-            vehicles = self.rental_service.get_available_vehicles()
+        quotes = {}
+        if f == "Tarih Aralığı":
+            try:
+                results = self.rental_service.quote_all(
+                    self.range_start_entry.get(), self.range_end_entry.get())
+            except ValidationError as e:
+                results = []
+                self._set_status(str(e))
+            vehicles = [q['vehicle'] for q in results]
+            quotes = {q['vehicle'].plaka: q['toplam'] for q in results}
+        elif f == "Tümü":
+            vehicles = self.rental_service.get_all_vehicles(TREE_COLUMNS)
         elif f == "Kirada":
-            vehicles = self.rental_service.get_rented_vehicles()
+            vehicles = self.rental_service.get_rented_vehicles(TREE_COLUMNS)
         else:
-            vehicles = self.data_manager.get_vehicles_by_status("bakımda")
-
-        today = datetime.now().date()
+            # Müsait/Bakımda filtreleri listede gösterilen duruma göre seçer
+            status = VehicleStatus.MUSAIT if f == "Müsait" else VehicleStatus.BAKIMDA
+            plates = self.fleet.plates_shown_as(status)
+            vehicles = [v for v in self.rental_service.get_all_vehicles(TREE_COLUMNS) if v.plaka in plates]
 
-        # Araçları durum bilgisiyle birlikte hazırla
+        # Araçları durum bilgisiyle birlikte hazırla (anlık görüntüden sonra eklenenler kendi durumuyla)
+        index = self.fleet.index
         vehicle_list = []
         for v in vehicles:
-            # Sigorta/Kasko tarih kontrolü - geçmiş veya tanımlanmamış ise bakımda göster
-            display_durum = v.durum
-            
-            if v.durum != "kirada":  # Kirada olan araçları değiştirme
-                needs_maintenance = False
-                
-                # Sigorta kontrolü
-                if not v.sigorta_bitis:
-                    needs_maintenance = True
-                else:
-                    try:
-                        sigorta_date = datetime.strptime(v.sigorta_bitis, "%Y-%m-%d").date()
-                        if sigorta_date < today:
-                            needs_maintenance = True
-                    except ValueError:
-                        needs_maintenance = True
-                
-                # Kasko kontrolü
-                if not v.kasko_bitis:
-                    needs_maintenance = True
-                else:
-                    try:
-                        kasko_date = datetime.strptime(v.kasko_bitis, "%Y-%m-%d").date()
-                        if kasko_date < today:
-                            needs_maintenance = True
-                    except ValueError:
-                        needs_maintenance = True
-                
-                if needs_maintenance:
-                    display_durum = "bakımda"
-            
-            vehicle_list.append((v, display_durum))
+            i = index.get(v.plaka)
+            vehicle_list.append((v, v.durum if i is None else VehicleStatus(shown[i])))
         
         # Sıralama: kirada (0) > müsait (1) > bakımda (2)
+        priority = {VehicleStatus.KIRADA: 0, VehicleStatus.MUSAIT: 1, VehicleStatus.BAKIMDA: 2}
+
         def get_priority(item):
-            d = item[1].lower()
-            if d == "kirada":
-                return 0
-            elif d == "müsait":
-                return 1
-            return 2
+            return priority[item[1]]
         
-        vehicle_list.sort(key=get_priority)
+        # Tarih aralığı modunda sonuçlar teklif tutarına göre sıralı gelir, bozma
+        if f != "Tarih Aralığı":
+            vehicle_list.sort(key=get_priority)
         
         for v, display_durum in vehicle_list:
-            self.tree.insert("", tk.END, values=(
+            # Tarih aralığı modunda aralığın toplam teklifini de göster
+            price = f"{v.ucret:,.0f}₺"
+            if v.plaka in quotes:
+                price += f" ({quotes[v.plaka]:,.0f}₺)"
+            self.tree.insert("", tk.END, iid=v.plaka, values=(
                 v.plaka, v.marka, v.model,
-                f"{v.ucret:,.0f}₺", display_durum.capitalize(),
+                price, display_durum.label.capitalize(),
                 v.kiralayan or "—"
             ))
 
         self._update_statistics()
         self._update_button_states(None)
 
+    def _refresh_rows(self, plates):
+        """Sadece verilen araçların durum hücresini günceller (sigorta/kasko değişiklikleri için).
+
+        Tablo satırları plaka ile tanımlandığından liste yeniden kurulmaz;
+        sıralama bir sonraki tam yenilemede düzelir.
+        """
+        today = date.today()
+        for plaka, v in self.data_manager.get_vehicles_by_plates(plates).items():
+            insured = bool(v.sigorta_bitis and v.kasko_bitis) and min(v.sigorta_bitis, v.kasko_bitis) >= today
+            if insured:
+                self.insured_plates.add(plaka)
+            else:
+                self.insured_plates.discard(plaka)
+            if self.tree.exists(plaka):
+                display_durum = v.durum
+                if v.durum != VehicleStatus.KIRADA and not insured:
+                    display_durum = VehicleStatus.BAKIMDA
+                self.tree.set(plaka, "durum", display_durum.label.capitalize())
+
+        self._update_notification_badge()
+        self._on_selection_change(None)
+
+    def _apply_date_range_filter(self):
+        """Tarih girişlerinde Enter'a basılınca tarih aralığı filtresine geç."""
+        self.filter_var.set("Tarih Aralığı")
+        self._refresh_vehicle_list()
+
     def _update_statistics(self):
-        s = self.rental_service.get_statistics()
+        s = self.rental_service.get_statistics(self.fleet)
         self.stat_labels['toplam'].config(text=str(s['toplam_arac']))
         self.stat_labels['musait'].config(text=str(s['musait_arac']))
         self.stat_labels['kirada'].config(text=str(s['kirada_arac']))
@@ -404,7 +585,9 @@ class CarRentalApp:
 
     def _on_selection_change(self, event):
         sel = self.tree.selection()
-        if sel:
+        if len(sel) > 1:
+            self._update_batch_button_states(sel)
+        elif sel:
             plaka = self.tree.item(sel[0])['values'][0]
             self._update_button_states(self.data_manager.get_vehicle_by_plaka(plaka))
         else:
@@ -417,18 +600,84 @@ class CarRentalApp:
         if vehicle is None:
             return
 
-        if vehicle.durum == "müsait":
+        # Sigortası bugünü bile kapsamayan araç için kiralama denemesi yapılmasın
+        insured = vehicle.plaka in self.insured_plates
+        if vehicle.durum == VehicleStatus.MUSAIT and insured:
             self.action_buttons['rent'].enable()
-        elif vehicle.durum == "kirada":
+        elif vehicle.durum == VehicleStatus.KIRADA:
             self.action_buttons['return'].enable()
+            # Kiradaki araç için ileri tarihli rezervasyon yapılabilir
+            if insured:
+                self.action_buttons['rent'].enable()
 
         if self.is_admin:
             self.action_buttons['info'].enable()
             self.action_buttons['edit'].enable()
 
-            if vehicle.durum == "müsait":
+            if vehicle.durum == VehicleStatus.MUSAIT:
                 self.action_buttons['delete'].enable()
 
+    def _update_batch_button_states(self, sel):
+        """Çoklu seçimde sadece toplu işlem butonlarını aç."""
+        for btn in self.action_buttons.values():
+            btn.disable()
+
+        durumlar = {VehicleStatus.parse(str(self.tree.item(item)['values'][4])) for item in sel}
+        if VehicleStatus.MUSAIT in durumlar:
+            self.action_buttons['batch_rent'].enable()
+        if VehicleStatus.KIRADA in durumlar:
+            self.action_buttons['batch_return'].enable()
+
+    def _selected_plates(self):
+        return [str(self.tree.item(item)['values'][0]) for item in self.tree.selection()]
+
+    def _show_batch_results(self, title, results):
+        """Toplu işlem sonuçlarını özetle."""
+        ok = [r for r in results if r['ok']]
+        failed = [r for r in results if not r['ok']]
+        lines = [f"{len(ok)} başarılı, {len(failed)} başarısız"]
+        if ok:
+            lines.append(f"Toplam Ücret: {sum(r['ucret'] for r in ok):,.2f} TL")
+        for r in failed[:15]:
+            lines.append(f"✗ {r['plaka']}: {r['mesaj']}")
+        if len(failed) > 15:
+            lines.append(f"... ve {len(failed) - 15} hata daha")
+        if failed:
+            messagebox.showwarning(title, "\n".join(lines))
+        else:
+            messagebox.showinfo(title, "\n".join(lines))
+
+    def _start_batch_rental(self):
+        plates = self._selected_plates()
+        if not plates:
+            return
+
+        dialog = RentalDialog(self.root, f"{len(plates)} araç seçildi", self.current_user.username,
+                              self.data_manager.search_customers)
+        self.root.wait_window(dialog)
+        if not dialog.result:
+            return
+
+        results = self.rental_service.start_rentals([
+            {'plaka': plaka, 'kiralayan': dialog.result['kiralayan'],
+             'baslangic': dialog.result['baslangic'], 'bitis': dialog.result['bitis']}
+            for plaka in plates
+        ])
+        self._track_rentals(r['plaka'] for r in results if r['ok'] and not r['rezervasyon'])
+        self._show_batch_results("Toplu Kiralama", results)
+        self._refresh_vehicle_list()
+
+    def _end_batch_rental(self):
+        plates = self._selected_plates()
+        if not plates:
+            return
+
+        if messagebox.askyesno("Onay", f"{len(plates)} araç iade alınsın mı?"):
+            results = self.rental_service.end_rentals(plates)
+            self._resolve_returns(r['plaka'] for r in results if r['ok'])
+            self._show_batch_results("Toplu İade", results)
+            self._refresh_vehicle_list()
+
     def _add_vehicle(self):
         ok, msg = self.rental_service.add_vehicle(
             self.plaka_entry.get(), self.marka_entry.get(),
@@ -454,24 +703,20 @@ class CarRentalApp:
         if not v:
             return
 
-        dialog = RentalDialog(self.root, f"{v.marka} {v.model} ({v.plaka})", self.current_user.username)
+        dialog = RentalDialog(self.root, f"{v.marka} {v.model} ({v.plaka})", self.current_user.username,
+                              self.data_manager.search_customers)
         self.root.wait_window(dialog)
 
         if dialog.result:
-            # Sigorta/Kasko tarih kontrolü
-            bitis_tarihi = dialog.result['bitis']
-            insurance_error = self._check_insurance_for_rental(v, bitis_tarihi)
-            if insurance_error:
-                # Başarısız kiralama kaydı ekle
-                self.data_manager.add_failed_rental(v.plaka, v.marka, v.model, insurance_error)
-                messagebox.showerror("Kiralama Başarısız", insurance_error)
-                return
-            
+            # Sigorta/kasko kontrolü ve başarısız kiralama kaydı servis tarafında yapılır
             ok, msg, _ = self.rental_service.start_rental(
                 plaka, dialog.result['kiralayan'],
                 dialog.result['baslangic'], dialog.result['bitis'])
 
             if ok:
+                # İleri tarihli istek rezervasyondur; kiralama başladığında izlenir
+                if to_date(dialog.result['baslangic']) <= date.today():
+                    self._track_rentals([plaka])
                 messagebox.showinfo("Başarılı", msg)
                 self._refresh_vehicle_list()
             else:
@@ -486,6 +731,7 @@ class CarRentalApp:
         if messagebox.askyesno("Onay", f"'{plaka}' iade alınsın mı?"):
             ok, msg = self.rental_service.end_rental(plaka)
             if ok:
+                self._resolve_returns([plaka])
                 messagebox.showinfo("✓ Başarılı", msg)
                 self._refresh_vehicle_list()
             else:
@@ -529,8 +775,25 @@ class CarRentalApp:
 
         dialog = VehicleInfoDialog(self.root, v, self.data_manager)
         self.root.wait_window(dialog)
-        # Refresh to show any updates
-        self._refresh_vehicle_list()
+        # Sadece sigorta/kasko değişebildiğinden yalnızca bu satır güncellenir
+        self._refresh_rows([v.plaka])
+
+    def _bulk_renew(self):
+        """Sigorta/kaskoyu toplu yenile; tek UPDATE ve tek artımlı tablo güncellemesi."""
+        dialog = BulkRenewalDialog(self.root, self.rental_service.parse_plates)
+        self.root.wait_window(dialog)
+        if not dialog.result:
+            return
+
+        r = dialog.result
+        ok, msg, renewed = self.rental_service.renew_insurance(
+            r['types'], r['new_date'], r['plates'], r['days'])
+        if ok:
+            self._refresh_rows(renewed)
+            self._set_status(f"{len(renewed)} araç yenilendi")
+            messagebox.showinfo("✓ Başarılı", msg)
+        else:
+            messagebox.showerror("✗ Hata", msg)
 
     def _delete_vehicle(self):
         sel = self.tree.selection()
@@ -586,11 +849,13 @@ class CarRentalApp:
 
     def _on_closing(self):
         if messagebox.askyesno("Çıkış", "Çıkmak istiyor musunuz?"):
+            if self.data_manager.events is not None:
+                self.data_manager.events.close()  # Bekleyen olayları yaz
             self.root.destroy()
 
     def _show_reports(self):
         from src.ui.dialogs.reports_dialog import ReportsDialog
-        ReportsDialog(self.root, self.data_manager)
+        ReportsDialog(self.root, self.data_manager, self.rental_service)
 
     def _show_analytics(self):
         try:
@@ -610,63 +875,33 @@ class CarRentalApp:
 
     def _show_notifications(self):
         """Bildirim diyalogunu aç."""
-        expiry_data = self.data_manager.get_expiring_vehicles()
-        expiry_data['failed_rentals'] = self.data_manager.get_failed_rentals()
-        ExpiryNotificationDialog(self.root, expiry_data, self.data_manager)
+        # Dialog araçları ve başarısız girişimleri görünür oldukça sayfa sayfa okur
+        expiry_data = self.data_manager.expiry_index.expiring()
+        self.overdue_watcher.reload()
+        expiry_data['overdue'] = self.overdue_watcher.overdue_list()
+        dialog = ExpiryNotificationDialog(self.root, expiry_data, self.data_manager)
+        self.root.wait_window(dialog)
+        # Okundu işaretlenen girişimler rozetten düşsün
+        self._update_notification_badge()
 
     def _check_notifications_on_startup(self):
         """Başlangıçta bildirim kontrolü yap, varsa uyar (sadece admin)."""
         if not self.is_admin:
             return
             
-        expiry_data = self.data_manager.get_expiring_vehicles()
-        total = len(expiry_data.get('expired', [])) + len(expiry_data.get('expiring_soon', []))
-        
+        self._update_notification_badge()
+        counts = self.notification_counts
+        total = counts['expired'] + counts['expiring_soon']
+        overdue = counts['overdue']
+
+        lines = []
         if total > 0:
-            # Bildirim butonunu kırmızı yap
-            self.notification_btn.configure(bg=COLORS['danger'])
+            lines.append(f"{total} adet sigorta/kasko bildirimi var!")
+        if overdue > 0:
+            lines.append(f"{overdue} aracın iade tarihi geçti!")
+        if lines:
             messagebox.showwarning(
                 "Dikkat",
-                f"{total} adet sigorta/kasko bildirimi var!\nBildirimler butonuna tıklayarak detayları görebilirsiniz."
+                "\n".join(lines) + "\nBildirimler butonuna tıklayarak detayları görebilirsiniz."
             )
 
-    def _check_insurance_for_rental(self, vehicle, rental_end_date):
-        """Kiralama bitiş tarihine göre sigorta/kasko kontrolü yap.
-        
-        Returns:
-            str | None: Hata mesajı veya None (geçerli ise)
-        """
-        from datetime import datetime
-        
-        try:
-            rental_end = datetime.strptime(rental_end_date, "%Y-%m-%d").date()
-        except ValueError:
-            return None  # Geçersiz tarih formatı, diğer kontrollere bırak
-        
-        errors = []
-        
-        # Sigorta kontrolü
-        if vehicle.sigorta_bitis:
-            try:
-                sigorta_date = datetime.strptime(vehicle.sigorta_bitis, "%Y-%m-%d").date()
-                if sigorta_date < rental_end:
-                    errors.append(f"Sigorta bitiş tarihi ({vehicle.sigorta_bitis}) kiralama süresini kapsamıyor.")
-            except ValueError:
-                pass
-        else:
-            errors.append("Araç sigortası tanımlanmamış.")
-        
-        # Kasko kontrolü
-        if vehicle.kasko_bitis:
-            try:
-                kasko_date = datetime.strptime(vehicle.kasko_bitis, "%Y-%m-%d").date()
-                if kasko_date < rental_end:
-                    errors.append(f"Kasko bitiş tarihi ({vehicle.kasko_bitis}) kiralama süresini kapsamıyor.")
-            except ValueError:
-                pass
-        else:
-            errors.append("Araç kaskosu tanımlanmamış.")
-        
-        if errors:
-            return "\n".join(errors)
-        return None
@@ -57,6 +57,14 @@ class StyledButton(tk.Frame):
         except:
             return color
 
+    def set_text(self, text):
+        self.label.config(text=text)
+
+    def set_color(self, bg_color):
+        self.bg_color = bg_color
+        if self._state == 'normal':
+            self.label.config(bg=bg_color)
+
     def enable(self):
         self._state = 'normal'
         self.label.config(bg=self.bg_color, fg=self.fg_color, cursor='hand2')